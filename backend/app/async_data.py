@@ -0,0 +1,225 @@
+"""
+Async data access for the FastAPI handlers.
+
+The lookups and writes of insert_resume_data, on a SQLAlchemy AsyncSession (asyncpg for PostgreSQL,
+aiosqlite for the local SQLite file). A handler awaiting the DB frees the event loop for other
+requests; the sync helpers block it for every round trip. Embedding and scoring are CPU work and stay
+synchronous: callers run them off the loop and pass the results in (functions that need embeddings
+they were not given compute them in the default executor).
+
+Engines are created on first use, one per event loop (asyncpg connections belong to the loop that
+opened them), with database.py's URL and pool settings.
+"""
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from sqlalchemy import select, update
+
+from . import database
+from .insert_resume_data import _resume_unchanged, _write_resume
+from .keyword_idf import ensure_table, on_document_recorded, record_document
+from .models import Job, Resume
+from .ranking import on_job_saved, on_resume_saved
+from . import score_cache
+from .scoring_logic import job_embedding_fields, keyword_set, resume_embedding_fields
+
+_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_url(url: str) -> str:
+    """database.DB_URL with its sync driver swapped for the async one (asyncpg / aiosqlite)."""
+    scheme, rest = url.split("://", 1)
+    driver = _DRIVERS.get(scheme, scheme)
+    if driver == "postgresql+asyncpg":
+        # asyncpg takes ssl=, not libpq's sslmode= (e.g. ?sslmode=require in a hosted DATABASE_URL)
+        rest = rest.replace("sslmode=", "ssl=")
+    return f"{driver}://{rest}"
+
+
+ASYNC_DB_URL = async_url(database.DB_URL)
+
+_sessionmakers = weakref.WeakKeyDictionary()
+
+
+def get_sessionmaker():
+    """async_sessionmaker bound to this event loop's engine (created on first use)."""
+    loop = asyncio.get_running_loop()
+    maker = _sessionmakers.get(loop)
+    if maker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        engine = create_async_engine(
+            ASYNC_DB_URL,
+            pool_size=database.DB_POOL_SIZE,
+            max_overflow=database.DB_MAX_OVERFLOW,
+            pool_timeout=database.DB_POOL_TIMEOUT,
+            pool_recycle=database.DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+        )
+        # Like unit_of_work in insert_resume_data: rows stay loaded after commit (no lazy loads in async)
+        maker = _sessionmakers[loop] = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    return maker
+
+
+async def dispose() -> None:
+    """Close this event loop's engine (its pooled connections)."""
+    maker = _sessionmakers.pop(asyncio.get_running_loop(), None)
+    if maker is not None:
+        await maker.kw["bind"].dispose()
+
+
+@asynccontextmanager
+async def unit_of_work():
+    """One AsyncSession and one transaction: commits when the block ends, rolls back if it raises."""
+    async with get_sessionmaker()() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def _in_executor(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+async def _first(stmt):
+    async with get_sessionmaker()() as db:
+        return (await db.execute(stmt)).scalars().first()
+
+
+async def get_resume_by_name(name: str) -> Optional[Resume]:
+    """Return the single resume for this name, or None."""
+    return await _first(select(Resume).where(Resume.name == name).limit(1))
+
+
+async def get_jobs_by_resume_id(resume_id: int) -> List[Job]:
+    """Return all jobs for this resume, ordered by id (newest last)."""
+    async with get_sessionmaker()() as db:
+        result = await db.execute(select(Job).where(Job.resume_id == resume_id).order_by(Job.id))
+        return list(result.scalars().all())
+
+
+async def get_job_for_resume(resume_id: int, job_id: int) -> Optional[Job]:
+    """Return the job with this id if it belongs to this resume, else None."""
+    return await _first(select(Job).where(Job.id == job_id, Job.resume_id == resume_id).limit(1))
+
+
+async def get_latest_job(resume_id: int) -> Optional[Job]:
+    """Return this resume's most recent job (highest id), or None."""
+    return await _first(select(Job).where(Job.resume_id == resume_id).order_by(Job.id.desc()).limit(1))
+
+
+async def _upsert_resume(db, resume_data: dict, embedding_fields: dict = None):
+    """insert_resume_data._upsert_resume on an AsyncSession; returns (resume, created, changed)."""
+    result = await db.execute(select(Resume).where(Resume.name == resume_data.get("name")).limit(1))
+    existing = result.scalars().first()
+    if existing and _resume_unchanged(existing, resume_data):
+        return existing, False, False
+    if embedding_fields is None:
+        embedding_fields = await _in_executor(resume_embedding_fields, Resume(**resume_data))
+    if existing and score_cache.SCORE_CACHE_DB:
+        # Create the cache table on this connection, so the sync write below finds it ready
+        await db.run_sync(lambda session: score_cache.ensure_table(session.connection()))
+    # The same write (fields, embeddings, score cache invalidation) as the sync path, on this session
+    resume, created = await db.run_sync(_write_resume, existing, resume_data, embedding_fields)
+    return resume, created, True
+
+
+async def _record_document(db, jd_hash: str, keywords) -> bool:
+    """keyword_idf.record_document on an AsyncSession."""
+    await db.run_sync(lambda session: ensure_table(session.connection()))
+    return await db.run_sync(record_document, jd_hash, keywords)
+
+
+def _after_commit(resume, job, counted_keywords) -> None:
+    """
+    The in-memory follow-ups of a committed write (ranking pools, keyword IDF table). They lock and
+    update process-wide structures, so callers run this in the default executor, off the event loop.
+    """
+    if counted_keywords is not None:
+        on_document_recorded(counted_keywords)
+    if resume is not None:
+        on_resume_saved(resume)
+    on_job_saved(job)
+
+
+async def get_or_create_resume(resume_data: dict, embedding_fields: dict = None):
+    """Async get_or_create_resume: update or insert the resume with this name. Returns (resume, created)."""
+    async with unit_of_work() as db:
+        resume, created, changed = await _upsert_resume(db, resume_data, embedding_fields)
+    if changed:
+        await _in_executor(on_resume_saved, resume)
+    return resume, created
+
+
+async def insert_job(resume_id: int, name: str, job_description: str, jd_fields: dict = None) -> Job:
+    """Async insert_job: insert a job (score set separately) linked to a resume."""
+    if jd_fields is None:
+        jd_fields = await _in_executor(job_embedding_fields, job_description)
+    jd_keywords = await _in_executor(keyword_set, job_description)
+    async with unit_of_work() as db:
+        job = Job(resume_id=resume_id, name=name, job_description=job_description, **jd_fields)
+        db.add(job)
+        counted = await _record_document(db, jd_fields["jd_hash"], jd_keywords)
+    await _in_executor(_after_commit, None, job, jd_keywords if counted else None)
+    return job
+
+
+async def update_score(resume_id: int, score: float) -> None:
+    await _update_score(Resume, resume_id, score)
+
+
+async def update_job_score(job_id: int, score: float) -> None:
+    await _update_score(Job, job_id, score)
+
+
+async def _update_score(model, row_id: int, score: float) -> None:
+    async with unit_of_work() as db:
+        result = await db.execute(update(model).where(model.id == row_id).values(score=score))
+        if not result.rowcount:
+            raise ValueError(f"{model.__name__} id {row_id} not found")
+
+
+async def save_upload(resume_data: dict, job_description: str, score: float, resume_fields: dict = None, jd_fields: dict = None):
+    """Async save_upload: the resume upsert, scored job and resume score in one transaction. Returns (resume, job)."""
+    if jd_fields is None:
+        jd_fields = await _in_executor(job_embedding_fields, job_description)
+    jd_keywords = await _in_executor(keyword_set, job_description)
+    async with unit_of_work() as db:
+        resume, _, _ = await _upsert_resume(db, resume_data, resume_fields)
+        resume.score = score
+        job = Job(
+            resume_id=resume.id,
+            name=resume_data.get("name"),
+            job_description=job_description,
+            score=score,
+            **jd_fields,
+        )
+        db.add(job)
+        counted = await _record_document(db, jd_fields["jd_hash"], jd_keywords)
+    await _in_executor(_after_commit, resume, job, jd_keywords if counted else None)
+    return resume, job
+
+
+async def save_scored_job(resume_id: int, name: str, job_description: str, score: float, jd_fields: dict = None) -> Job:
+    """Async save_scored_job: insert a scored job and set the resume's score in one transaction."""
+    if jd_fields is None:
+        jd_fields = await _in_executor(job_embedding_fields, job_description)
+    jd_keywords = await _in_executor(keyword_set, job_description)
+    async with unit_of_work() as db:
+        job = Job(resume_id=resume_id, name=name, job_description=job_description, score=score, **jd_fields)
+        db.add(job)
+        result = await db.execute(update(Resume).where(Resume.id == resume_id).values(score=score))
+        if not result.rowcount:
+            raise ValueError(f"Resume id {resume_id} not found")
+        counted = await _record_document(db, jd_fields["jd_hash"], jd_keywords)
+    await _in_executor(_after_commit, None, job, jd_keywords if counted else None)
+    return job
@@ -11,8 +11,12 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 
-# Use PostgreSQL if all DB_* are set (e.g. on Render); otherwise SQLite for local dev
-if DB_NAME and DB_HOST and DB_USER:
+# DATABASE_URL (any SQLAlchemy URL) wins; else PostgreSQL if all DB_* are set (e.g. on Render);
+# otherwise SQLite for local dev
+DATABASE_URL = os.getenv("DATABASE_URL")
+if DATABASE_URL:
+    DB_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
+elif DB_NAME and DB_HOST and DB_USER:
     DB_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD or ''}@{DB_HOST}:{DB_PORT or '5432'}/{DB_NAME}"
 else:
     _here = os.path.dirname(os.path.abspath(__file__))
@@ -20,7 +24,23 @@ else:
     _sqlite_path = os.path.join(_root, "local.db")
     DB_URL = f"sqlite:///{_sqlite_path}"
 
-engine = create_engine(DB_URL, connect_args={"check_same_thread": False} if "sqlite" in DB_URL else {})
+# Connection pool: a request holds one connection for its whole unit of work (see insert_resume_data),
+# so DB_POOL_SIZE + DB_MAX_OVERFLOW bounds concurrent DB work per process. Pre-ping replaces connections
+# the server or a proxy closed while idle; recycle retires them before typical idle timeouts.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+engine = create_engine(
+    DB_URL,
+    connect_args={"check_same_thread": False} if "sqlite" in DB_URL else {},
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 if "sqlite" in DB_URL:
@@ -1,5 +1,11 @@
+from contextlib import contextmanager
+
 from .models import Resume, Job
 from .database import SessionLocal
+from .scoring_logic import resume_embedding_fields, job_embedding_fields, embedding_model_id, keyword_set, content_hash
+from .ranking import on_resume_saved, on_job_saved
+from .keyword_idf import record_document, on_document_recorded
+from .score_cache import invalidate_resume
 
 
 def insert_resume(resume_data: dict):
@@ -13,50 +19,207 @@ def insert_resume(resume_data: dict):
     return new_resume
 
 
+def _resume_unchanged(resume, resume_data: dict) -> bool:
+    """True if every field in resume_data already matches and the stored embeddings are current."""
+    if resume.embedding_model != embedding_model_id():
+        return False
+    return all(getattr(resume, key) == value for key, value in resume_data.items() if hasattr(resume, key))
+
+
+def _upsert_resume(db, resume_data: dict, embedding_fields: dict = None):
+    """
+    Update the resume with this name or add a new one, then flush (no commit).
+    Embeddings are computed only if the row actually changes (unless embedding_fields is given), and an
+    updated resume's cached scores are deleted in the same transaction.
+    Returns (resume, created, changed); an unchanged resume is left untouched (no UPDATE).
+    """
+    name = resume_data.get("name")
+    existing = db.query(Resume).filter(Resume.name == name).first()
+    if existing and _resume_unchanged(existing, resume_data):
+        return existing, False, False
+    if embedding_fields is None:
+        embedding_fields = resume_embedding_fields(Resume(**resume_data))
+    resume, created = _write_resume(db, existing, resume_data, embedding_fields)
+    return resume, created, True
+
+
+def _write_resume(db, existing, resume_data: dict, embedding_fields: dict):
+    """
+    The write half of _upsert_resume (also run by async_data through AsyncSession.run_sync): copy
+    resume_data and embedding_fields onto existing and delete its cached scores, or add a new Resume
+    if existing is None; then flush. Returns (resume, created).
+    """
+    if existing:
+        for key, value in resume_data.items():
+            if hasattr(existing, key):
+                setattr(existing, key, value)
+        for key, value in embedding_fields.items():
+            setattr(existing, key, value)
+        invalidate_resume(db, existing.id)
+        db.flush()
+        return existing, False
+    new_resume = Resume(**resume_data, **embedding_fields)
+    db.add(new_resume)
+    db.flush()
+    return new_resume, True
+
+
 def get_or_create_resume(resume_data: dict):
     """
     One resume per name: if a resume with this name exists, update its fields and return it.
     Otherwise insert a new resume. Returns (resume, created) where created is True if new.
+    Section embeddings are computed from resume_data and stored with the row. If the stored resume
+    already has exactly this content, nothing is written.
     """
     db = SessionLocal()
     try:
-        name = resume_data.get("name")
-        existing = db.query(Resume).filter(Resume.name == name).first()
-        if existing:
-            for key, value in resume_data.items():
-                if hasattr(existing, key):
-                    setattr(existing, key, value)
-            db.commit()
-            db.refresh(existing)
-            return existing, False
-        new_resume = Resume(**resume_data)
-        db.add(new_resume)
+        resume, created, changed = _upsert_resume(db, resume_data)
+        if not changed:
+            return resume, False
+        db.commit()
+        db.refresh(resume)
+        on_resume_saved(resume)
+        return resume, created
+    finally:
+        db.close()
+
+
+@contextmanager
+def unit_of_work():
+    """
+    One session and one transaction: yields the session, commits when the block ends (rolls back if it
+    raises) and closes it. Objects stay loaded after the commit (no refresh SELECTs); run in-memory
+    follow-ups (on_*_saved hooks) after the block, once the data is committed.
+    """
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        yield db
         db.commit()
-        db.refresh(new_resume)
-        return new_resume, True
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
 
+def upload_embeddings(resume_data: dict, job_description: str):
+    """(resume embedding fields, JD embedding fields) for an upload, computed before any DB session is opened."""
+    return resume_embedding_fields(Resume(**resume_data)), job_embedding_fields(job_description)
+
+
+def save_upload(resume_data: dict, job_description: str, score: float, resume_fields: dict = None, jd_fields: dict = None):
+    """
+    Persist one scored upload in a single transaction: upsert the resume by name with its score, insert
+    the job with its score and count the JD's keywords (if this JD was not counted before). Pass the fields from upload_embeddings to
+    avoid encoding again. Returns (resume, job), both with ids and every column loaded.
+    """
+    if resume_fields is None or jd_fields is None:
+        resume_fields, jd_fields = upload_embeddings(resume_data, job_description)
+    jd_keywords = keyword_set(job_description)
+    with unit_of_work() as db:
+        resume, _, _ = _upsert_resume(db, resume_data, resume_fields)
+        resume.score = score
+        job = Job(
+            resume_id=resume.id,
+            name=resume_data.get("name"),
+            job_description=job_description,
+            score=score,
+            **jd_fields,
+        )
+        db.add(job)
+        counted = record_document(db, jd_fields["jd_hash"], jd_keywords)
+    if counted:
+        on_document_recorded(jd_keywords)
+    on_resume_saved(resume)
+    on_job_saved(job)
+    return resume, job
+
+
+def save_scored_job(resume_id: int, name: str, job_description: str, score: float, jd_fields: dict = None):
+    """
+    Insert a scored job for an existing resume and set the resume's score, in one transaction
+    (the resume score is a single UPDATE, no SELECT). Returns the Job.
+    """
+    if jd_fields is None:
+        jd_fields = job_embedding_fields(job_description)
+    jd_keywords = keyword_set(job_description)
+    with unit_of_work() as db:
+        job = Job(resume_id=resume_id, name=name, job_description=job_description, score=score, **jd_fields)
+        db.add(job)
+        updated = db.query(Resume).filter(Resume.id == resume_id).update({Resume.score: score}, synchronize_session=False)
+        if not updated:
+            raise ValueError(f"Resume id {resume_id} not found")
+        counted = record_document(db, jd_fields["jd_hash"], jd_keywords)
+    if counted:
+        on_document_recorded(jd_keywords)
+    on_job_saved(job)
+    return job
+
+
+def save_batch(items: list, job_description: str):
+    """
+    Persist a batch upload in one session and one transaction. items: list of (resume_data, score).
+    Each resume is upserted by name, gets a new job for job_description with its score, and its
+    resume score updated. Returns a list of (resume, job) in input order.
+    """
+    jd_fields = job_embedding_fields(job_description)
+    jd_keywords = keyword_set(job_description)
+    embeddings = [resume_embedding_fields(Resume(**data)) for data, _ in items]
+    saved = []
+    counted = False
+    with unit_of_work() as db:
+        for (data, score), embedding_fields in zip(items, embeddings):
+            resume, _, _ = _upsert_resume(db, data, embedding_fields)
+            resume.score = score
+            job = Job(
+                resume_id=resume.id,
+                name=data.get("name"),
+                job_description=job_description,
+                score=score,
+                **jd_fields,
+            )
+            db.add(job)
+            saved.append((resume, job))
+        if saved:
+            # One job description, however many resumes it was screened against
+            counted = record_document(db, jd_fields["jd_hash"], jd_keywords)
+    if counted:
+        on_document_recorded(jd_keywords)
+    for resume, job in saved:
+        on_resume_saved(resume)
+        on_job_saved(job)
+    return saved
+
+
 def insert_job(resume_id: int, name: str, job_description: str):
     """Insert a new job description linked to a resume. Returns the Job (score set separately)."""
+    embedding_fields = job_embedding_fields(job_description)
+    jd_keywords = keyword_set(job_description)
     db = SessionLocal()
-    new_job = Job(resume_id=resume_id, name=name, job_description=job_description)
+    new_job = Job(resume_id=resume_id, name=name, job_description=job_description, **embedding_fields)
     db.add(new_job)
+    counted = record_document(db, embedding_fields["jd_hash"], jd_keywords)
     db.commit()
     db.refresh(new_job)
     db.close()
+    if counted:
+        on_document_recorded(jd_keywords)
+    on_job_saved(new_job)
     return new_job
 
 
 def insert_job_description(name: str, job_description: str):
     """Legacy: insert job by name only (no resume_id). Prefer insert_job for new flow."""
+    jd_keywords = keyword_set(job_description)
     db = SessionLocal()
-    new_job = Job(name=name, job_description=job_description)
+    new_job = Job(name=name, job_description=job_description, jd_hash=content_hash(job_description or ""))
     db.add(new_job)
+    counted = record_document(db, new_job.jd_hash, jd_keywords)
     db.commit()
     db.refresh(new_job)
     db.close()
+    if counted:
+        on_document_recorded(jd_keywords)
     return new_job
 
 
@@ -112,3 +275,21 @@ def get_jobs_by_resume_id(resume_id: int):
         return db.query(Job).filter(Job.resume_id == resume_id).order_by(Job.id).all()
     finally:
         db.close()
+
+
+def get_job_for_resume(resume_id: int, job_id: int):
+    """Return the job with this id if it belongs to this resume, else None (primary-key lookup)."""
+    db = SessionLocal()
+    try:
+        return db.query(Job).filter(Job.id == job_id, Job.resume_id == resume_id).first()
+    finally:
+        db.close()
+
+
+def get_latest_job(resume_id: int):
+    """Return this resume's most recent job (highest id), or None; one index seek on (resume_id, id)."""
+    db = SessionLocal()
+    try:
+        return db.query(Job).filter(Job.resume_id == resume_id).order_by(Job.id.desc()).first()
+    finally:
+        db.close()
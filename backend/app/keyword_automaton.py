@@ -0,0 +1,146 @@
+"""
+Prebuilt Aho-Corasick automaton for tech keyword matching.
+
+Building the automaton (add_word per keyword + make_automaton) and the keyword -> category map costs
+time at every import, growing with the taxonomy. Both are pickled to KEYWORD_AUTOMATON_PATH together
+with a hash of keyword_list.py; the first keyword match loads them with one unpickle and rebuilds (and rewrites the
+file) automatically when the list changes. Build ahead of time with backend/build_keyword_automaton.py.
+
+The file is written and read only by this app; do not point KEYWORD_AUTOMATON_PATH at untrusted files.
+"""
+import hashlib
+import os
+import pickle
+import time
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from . import keyword_list
+
+if TYPE_CHECKING:
+    # Imported where an automaton is built (unpickling imports it on its own), not at app startup
+    import ahocorasick
+
+# Bump when the pickled payload layout changes
+FORMAT_VERSION = 2
+KEYWORD_AUTOMATON_PATH = os.getenv("KEYWORD_AUTOMATON_PATH") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "keyword_automaton.pkl"
+)
+
+
+# Characters that continue a token: a keyword must not touch one of these on that side. "+" and "#"
+# keep "c" out of "c++"/"c#"; "-" and "." on the left keep "c" out of "objective-c" and "js" out of
+# "node.js", while "python-based" and "...and go." still match on the right.
+_LEFT_TOKEN_CHARS = frozenset("_+#-.")
+_RIGHT_TOKEN_CHARS = frozenset("_+#")
+
+
+def find_keywords(automaton, lower: str) -> set:
+    """
+    Canonical keywords occurring in lower (already lowercased) as whole tokens. One Aho-Corasick
+    pass; each raw match is accepted only if the characters on either side are token boundaries.
+    """
+    # Pad with spaces so every match has a character on both sides (no bounds checks in the loop)
+    lower = f" {lower} "
+    found = set()
+    for end, (length, kw) in automaton.iter(lower):
+        if kw in found:
+            continue
+        prev = lower[end - length]
+        if prev.isalnum() or prev in _LEFT_TOKEN_CHARS:
+            continue
+        nxt = lower[end + 1]
+        if nxt.isalnum() or nxt in _RIGHT_TOKEN_CHARS:
+            continue
+        found.add(kw)
+    return found
+
+
+def count_keywords(automaton, lower: str) -> Dict[str, int]:
+    """Like find_keywords, but the number of whole-token occurrences of each canonical keyword."""
+    lower = f" {lower} "
+    counts: Dict[str, int] = {}
+    for end, (length, kw) in automaton.iter(lower):
+        prev = lower[end - length]
+        if prev.isalnum() or prev in _LEFT_TOKEN_CHARS:
+            continue
+        nxt = lower[end + 1]
+        if nxt.isalnum() or nxt in _RIGHT_TOKEN_CHARS:
+            continue
+        counts[kw] = counts.get(kw, 0) + 1
+    return counts
+
+
+def keyword_list_hash() -> str:
+    """Hash of keyword_list.py (its source, or the keyword data if the source is unavailable) + format version."""
+    h = hashlib.sha256(f"v{FORMAT_VERSION}\0".encode())
+    try:
+        with open(keyword_list.__file__, "rb") as f:
+            h.update(f.read())
+    except OSError:
+        h.update(repr(sorted(keyword_list.tech_keywords)).encode())
+        h.update(repr(keyword_list.KEYWORD_CATEGORIES).encode())
+        h.update(repr(sorted(keyword_list.KEYWORD_SYNONYMS.items())).encode())
+    return h.hexdigest()
+
+
+def build() -> Tuple["ahocorasick.Automaton", Dict[str, str]]:
+    """
+    Automaton over the lowercase keywords and their aliases, and the keyword -> category map. Each
+    entry's payload is (matched length, canonical keyword), so an alias such as "k8s" is reported as
+    "kubernetes" in the same pass.
+    """
+    import ahocorasick
+
+    automaton = ahocorasick.Automaton()
+    for key in sorted(keyword_list.tech_keywords):
+        key = key.lower()
+        automaton.add_word(key, (len(key), key))
+    for alias, canonical in keyword_list.KEYWORD_SYNONYMS.items():
+        alias = alias.lower()
+        automaton.add_word(alias, (len(alias), canonical.lower()))
+    automaton.make_automaton()
+    categories = {}
+    for cat_name, kws in keyword_list.KEYWORD_CATEGORIES:
+        for k in kws:
+            categories[k.lower()] = cat_name
+    return automaton, categories
+
+
+def save(path: str, automaton, categories: Dict[str, str], source_hash: str) -> None:
+    """Write the pickle atomically (a concurrent reader never sees a partial file)."""
+    payload = {"source_hash": source_hash, "automaton": automaton, "categories": categories}
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def _load_cached(path: str, source_hash: str) -> Optional[Tuple["ahocorasick.Automaton", Dict[str, str]]]:
+    try:
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Warning: could not load keyword automaton {path}: {e}", flush=True)
+        return None
+    if not isinstance(payload, dict) or payload.get("source_hash") != source_hash:
+        return None
+    return payload["automaton"], payload["categories"]
+
+
+def load_keyword_automaton(path: Optional[str] = None) -> Tuple["ahocorasick.Automaton", Dict[str, str]]:
+    """The cached automaton and category map if the cache matches keyword_list.py; otherwise build and cache them."""
+    path = path or KEYWORD_AUTOMATON_PATH
+    source_hash = keyword_list_hash()
+    cached = _load_cached(path, source_hash)
+    if cached is not None:
+        return cached
+    t0 = time.perf_counter()
+    automaton, categories = build()
+    print(f"Keyword automaton built: {len(automaton)} keywords in {time.perf_counter() - t0:.3f}s", flush=True)
+    try:
+        save(path, automaton, categories, source_hash)
+    except OSError as e:
+        print(f"Warning: could not write keyword automaton cache {path}: {e}", flush=True)
+    return automaton, categories
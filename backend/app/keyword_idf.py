@@ -0,0 +1,219 @@
+"""
+Inverse document frequency of tech keywords over stored job descriptions.
+
+keyword_doc_freq holds, per keyword, how many distinct job descriptions mention it (plus a "*" row
+counting them all). keyword_doc_hash holds the jd_hash of every description counted, so a posting
+saved again (re-uploads, batch screenings) counts once and does not make its keywords look common.
+A job insert in insert_resume_data counts a new description in the same transaction, so the table is
+never recomputed per request; each process keeps a copy that is updated in place for its own inserts and
+reloaded from the DB every KEYWORD_IDF_TTL_SECONDS to pick up other workers' inserts.
+Rebuild it from scratch with backend/backfill_keyword_idf.py (e.g. after editing keyword_list.py).
+"""
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from .database import SessionLocal, engine
+from .models import KeywordDocFreq, KeywordDocHash
+
+KEYWORD_IDF_TTL_SECONDS = float(os.getenv("KEYWORD_IDF_TTL_SECONDS", "300"))
+DOC_COUNT_KEY = "*"
+
+_table_ready = False
+
+
+def ensure_table(bind=None) -> None:
+    """Create keyword_doc_freq and keyword_doc_hash if missing (once per process), on bind or the app engine."""
+    global _table_ready
+    if not _table_ready:
+        KeywordDocFreq.__table__.create(bind=bind or engine, checkfirst=True)
+        KeywordDocHash.__table__.create(bind=bind or engine, checkfirst=True)
+        _table_ready = True
+
+
+class IdfTable:
+    """Snapshot of the document frequencies; idf(k) = ln((1 + N) / (1 + df(k))) + 1, so unseen terms weigh most."""
+
+    def __init__(self, doc_freq: Optional[Dict[str, int]] = None, n_docs: int = 0):
+        self.doc_freq = dict(doc_freq or {})
+        self.n_docs = n_docs
+        self.version = 0
+        self.loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def idf(self, keyword: str) -> float:
+        return math.log((1 + self.n_docs) / (1 + self.doc_freq.get(keyword, 0))) + 1.0
+
+    def add_documents(self, keywords: Iterable[str], count: int = 1) -> None:
+        with self._lock:
+            for kw in keywords:
+                self.doc_freq[kw] = self.doc_freq.get(kw, 0) + count
+            self.n_docs += count
+            self.version += 1
+
+    @classmethod
+    def load(cls) -> "IdfTable":
+        ensure_table()
+        db = SessionLocal()
+        try:
+            rows = db.query(KeywordDocFreq.keyword, KeywordDocFreq.doc_count).all()
+        finally:
+            db.close()
+        doc_freq = {kw: n for kw, n in rows}
+        table = cls(doc_freq, doc_freq.pop(DOC_COUNT_KEY, 0))
+        table.loaded_at = time.time()
+        return table
+
+
+_idf_table: Optional[IdfTable] = None
+_idf_lock = threading.Lock()
+
+
+def get_idf_table() -> IdfTable:
+    """Process-wide IDF snapshot, loaded on first use and reloaded after KEYWORD_IDF_TTL_SECONDS."""
+    global _idf_table
+    with _idf_lock:
+        if _idf_table is None or time.time() - _idf_table.loaded_at > KEYWORD_IDF_TTL_SECONDS:
+            try:
+                _idf_table = IdfTable.load()
+            except Exception as e:
+                # Scoring must not fail on the weights: fall back to uniform IDF until the next reload
+                print(f"Warning: could not load keyword IDF table: {e}", flush=True)
+                _idf_table = IdfTable()
+                _idf_table.loaded_at = time.time()
+        return _idf_table
+
+
+def _insert_for(dialect: str):
+    """The dialect's INSERT with ON CONFLICT support, or None (record_document then uses plain statements)."""
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def record_document(db, jd_hash: str, keywords: Iterable[str]) -> bool:
+    """
+    Count one job description in the document frequencies, inside db's transaction, unless a job
+    description with this jd_hash was counted before (re-uploads and batch screenings of one posting
+    count once). Returns True if it was counted; then call on_document_recorded after the commit.
+    """
+    ensure_table()
+    dialect = db.get_bind().dialect.name
+    if _insert_for(dialect) is None:
+        return _record_document_portable(db, jd_hash, keywords)
+    claim, bump = record_document_statements(dialect, jd_hash, keywords)
+    if not db.execute(claim).rowcount:
+        return False
+    db.execute(bump)
+    return True
+
+
+def _record_document_portable(db, jd_hash: str, keywords: Iterable[str]) -> bool:
+    """
+    record_document for databases without INSERT ... ON CONFLICT (MySQL, SQL Server, ...): the jd_hash
+    claim relies on its primary key, and each count is an UPDATE doc_count + 1, with an INSERT when no
+    row changed. Inserts run in savepoints, so losing a race to another worker is retried as an UPDATE.
+    """
+    from sqlalchemy import insert, update
+    from sqlalchemy.exc import IntegrityError
+
+    try:
+        with db.begin_nested():
+            db.execute(insert(KeywordDocHash).values(jd_hash=jd_hash))
+    except IntegrityError:
+        return False
+    for kw in sorted(set(keywords)) + [DOC_COUNT_KEY]:
+        bump = update(KeywordDocFreq).where(KeywordDocFreq.keyword == kw).values(
+            doc_count=KeywordDocFreq.doc_count + 1
+        )
+        if db.execute(bump).rowcount:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(insert(KeywordDocFreq).values(keyword=kw, doc_count=1))
+        except IntegrityError:
+            db.execute(bump)
+    return True
+
+
+def record_document_statements(dialect: str, jd_hash: str, keywords: Iterable[str]):
+    """
+    The statements record_document executes on PostgreSQL and SQLite: claim inserts jd_hash into
+    keyword_doc_hash (no row if already there); bump, the keyword_doc_freq upsert, runs only if claim
+    inserted a row.
+    """
+    insert = _insert_for(dialect)
+    claim = insert(KeywordDocHash).values(jd_hash=jd_hash).on_conflict_do_nothing(
+        index_elements=[KeywordDocHash.jd_hash]
+    )
+    values = [{"keyword": kw, "doc_count": 1} for kw in sorted(keywords)]
+    values.append({"keyword": DOC_COUNT_KEY, "doc_count": 1})
+    stmt = insert(KeywordDocFreq).values(values)
+    bump = stmt.on_conflict_do_update(
+        index_elements=[KeywordDocFreq.keyword],
+        set_={"doc_count": KeywordDocFreq.doc_count + stmt.excluded.doc_count},
+    )
+    return claim, bump
+
+
+def on_document_recorded(keywords: Iterable[str]) -> None:
+    """Apply a committed record_document (that returned True) to this process' loaded table."""
+    if _idf_table is not None:
+        _idf_table.add_documents(keywords)
+
+
+def rebuild(batch_size: int = 500) -> IdfTable:
+    """
+    Recount keyword_doc_freq from job_info (replaces its contents and keyword_doc_hash) and return the
+    new table. Each distinct job description counts once: by jd_hash, or the hash of its text for rows
+    migrate_lookup_indexes.py has not filled yet.
+    """
+    from .models import Job
+    from .scoring_logic import _extract_keywords, content_hash
+
+    ensure_table()
+    table = IdfTable()
+    db = SessionLocal()
+    try:
+        db.query(KeywordDocHash).delete()
+        db.query(KeywordDocFreq).delete()
+        last_id = 0
+        while True:
+            rows = (
+                db.query(Job.id, Job.jd_hash, Job.job_description)
+                .filter(Job.id > last_id)
+                .order_by(Job.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            page = {}
+            for _, jd_hash, text in rows:
+                page.setdefault(jd_hash or content_hash(text or ""), text)
+            counted = {h for (h,) in db.query(KeywordDocHash.jd_hash).filter(KeywordDocHash.jd_hash.in_(list(page)))}
+            new = [h for h in page if h not in counted]
+            db.add_all(KeywordDocHash(jd_hash=h) for h in new)
+            db.flush()
+            for h in new:
+                table.add_documents(_extract_keywords(page[h] or ""))
+            last_id = rows[-1][0]
+        db.add_all(KeywordDocFreq(keyword=kw, doc_count=n) for kw, n in table.doc_freq.items())
+        db.add(KeywordDocFreq(keyword=DOC_COUNT_KEY, doc_count=table.n_docs))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    global _idf_table
+    table.loaded_at = time.time()
+    with _idf_lock:
+        _idf_table = table
+    return table
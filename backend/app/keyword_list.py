@@ -104,4 +104,40 @@ KEYWORD_CATEGORIES = [
     ("Web dev concepts", web_dev_concepts_keywords),
     ("Security", cybersecurity_keywords),
     ("Other", other_keywords),
-]
\ No newline at end of file
+]
+# Alias -> canonical keyword. Aliases are matched like keywords but counted as their canonical term.
+KEYWORD_SYNONYMS = {
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "golang": "go",
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "cpp": "c++",
+    "c sharp": "c#",
+    ".net": "dotnet",
+    "sklearn": "scikit-learn",
+    "mssql": "microsoft sql server",
+    "sql server": "microsoft sql server",
+    "mongo": "mongodb",
+    "elastic search": "elasticsearch",
+    "dynamo db": "dynamodb",
+    "big query": "bigquery",
+    "gcp": "google cloud platform",
+    "google cloud": "google cloud platform",
+    "amazon web services": "aws",
+    "nlp": "natural language processing",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "angularjs": "angular",
+    "express.js": "express",
+    "expressjs": "express",
+    "tailwind": "tailwindcss",
+    "tailwind css": "tailwindcss",
+    "springboot": "spring boot",
+    "rails": "ruby on rails",
+    "restful api": "rest api",
+    "restful apis": "rest api",
+    "gitlab ci/cd": "gitlab ci",
+}
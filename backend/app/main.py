@@ -2,16 +2,19 @@ from pathlib import Path
 from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Body, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request as StarletteRequest
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from typing import List
 import asyncio
+import io
+import json
 import os
-import tempfile
 import time
+import zipfile
 
 limiter = Limiter(key_func=get_remote_address)
 app = FastAPI()
@@ -48,13 +51,34 @@ ALLOWED_EXTENSIONS = {".pdf"}
 PDF_MAGIC = b"%PDF-"
 MAX_JOB_DESCRIPTION_LENGTH = 50_000  # characters
 MAX_PARSED_RESUME_LENGTH = 500_000  # total chars from parsed PDF (avoid DoS)
+MAX_RANK_TOP_K = 100
+MAX_BATCH_FILES = 200  # PDFs per batch upload (including those inside zips)
+MAX_BATCH_UPLOAD_BYTES = 100 * 1024 * 1024  # 100 MB total per batch request
+MAX_BATCH_EXPANDED_BYTES = 100 * 1024 * 1024  # 100 MB total of the batch's PDFs once zips are unpacked
+ZIP_EXTENSIONS = {".zip"}
+
+def _parsed_text_length(parsed_resume: dict) -> int:
+    """Total characters across the parsed resume sections."""
+    return sum(
+        len(str(v) or "")
+        for v in (
+            parsed_resume.get("education"),
+            parsed_resume.get("experience"),
+            parsed_resume.get("projects"),
+            parsed_resume.get("skills"),
+            parsed_resume.get("objective"),
+            parsed_resume.get("certifications"),
+        )
+        if v
+    )
 
-def _safe_remove(path: str) -> None:
-    try:
-        if path and os.path.exists(path):
-            os.remove(path)
-    except OSError as e:
-        print(f"Warning: could not remove temp file {path}: {e}")
+
+@app.on_event("shutdown")
+def _save_indexes():
+    """Persist in-memory indexes (if configured) so the next start skips retraining."""
+    from .ranking import save_resume_index
+
+    save_resume_index()
 
 
 @app.get("/health")
@@ -63,17 +87,36 @@ async def health():
     return {"status": "ok"}
 
 
+@app.get("/stats")
+@limiter.limit("60/minute")
+async def stats(request: Request):
+    """Cache hit/miss counters and PDF extractor timings for monitoring."""
+    from .ml_model.embedding_cache import get_embedding_cache
+    from . import parse_cache, pdf_extractors, score_cache
+    from .scoring_logic import keyword_cache_stats
+
+    return {
+        "embedding_cache": get_embedding_cache().stats(),
+        "keyword_cache": keyword_cache_stats(),
+        "parse_cache": parse_cache.stats(),
+        "score_cache": score_cache.stats(),
+        "pdf_extractors": pdf_extractors.stats(),
+    }
+
+
 @app.get("/warmup")
 @limiter.limit("6/minute")
 async def warmup(request: Request):
     """
-    Preload the ML model so the first upload is fast.
-    Call this when the app loads (e.g. from the frontend); the first call may take 1–5+ min
-    (download + load). Subsequent uploads then only take a few seconds.
+    Preload the ML model, keyword automaton, IDF table and PDF parse workers so the first upload is fast.
+    Startup imports none of them (/health answers right away); call this when the app loads (e.g. from
+    the frontend). The first call may take 1–5+ min (download + load). Subsequent uploads then only
+    take a few seconds.
     """
-    from .scoring_logic import _get_model
+    from .parse_pool import warm_parse_pool
+    from .scoring_logic import warm_up
     loop = asyncio.get_event_loop()
-    await loop.run_in_executor(None, _get_model)
+    await asyncio.gather(loop.run_in_executor(None, warm_up), warm_parse_pool())
     return {"status": "ready", "message": "Scoring model loaded."}
 
 
@@ -84,13 +127,11 @@ async def upload_file(
     file: UploadFile = File(...),
     description: str = Form(...),
 ):
-    from .resume_parser import parse_resume_pdf
-    from .insert_resume_data import (
-        get_or_create_resume,
-        insert_job,
-        update_score,
-        update_job_score,
-    )
+    from .parse_pool import parse_pdf_cached, ParseCancelled, ParseTimeout
+    from .pdf_extractors import PdfTooLarge
+    from .async_data import save_upload
+    from .insert_resume_data import upload_embeddings
+    from .models import Job, Resume
     from .scoring_logic import score_resume
 
     t_start = time.perf_counter()
@@ -116,49 +157,42 @@ async def upload_file(
             status_code=422,
             detail=f"Job description too long. Maximum is {MAX_JOB_DESCRIPTION_LENGTH:,} characters.",
         )
-    fd, file_path = tempfile.mkstemp(suffix=suffix, prefix="resume_upload_")
-    try:
-        with os.fdopen(fd, "wb") as buffer:
-            buffer.write(contents)
-    except Exception:
-        _safe_remove(file_path)
-        raise HTTPException(status_code=500, detail="Failed to save uploaded file.")
-
     try:
         t0 = time.perf_counter()
-        parsed_resume = parse_resume_pdf(file_path)
+        try:
+            # Parse straight from the upload buffer (or reuse the parse of an identical PDF)
+            parsed_resume = await parse_pdf_cached(contents, request)
+        except ParseTimeout:
+            raise HTTPException(status_code=422, detail="Resume took too long to parse.")
+        except PdfTooLarge as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except ParseCancelled:
+            raise HTTPException(status_code=499, detail="Client disconnected.")
         print(f"Parse PDF: {time.perf_counter() - t0:.1f}s", flush=True)
         if not parsed_resume:
             raise HTTPException(status_code=422, detail="Unable to parse resume.")
-        total_text = sum(
-            len(str(v) or "")
-            for v in (
-                parsed_resume.get("education"),
-                parsed_resume.get("experience"),
-                parsed_resume.get("projects"),
-                parsed_resume.get("skills"),
-                parsed_resume.get("objective"),
-                parsed_resume.get("certifications"),
-            )
-            if v
-        )
-        if total_text > MAX_PARSED_RESUME_LENGTH:
+        if _parsed_text_length(parsed_resume) > MAX_PARSED_RESUME_LENGTH:
             raise HTTPException(
                 status_code=422,
                 detail="Parsed resume content exceeds maximum allowed length.",
             )
 
-        # One resume per name: reuse or create
-        t0 = time.perf_counter()
-        resume_obj, _ = get_or_create_resume(parsed_resume)
-        job_obj = insert_job(resume_obj.id, parsed_resume["name"], description)
-        print(f"DB get/create + insert job: {time.perf_counter() - t0:.1f}s", flush=True)
-        t0 = time.perf_counter()
+        # Embed and score before touching the DB, then save everything in one transaction
+        # (one resume per name: reuse or create). Blocking work, so run off the event loop.
         loop = asyncio.get_event_loop()
-        insights = await loop.run_in_executor(None, lambda: score_resume(description, resume_obj))
+        t0 = time.perf_counter()
+        resume_fields, jd_fields = await loop.run_in_executor(None, upload_embeddings, parsed_resume, description)
+        insights = await loop.run_in_executor(
+            None,
+            score_resume,
+            description,
+            Resume(**parsed_resume, **resume_fields),
+            Job(job_description=description, **jd_fields),
+        )
         print(f"Score (model load + encode): {time.perf_counter() - t0:.1f}s", flush=True)
-        update_job_score(job_obj.id, insights["score"])
-        update_score(resume_obj.id, insights["score"])
+        t0 = time.perf_counter()
+        resume_obj, job_obj = await save_upload(parsed_resume, description, insights["score"], resume_fields, jd_fields)
+        print(f"DB save (one transaction): {time.perf_counter() - t0:.1f}s", flush=True)
 
         print(f"Upload total: {time.perf_counter() - t_start:.1f}s", flush=True)
         return {
@@ -180,21 +214,220 @@ async def upload_file(
     except Exception as e:
         print("Error processing resume:", e)
         raise HTTPException(status_code=500, detail="Failed to process resume. Please try again.") from e
-    finally:
-        _safe_remove(file_path)
     
 
+def _expand_batch_files(uploads: list):
+    """
+    Turn uploaded (filename, bytes) pairs into PDF (filename, bytes) pairs, unpacking zips.
+    Returns (pdfs, errors); errors are {"filename", "error"} dicts for skipped entries.
+    Raises 413 once the PDFs add up to more than MAX_BATCH_EXPANDED_BYTES: a zip within
+    MAX_BATCH_UPLOAD_BYTES can hold far more than that uncompressed.
+    """
+    pdfs, errors = [], []
+    expanded = 0
+
+    def _check_expanded(size: int) -> None:
+        if expanded + size > MAX_BATCH_EXPANDED_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch too large once unzipped. Maximum is {MAX_BATCH_EXPANDED_BYTES // (1024*1024)} MB of PDFs.",
+            )
+
+    for filename, contents in uploads:
+        suffix = (os.path.splitext(filename or "")[1] or "").lower()
+        if suffix in ZIP_EXTENSIONS:
+            try:
+                archive = zipfile.ZipFile(io.BytesIO(contents))
+            except zipfile.BadZipFile:
+                errors.append({"filename": filename, "error": "Invalid zip file."})
+                continue
+            with archive:
+                for info in archive.infolist():
+                    inner = info.filename
+                    if info.is_dir() or inner.startswith("__MACOSX/"):
+                        continue
+                    if (os.path.splitext(inner)[1] or "").lower() not in ALLOWED_EXTENSIONS:
+                        continue
+                    if info.file_size > MAX_UPLOAD_BYTES:
+                        errors.append({"filename": inner, "error": "File too large."})
+                        continue
+                    if len(pdfs) >= MAX_BATCH_FILES:
+                        raise HTTPException(status_code=422, detail=f"Too many PDFs. Maximum is {MAX_BATCH_FILES}.")
+                    _check_expanded(info.file_size)
+                    # The header's file_size may lie: never read more than the per-file limit
+                    with archive.open(info) as member:
+                        data = member.read(MAX_UPLOAD_BYTES + 1)
+                    if len(data) > MAX_UPLOAD_BYTES:
+                        errors.append({"filename": inner, "error": "File too large."})
+                        continue
+                    _check_expanded(len(data))
+                    expanded += len(data)
+                    pdfs.append((inner, data))
+        elif suffix in ALLOWED_EXTENSIONS:
+            if len(contents) > MAX_UPLOAD_BYTES:
+                errors.append({"filename": filename, "error": "File too large."})
+                continue
+            if len(pdfs) >= MAX_BATCH_FILES:
+                raise HTTPException(status_code=422, detail=f"Too many PDFs. Maximum is {MAX_BATCH_FILES}.")
+            _check_expanded(len(contents))
+            expanded += len(contents)
+            pdfs.append((filename, contents))
+        else:
+            errors.append({"filename": filename, "error": "Only PDF or zip files are allowed."})
+    valid = []
+    for filename, contents in pdfs:
+        if contents.startswith(PDF_MAGIC):
+            valid.append((filename, contents))
+        else:
+            errors.append({"filename": filename, "error": "File is not a valid PDF (invalid header)."})
+    return valid, errors
+
+
+def _batch_result(filename: str, parsed_resume: dict, insights: dict) -> dict:
+    return {
+        "filename": filename,
+        "name": parsed_resume["name"],
+        "score": insights["score"],
+        "breakdown": insights["breakdown"],
+        "missing_keywords": insights["missing_keywords"],
+        "missing_keywords_by_category": insights["missing_keywords_by_category"],
+        "section_scores": insights["section_scores"],
+        "recommendations": insights["recommendations"],
+    }
+
+
+@app.post("/upload/batch")
+@limiter.limit("2/minute")
+async def upload_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    description: str = Form(...),
+    stream: bool = Form(False),
+):
+    """
+    Score many resumes (PDFs and/or zips of PDFs) against one job description.
+    PDFs are parsed concurrently in a process pool, all sections plus the JD are embedded in one
+    batch, and every resume/job is saved in a single transaction. Returns results ranked by score.
+    With stream=true, responds with NDJSON: one {"event": "result"|"error"} line per resume as soon
+    as it is scored, then a final {"event": "done"} line with the saved, ranked results.
+    """
+    from .parse_pool import parse_pdf_cached, ParseCancelled, ParseTimeout
+    from .pdf_extractors import PdfTooLarge
+    from .insert_resume_data import save_batch
+    from .models import Resume
+    from .scoring_logic import score_resume, score_resumes, _encode_texts
+
+    if not description.strip():
+        raise HTTPException(status_code=422, detail="description is required")
+    if len(description) > MAX_JOB_DESCRIPTION_LENGTH:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Job description too long. Maximum is {MAX_JOB_DESCRIPTION_LENGTH:,} characters.",
+        )
+    uploads = []
+    total_bytes = 0
+    for f in files:
+        contents = await f.read()
+        total_bytes += len(contents)
+        if total_bytes > MAX_BATCH_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch too large. Maximum total size is {MAX_BATCH_UPLOAD_BYTES // (1024*1024)} MB.",
+            )
+        uploads.append((f.filename, contents))
+    pdfs, errors = _expand_batch_files(uploads)
+    if not pdfs:
+        raise HTTPException(status_code=422, detail={"message": "No valid PDFs in batch.", "errors": errors})
+
+    loop = asyncio.get_event_loop()
+
+    async def parse_one(filename: str, contents: bytes):
+        try:
+            parsed = await parse_pdf_cached(contents, request)
+        except ParseTimeout:
+            return filename, None, "Resume took too long to parse."
+        except PdfTooLarge as e:
+            return filename, None, str(e)
+        except ParseCancelled:
+            raise
+        except Exception as e:
+            print(f"Error parsing {filename}: {e}", flush=True)
+            return filename, None, "Unable to parse resume."
+        if not parsed:
+            return filename, None, "Unable to parse resume."
+        if _parsed_text_length(parsed) > MAX_PARSED_RESUME_LENGTH:
+            return filename, None, "Parsed resume content exceeds maximum allowed length."
+        return filename, parsed, None
+
+    def persist(scored: list) -> list:
+        """scored: list of (filename, parsed, insights). Saves in one transaction; returns ranked results."""
+        saved = save_batch([(parsed, insights["score"]) for _, parsed, insights in scored], description)
+        results = []
+        for (filename, parsed, insights), (resume_obj, job_obj) in zip(scored, saved):
+            result = _batch_result(filename, parsed, insights)
+            result.update({"db_id": resume_obj.id, "job_id": job_obj.id})
+            results.append(result)
+        results.sort(key=lambda r: r["score"], reverse=True)
+        return results
+
+    tasks = [parse_one(filename, contents) for filename, contents in pdfs]
+
+    if not stream:
+        try:
+            t0 = time.perf_counter()
+            parsed_all = await asyncio.gather(*tasks)
+            print(f"Batch parse ({len(tasks)} PDFs): {time.perf_counter() - t0:.1f}s", flush=True)
+            ok = [(filename, parsed) for filename, parsed, error in parsed_all if parsed]
+            errors.extend({"filename": filename, "error": error} for filename, _, error in parsed_all if error)
+            if not ok:
+                raise HTTPException(status_code=422, detail={"message": "No resumes could be parsed.", "errors": errors})
+            t0 = time.perf_counter()
+            insights_all = await loop.run_in_executor(
+                None, score_resumes, description, [Resume(**parsed) for _, parsed in ok]
+            )
+            print(f"Batch score ({len(ok)} resumes): {time.perf_counter() - t0:.1f}s", flush=True)
+            scored = [(filename, parsed, insights) for (filename, parsed), insights in zip(ok, insights_all)]
+            results = await loop.run_in_executor(None, persist, scored)
+            return {"status": "uploaded", "count": len(results), "results": results, "errors": errors}
+        except HTTPException:
+            raise
+        except ParseCancelled:
+            raise HTTPException(status_code=499, detail="Client disconnected.")
+        except Exception as e:
+            print("Error processing batch:", e, flush=True)
+            raise HTTPException(status_code=500, detail="Failed to process batch. Please try again.") from e
+
+    async def ndjson():
+        try:
+            for error in errors:
+                yield json.dumps({"event": "error", **error}) + "\n"
+            # Embed the JD once up front; each resume then only encodes its own sections.
+            await loop.run_in_executor(None, _encode_texts, [description])
+            scored = []
+            for next_done in asyncio.as_completed(tasks):
+                filename, parsed, error = await next_done
+                if error:
+                    yield json.dumps({"event": "error", "filename": filename, "error": error}) + "\n"
+                    continue
+                insights = await loop.run_in_executor(None, score_resume, description, Resume(**parsed))
+                scored.append((filename, parsed, insights))
+                yield json.dumps({"event": "result", **_batch_result(filename, parsed, insights)}) + "\n"
+            results = await loop.run_in_executor(None, persist, scored) if scored else []
+            yield json.dumps({"event": "done", "count": len(results), "results": results}) + "\n"
+        except Exception as e:
+            print("Error processing batch stream:", e, flush=True)
+            yield json.dumps({"event": "error", "error": "Failed to process batch."}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
 @app.post("/resume/{name}/job")
 @limiter.limit("20/minute")
 async def add_job_description(request: Request, name: str, body: dict = Body(...)):
     """Add a job description for an existing resume (by name). Returns the new job and score."""
-    from .insert_resume_data import (
-        get_resume_by_name,
-        insert_job,
-        update_job_score,
-        update_score,
-    )
-    from .scoring_logic import score_resume
+    from .async_data import get_resume_by_name, save_scored_job
+    from .models import Job
+    from .scoring_logic import job_embedding_fields, score_resume
 
     description = body.get("description") or body.get("job_description") or ""
     if not str(description).strip():
@@ -205,17 +438,18 @@ async def add_job_description(request: Request, name: str, body: dict = Body(...
             detail=f"Job description too long. Maximum is {MAX_JOB_DESCRIPTION_LENGTH:,} characters.",
         )
 
-    resume = get_resume_by_name(name)
+    resume = await get_resume_by_name(name)
     if not resume:
         raise HTTPException(status_code=404, detail=f"No resume found for name: {name}")
 
-    job_obj = insert_job(resume.id, name, str(description))
+    # Score first, then insert the scored job and update the resume score in one transaction
+    description = str(description)
     loop = asyncio.get_event_loop()
+    jd_fields = await loop.run_in_executor(None, job_embedding_fields, description)
     insights = await loop.run_in_executor(
-        None, lambda: score_resume(str(description), resume)
+        None, score_resume, description, resume, Job(job_description=description, **jd_fields)
     )
-    update_job_score(job_obj.id, insights["score"])
-    update_score(resume.id, insights["score"])
+    job_obj = await save_scored_job(resume.id, name, description, insights["score"], jd_fields)
 
     return {
         "name": name,
@@ -234,13 +468,13 @@ async def add_job_description(request: Request, name: str, body: dict = Body(...
 @limiter.limit("60/minute")
 async def list_jobs_for_resume(request: Request, name: str):
     """List all job descriptions (and scores) for the resume with this name."""
-    from .insert_resume_data import get_resume_by_name, get_jobs_by_resume_id
+    from .async_data import get_resume_by_name, get_jobs_by_resume_id
 
-    resume = get_resume_by_name(name)
+    resume = await get_resume_by_name(name)
     if not resume:
         raise HTTPException(status_code=404, detail=f"No resume found for name: {name}")
 
-    jobs = get_jobs_by_resume_id(resume.id)
+    jobs = await get_jobs_by_resume_id(resume.id)
     return {
         "name": name,
         "resume_id": resume.id,
@@ -255,32 +489,85 @@ async def list_jobs_for_resume(request: Request, name: str):
     }
 
 
+@app.post("/rank/resumes")
+@limiter.limit("20/minute")
+async def rank_resumes_endpoint(request: Request, body: dict = Body(...)):
+    """
+    Rank every stored resume against a job description. Body: {"description": str, "top_k": int}.
+    Returns the top_k resumes with score, breakdown, section_scores and missing_keywords.
+    """
+    from .ranking import rank_resumes
+
+    description = body.get("description") or body.get("job_description") or ""
+    if not str(description).strip():
+        raise HTTPException(status_code=422, detail="description is required")
+    if len(str(description)) > MAX_JOB_DESCRIPTION_LENGTH:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Job description too long. Maximum is {MAX_JOB_DESCRIPTION_LENGTH:,} characters.",
+        )
+    try:
+        top_k = int(body.get("top_k") or 10)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="top_k must be an integer")
+    top_k = max(1, min(top_k, MAX_RANK_TOP_K))
+
+    loop = asyncio.get_event_loop()
+    ranked = await loop.run_in_executor(None, lambda: rank_resumes(str(description), top_k))
+    return {"top_k": top_k, "total": ranked["total"], "results": ranked["results"]}
+
+
+@app.get("/resume/{name}/job_matches")
+@limiter.limit("20/minute")
+async def rank_jobs_for_resume_endpoint(request: Request, name: str, top_k: int = 10):
+    """
+    Rank every stored job description (deduplicated by content) against the resume with this name.
+    Returns the top_k jobs with score, breakdown and missing_keywords.
+    """
+    from .async_data import get_resume_by_name
+    from .ranking import rank_jobs_for_resume
+
+    resume = await get_resume_by_name(name)
+    if not resume:
+        raise HTTPException(status_code=404, detail=f"No resume found for name: {name}")
+    top_k = max(1, min(top_k, MAX_RANK_TOP_K))
+
+    loop = asyncio.get_event_loop()
+    ranked = await loop.run_in_executor(None, lambda: rank_jobs_for_resume(resume, top_k))
+    return {
+        "name": name,
+        "resume_id": resume.id,
+        "top_k": top_k,
+        "total": ranked["total"],
+        "results": ranked["results"],
+    }
+
+
 @app.post("/score_resume/{name}")
 @limiter.limit("20/minute")
 async def score_resume_endpoint(request: Request, name: str, job_id: int = None):
     """
     Get score for resume by name. If job_id is provided (query param), score for that job;
-    otherwise use the most recent job for that name.
+    otherwise use the most recent job for that name. Repeat views of an unchanged resume and JD
+    are served from the score cache.
     """
-    from .scoring_logic import score_resume
-    from .insert_resume_data import get_resume_by_name, get_jobs_by_resume_id
+    from .score_cache import cached_score
+    from .async_data import get_resume_by_name, get_job_for_resume, get_latest_job
 
     try:
-        resume = get_resume_by_name(name)
+        resume = await get_resume_by_name(name)
         if not resume:
             raise HTTPException(status_code=404, detail="Resume not found.")
 
         if job_id is not None:
-            jobs = get_jobs_by_resume_id(resume.id)
-            job = next((j for j in jobs if j.id == job_id), None)
+            job = await get_job_for_resume(resume.id, job_id)
             if not job:
                 raise HTTPException(status_code=404, detail="Job not found.")
             jd_text = job.job_description or ""
         else:
-            jobs = get_jobs_by_resume_id(resume.id)
-            if not jobs:
+            job = await get_latest_job(resume.id)
+            if not job:
                 raise HTTPException(status_code=404, detail="No job description found.")
-            job = jobs[-1]
             jd_text = job.job_description or ""
 
         if not jd_text.strip():
@@ -288,7 +575,7 @@ async def score_resume_endpoint(request: Request, name: str, job_id: int = None)
 
         loop = asyncio.get_event_loop()
         insights = await loop.run_in_executor(
-            None, lambda: score_resume(str(jd_text), resume)
+            None, lambda: cached_score(str(jd_text), resume, job)
         )
         return {
             "name": name,
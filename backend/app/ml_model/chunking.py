@@ -0,0 +1,152 @@
+"""
+Chunked embedding for texts longer than the model's input window.
+
+all-MiniLM-L6-v2 reads at most 256 word pieces and silently drops the rest, so a long experience
+section or JD was scored on its first paragraph only. ChunkedEncoder splits each text into
+overlapping windows of EMBED_CHUNK_TOKENS word pieces (EMBED_CHUNK_OVERLAP shared between
+neighbours), encodes every window of a request in one length-sorted batch, and pools each text's
+windows (EMBED_POOLING=mean|max) into one L2-normalized vector. Texts that fit in one window are
+encoded exactly as before. A text is embedded from at most EMBED_MAX_CHUNKS windows, spread evenly
+over it, so one huge upload cannot make a request encode hundreds of windows.
+"""
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+# 256-token model window minus [CLS] and [SEP]
+EMBED_CHUNK_TOKENS = int(os.getenv("EMBED_CHUNK_TOKENS", "254"))
+EMBED_CHUNK_OVERLAP = int(os.getenv("EMBED_CHUNK_OVERLAP", "32"))
+EMBED_POOLING = os.getenv("EMBED_POOLING", "mean").lower()
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+# About 3,500 tokens with the defaults, well past a long resume section or JD; 0 = no limit
+EMBED_MAX_CHUNKS = int(os.getenv("EMBED_MAX_CHUNKS", "16"))
+
+_POOLING = ("mean", "max")
+
+
+def chunk_config_id(window: int = None, overlap: int = None, pooling: str = None, max_chunks: int = None) -> str:
+    """Tag for the chunking settings; part of the embedding model id, since they change the vectors."""
+    window = window or EMBED_CHUNK_TOKENS
+    overlap = EMBED_CHUNK_OVERLAP if overlap is None else overlap
+    pooling = pooling or EMBED_POOLING
+    max_chunks = EMBED_MAX_CHUNKS if max_chunks is None else max_chunks
+    return f"chunk{window}-{overlap}-{pooling}-max{max_chunks}"
+
+
+def window_count(n_tokens: int, window: int, overlap: int) -> int:
+    """How many windows cover n_tokens tokens (before any max_chunks cap)."""
+    if n_tokens <= window:
+        return 1
+    return -(-(n_tokens - window) // max(1, window - overlap)) + 1
+
+
+def chunk_spans(
+    offsets: List[Tuple[int, int]], window: int, overlap: int, max_chunks: int = 0
+) -> List[Tuple[int, int, int]]:
+    """
+    (char_start, char_end, n_tokens) of each window over a text's token offsets. Windows hold
+    window tokens and start every window - overlap tokens; the last one ends at the last token.
+    With max_chunks > 0 and more windows than that, max_chunks of them are kept, evenly spaced and
+    including the first and the last.
+    """
+    n = len(offsets)
+    if n <= window:
+        return [(0, None, n)]
+    stride = max(1, window - overlap)
+    count = window_count(n, window, overlap)
+    keep = range(count)
+    if 0 < max_chunks < count:
+        keep = np.unique(np.linspace(0, count - 1, max_chunks).round().astype(int)).tolist()
+    spans = []
+    for i in keep:
+        start = i * stride
+        end = min(start + window, n)
+        spans.append((offsets[start][0], offsets[end - 1][1], end - start))
+    return spans
+
+
+class ChunkedEncoder:
+    """
+    Wraps a model exposing encode(texts, batch_size=...) and a Hugging Face fast tokenizer
+    (.tokenizer) so that long texts are embedded window by window and pooled.
+    """
+
+    def __init__(
+        self, model, window: int = None, overlap: int = None, pooling: str = None, batch_size: int = None,
+        max_chunks: int = None,
+    ):
+        self.model = model
+        self.window = window or EMBED_CHUNK_TOKENS
+        self.overlap = EMBED_CHUNK_OVERLAP if overlap is None else overlap
+        self.pooling = (pooling or EMBED_POOLING).lower()
+        if self.pooling not in _POOLING:
+            raise ValueError(f"Unknown pooling: {self.pooling} (expected one of {_POOLING})")
+        if not 0 <= self.overlap < self.window:
+            raise ValueError("EMBED_CHUNK_OVERLAP must be at least 0 and smaller than EMBED_CHUNK_TOKENS")
+        self.batch_size = batch_size or EMBED_BATCH_SIZE
+        self.max_chunks = EMBED_MAX_CHUNKS if max_chunks is None else max_chunks
+        if self.max_chunks < 0:
+            raise ValueError("EMBED_MAX_CHUNKS must be at least 0 (0 = no limit)")
+        # Totals for monitoring / benchmarks
+        self.texts_encoded = 0
+        self.chunks_encoded = 0
+        self.tokens_encoded = 0
+        self.texts_capped = 0
+
+    def chunks(self, text: str) -> List[Tuple[str, int]]:
+        """(chunk text, n_tokens) windows of text (at most max_chunks of them when max_chunks > 0)."""
+        enc = self.model.tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=True, truncation=False, verbose=False
+        )
+        offsets = enc["offset_mapping"]
+        spans = chunk_spans(offsets, self.window, self.overlap, self.max_chunks)
+        if len(spans) < window_count(len(offsets), self.window, self.overlap):
+            self.texts_capped += 1
+        return [(text[start:end] if end is not None else text, n) for start, end, n in spans]
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """One L2-normalized float32 row per text."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        pieces, owner, lengths = [], [], []
+        for i, text in enumerate(texts):
+            for chunk, n in self.chunks(text):
+                pieces.append(chunk)
+                owner.append(i)
+                lengths.append(n)
+        # Longest first, so each batch holds windows of similar length and little padding
+        order = np.argsort(-np.asarray(lengths), kind="stable")
+        emb = self.model.encode(
+            [pieces[j] for j in order], batch_size=self.batch_size, convert_to_numpy=True, show_progress_bar=False
+        )
+        emb = np.asarray(emb, dtype=np.float32).reshape(len(pieces), -1)
+        chunk_emb = np.empty_like(emb)
+        chunk_emb[order] = emb
+        chunk_emb /= np.maximum(np.linalg.norm(chunk_emb, axis=1, keepdims=True), 1e-12)
+
+        owner = np.asarray(owner)
+        out = np.zeros((len(texts), chunk_emb.shape[1]), dtype=np.float32)
+        if self.pooling == "mean":
+            np.add.at(out, owner, chunk_emb)
+        else:
+            out[:] = -np.inf
+            np.maximum.at(out, owner, chunk_emb)
+        out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+
+        self.texts_encoded += len(texts)
+        self.chunks_encoded += len(pieces)
+        self.tokens_encoded += int(sum(lengths))
+        return out
+
+    def stats(self) -> dict:
+        return {
+            "window": self.window,
+            "overlap": self.overlap,
+            "pooling": self.pooling,
+            "max_chunks": self.max_chunks,
+            "texts": self.texts_encoded,
+            "texts_capped": self.texts_capped,
+            "chunks": self.chunks_encoded,
+            "tokens": self.tokens_encoded,
+        }
@@ -0,0 +1,183 @@
+"""
+Content-addressed cache for sentence embeddings.
+
+Keys are a SHA-256 of the model name plus the whitespace-normalized text, so the same JD or
+unchanged resume section is only ever run through the transformer once per model. Entries live
+in an in-process LRU bounded by a byte budget; if EMBEDDING_CACHE_PATH is set, they are also
+written to a SQLite file (float32 blobs) so they survive restarts.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = int(float(os.getenv("EMBEDDING_CACHE_MAX_MB", "64")) * 1024 * 1024)
+DEFAULT_DISK_PATH = os.getenv("EMBEDDING_CACHE_PATH") or None
+
+# Rough per-entry bookkeeping cost (key string, OrderedDict node, ndarray header)
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace; the tokenizer ignores them, so the embedding is identical."""
+    return " ".join(str(text or "").split())
+
+
+def text_key(text: str, model_name: str) -> str:
+    """Cache key for one text under one model."""
+    h = hashlib.sha256()
+    h.update(model_name.encode("utf-8"))
+    h.update(b"\0")
+    h.update(normalize_text(text).encode("utf-8"))
+    return h.hexdigest()
+
+
+class EmbeddingCache:
+    """LRU of key -> float32 vector with a byte budget and an optional SQLite tier."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, disk_path: Optional[str] = DEFAULT_DISK_PATH):
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if disk_path:
+            self._open_disk(disk_path)
+
+    def _open_disk(self, path: str) -> None:
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vec BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        """Insert into the LRU (caller holds the lock) and evict down to the byte budget."""
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            return
+        size = vec.nbytes + _ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        self._lru[key] = vec
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._lru:
+            _, old = self._lru.popitem(last=False)
+            self._bytes -= old.nbytes + _ENTRY_OVERHEAD_BYTES
+            self.evictions += 1
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors for whichever keys are present (memory first, then disk)."""
+        found = {}
+        pending = []
+        with self._lock:
+            for key in keys:
+                if key in found:
+                    continue
+                vec = self._lru.get(key)
+                if vec is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = vec
+                    self.hits += 1
+                else:
+                    pending.append(key)
+            if pending and self._conn is not None:
+                pending = list(dict.fromkeys(pending))
+                for i in range(0, len(pending), 500):
+                    chunk = pending[i:i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT key, vec FROM embeddings WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        vec = np.frombuffer(blob, dtype=np.float32)
+                        found[key] = vec
+                        self._remember(key, vec)
+                        self.disk_hits += 1
+                pending = [k for k in pending if k not in found]
+            self.misses += len(pending)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Store vectors (as read-only float32) in memory and, if enabled, on disk."""
+        if not items:
+            return
+        with self._lock:
+            rows = []
+            for key, vec in items.items():
+                vec = np.ascontiguousarray(vec, dtype=np.float32)
+                vec.setflags(write=False)
+                self._remember(key, vec)
+                rows.append((key, vec.tobytes()))
+            if self._conn is not None:
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vec) VALUES (?, ?)", rows)
+                self._conn.commit()
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the disk tier is left alone)."""
+        with self._lock:
+            self._lru.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._lru),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "disk_path": self.disk_path,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide cache, created on first use from EMBEDDING_CACHE_MAX_MB / EMBEDDING_CACHE_PATH."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache()
+    return _cache
+
+
+def cached_encode(texts: List[str], model_name: str, encode_fn) -> np.ndarray:
+    """
+    Return one embedding row per text, calling encode_fn(list_of_texts) -> matrix only for texts
+    that are not cached yet (deduplicated, in one batch).
+    """
+    cache = get_embedding_cache()
+    keys = [text_key(t, model_name) for t in texts]
+    found = cache.get_many(keys)
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+    if missing:
+        encoded = encode_fn(list(missing.values()))
+        fresh = dict(zip(missing.keys(), encoded))
+        cache.put_many(fresh)
+        found.update(fresh)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.stack([found[key] for key in keys])
@@ -0,0 +1,138 @@
+"""
+Sentence embedder with a selectable inference backend.
+
+EMBEDDING_BACKEND picks how all-MiniLM-L6-v2 is run:
+  torch      - sentence_transformers.SentenceTransformer (default; imports the full torch stack)
+  onnx       - the model exported to ONNX, run with onnxruntime on CPU
+  onnx-int8  - the same graph with dynamically quantized int8 weights (about 4x smaller; usually fastest on CPU)
+
+The ONNX backends never import torch or transformers: they need model.onnx / model-int8.onnx,
+tokenizer.json and embedder.json in ONNX_MODEL_DIR, written by backend/export_onnx_model.py.
+Every backend exposes the part of the SentenceTransformer interface the app uses (encode() and a
+callable .tokenizer returning offset_mapping), so ChunkedEncoder works on any of them.
+"""
+import json
+import os
+from typing import List, Optional
+
+import numpy as np
+
+BACKENDS = ("torch", "onnx", "onnx-int8")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx")
+# 0 lets onnxruntime use one thread per physical core
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+
+ONNX_FILES = {"onnx": "model.onnx", "onnx-int8": "model-int8.onnx"}
+TOKENIZER_FILE = "tokenizer.json"
+META_FILE = "embedder.json"
+
+
+def selected_backend(backend: Optional[str] = None) -> str:
+    backend = (backend or EMBEDDING_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND: {backend} (expected one of {BACKENDS})")
+    return backend
+
+
+def backend_tag(backend: Optional[str] = None) -> str:
+    """
+    Suffix for the embedding model id. fp32 ONNX reproduces the torch vectors (to ~1e-6), so stored
+    embeddings stay valid; int8 vectors differ slightly and are tagged so they are not mixed.
+    """
+    return "int8" if selected_backend(backend) == "onnx-int8" else ""
+
+
+class _TokenizerAdapter:
+    """Callable like a Hugging Face fast tokenizer, for what ChunkedEncoder and the benchmarks need."""
+
+    def __init__(self, tokenizer):
+        self._tokenizer = tokenizer
+
+    def __call__(self, text: str, add_special_tokens: bool = True, return_offsets_mapping: bool = False, **_):
+        enc = self._tokenizer.encode(text, add_special_tokens=add_special_tokens)
+        out = {"input_ids": enc.ids, "attention_mask": enc.attention_mask}
+        if return_offsets_mapping:
+            out["offset_mapping"] = enc.offsets
+        return out
+
+
+class OnnxEmbedder:
+    """
+    Transformer graph in onnxruntime + mean pooling over the attention mask + L2 normalization,
+    i.e. the Transformer -> Pooling -> Normalize pipeline of the SentenceTransformer it was exported from.
+    """
+
+    def __init__(self, model_dir: str, quantized: bool = False, intra_op_threads: int = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        path = os.path.join(model_dir, ONNX_FILES["onnx-int8" if quantized else "onnx"])
+        if not os.path.isfile(path):
+            raise FileNotFoundError(
+                f"{path} not found; run python backend/export_onnx_model.py or set EMBEDDING_BACKEND=torch"
+            )
+        with open(os.path.join(model_dir, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.max_seq_length = int(self.meta["max_seq_length"])
+
+        tokenizer_path = os.path.join(model_dir, TOKENIZER_FILE)
+        plain = Tokenizer.from_file(tokenizer_path)
+        plain.no_truncation()
+        plain.no_padding()
+        self.tokenizer = _TokenizerAdapter(plain)
+        # Model input: truncated to the model window like SentenceTransformer, padded per batch
+        self._batch_tokenizer = Tokenizer.from_file(tokenizer_path)
+        self._batch_tokenizer.enable_truncation(self.max_seq_length)
+        pad_id = self._batch_tokenizer.token_to_id(self.meta.get("pad_token", "[PAD]")) or 0
+        self._batch_tokenizer.enable_padding(pad_id=pad_id, pad_token=self.meta.get("pad_token", "[PAD]"))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        threads = ONNX_INTRA_OP_THREADS if intra_op_threads is None else intra_op_threads
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self.path = path
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return int(self.meta["dimension"])
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encs = self._batch_tokenizer.encode_batch(texts)
+        input_ids = np.asarray([e.ids for e in encs], dtype=np.int64)
+        mask = np.asarray([e.attention_mask for e in encs], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": mask}
+        if "token_type_ids" in self._input_names:
+            feeds["token_type_ids"] = np.asarray([e.type_ids for e in encs], dtype=np.int64)
+        hidden = self.session.run(None, {k: v for k, v in feeds.items() if k in self._input_names})[0]
+        m = mask[:, :, None].astype(np.float32)
+        pooled = (hidden * m).sum(axis=1) / np.maximum(m.sum(axis=1), 1e-9)
+        return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+
+    def encode(self, texts, batch_size: int = 32, convert_to_numpy: bool = True, show_progress_bar: bool = False, **_):
+        """SentenceTransformer.encode subset: list of texts (or one text) -> float32 rows."""
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        out = np.concatenate(
+            [self._encode_batch(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)]
+        ).astype(np.float32, copy=False)
+        return out[0] if single else out
+
+
+def load_embedder(model_name: str, backend: Optional[str] = None, model_dir: Optional[str] = None):
+    """The embedding model for backend (default EMBEDDING_BACKEND)."""
+    backend = selected_backend(backend)
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(model_name)
+    model_dir = model_dir or ONNX_MODEL_DIR
+    embedder = OnnxEmbedder(model_dir, quantized=backend == "onnx-int8")
+    exported = embedder.meta.get("model_name")
+    if exported and os.path.basename(exported.rstrip("/")) != os.path.basename(model_name.rstrip("/")):
+        raise ValueError(f"{model_dir} holds an export of {exported}, not {model_name}")
+    return embedder
@@ -2,6 +2,7 @@ import re
 
 from app.query import query_resume
 from app.query import query_job_description
+from app.query import stream_resumes
 
 
 class PreprocessResume:
@@ -17,6 +18,15 @@ class PreprocessResume:
         job_description = query_job_description(self.name)
         return job_description
     
+    @classmethod
+    def iter_cleaned_resumes(cls, batch_size=500):
+        """Yield (resume row, cleaned sections) for every resume, streamed in batches (constant memory)."""
+        preprocessor = cls(None)
+        for rows in stream_resumes(batch_size):
+            for row in rows:
+                # Text sections: education .. certifications (columns 2-7)
+                yield row, preprocessor.clean_resume_characters(row[2:8])
+
     def clean_resume_characters(self, resume):
         new_resume = []
         for section in resume:
@@ -1,5 +1,5 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, LargeBinary, Index
 
 
 Base = declarative_base()
@@ -9,7 +9,8 @@ class Resume(Base):
     __tablename__ = "resume_info"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(50), nullable=True)
+    # Every endpoint looks resumes up by name
+    name = Column(String(50), nullable=True, index=True)
     education = Column(Text, nullable=True)
     experience = Column(Text, nullable=True)
     projects = Column(Text, nullable=True)
@@ -17,6 +18,10 @@ class Resume(Base):
     objective = Column(Text, nullable=True)
     certifications = Column(Text, nullable=True)
     score = Column(Float, nullable=True)
+    # Per-section embeddings: float32 rows, one per name in embedded_sections (comma-separated)
+    section_embeddings = Column(LargeBinary, nullable=True)
+    embedded_sections = Column(String(100), nullable=True)
+    embedding_model = Column(String(100), nullable=True)
 
 
 class Job(Base):
@@ -27,5 +32,49 @@ class Job(Base):
     name = Column(String(50), nullable=True)
     job_description = Column(Text, nullable=True)
     score = Column(Float, nullable=True)
+    # Job description embedding: one float32 vector
+    jd_embedding = Column(LargeBinary, nullable=True)
+    embedding_model = Column(String(100), nullable=True)
+    # SHA-256 of the whitespace-normalized job_description (scoring_logic.content_hash)
+    jd_hash = Column(String(64), nullable=True, index=True)
+
+    # A resume's jobs by id: serves "jobs of resume X" and "latest job of resume X" (ORDER BY id DESC LIMIT 1);
+    # (name, id) serves query.query_job_description's latest job by name the same way
+    __table_args__ = (
+        Index("ix_job_info_resume_id_id", "resume_id", "id"),
+        Index("ix_job_info_name_id", "name", "id"),
+    )
+
+
+class ParsedPdf(Base):
+    """Parsed section dict (JSON) per uploaded PDF, keyed by parse_cache.pdf_hash (file bytes, parser version, extractor)."""
+    __tablename__ = "parsed_pdf_cache"
+
+    content_hash = Column(String(64), primary_key=True)
+    parsed = Column(Text, nullable=False)
+
+
+class ScoreResult(Base):
+    """score_resume insights (JSON) per resume content, JD content, model and weights; see score_cache.py."""
+    __tablename__ = "score_result_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    # Stored results are deleted when this resume's text changes
+    resume_id = Column(Integer, nullable=True, index=True)
+    insights = Column(Text, nullable=False)
+    created_at = Column(Float, nullable=False)
+
+
+class KeywordDocFreq(Base):
+    """Number of distinct job descriptions (by jd_hash) containing each keyword; keyword "*" counts them all."""
+    __tablename__ = "keyword_doc_freq"
+
+    keyword = Column(String(100), primary_key=True)
+    doc_count = Column(Integer, nullable=False, default=0)
+
 
+class KeywordDocHash(Base):
+    """jd_hash of every job description already counted in keyword_doc_freq (each counts once)."""
+    __tablename__ = "keyword_doc_hash"
 
+    jd_hash = Column(String(64), primary_key=True)
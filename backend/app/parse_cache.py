@@ -0,0 +1,121 @@
+"""
+Content-hash cache of parsed PDFs.
+
+Candidates often upload the identical PDF against several job descriptions. Uploads are keyed by the
+SHA-256 of their raw bytes, the parser version and the PDF extractor (PDF_EXTRACTOR), so a new parser
+or a different extractor never serves an older parse; the parsed section dict is kept in a bounded in-memory LRU and, if
+PARSE_CACHE_DB is enabled, in the parsed_pdf_cache table so it is shared across workers and restarts.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", "256"))
+PARSE_CACHE_DB = os.getenv("PARSE_CACHE_DB", "").lower() in ("1", "true", "yes")
+# Bump when resume_parser / pdf_extractors produce different sections for the same PDF
+PARSER_VERSION = 2
+
+_lru: "OrderedDict[str, dict]" = OrderedDict()
+_lock = threading.Lock()
+_table_ready = False
+_counters = {"hits": 0, "db_hits": 0, "misses": 0}
+
+
+def pdf_hash(contents: bytes) -> str:
+    """Cache key for an upload: its bytes, PARSER_VERSION and the extractor that would parse it."""
+    from .pdf_extractors import DEFAULT_EXTRACTOR
+
+    digest = hashlib.sha256(contents)
+    digest.update(f"\0parser={PARSER_VERSION}\0extractor={DEFAULT_EXTRACTOR}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _remember(key: str, parsed: dict) -> None:
+    with _lock:
+        _lru[key] = parsed
+        _lru.move_to_end(key)
+        while len(_lru) > PARSE_CACHE_MAX_ENTRIES:
+            _lru.popitem(last=False)
+
+
+def _ensure_table() -> None:
+    global _table_ready
+    if not _table_ready:
+        from .database import engine
+        from .models import ParsedPdf
+
+        ParsedPdf.__table__.create(bind=engine, checkfirst=True)
+        _table_ready = True
+
+
+def get(key: str) -> Optional[dict]:
+    """Parsed section dict for this content hash, or None. Returns a copy the caller may modify."""
+    with _lock:
+        parsed = _lru.get(key)
+        if parsed is not None:
+            _lru.move_to_end(key)
+            _counters["hits"] += 1
+            return dict(parsed)
+    if PARSE_CACHE_DB:
+        from .database import SessionLocal
+        from .models import ParsedPdf
+
+        row = None
+        try:
+            _ensure_table()
+            db = SessionLocal()
+            try:
+                row = db.query(ParsedPdf).filter(ParsedPdf.content_hash == key).first()
+            finally:
+                db.close()
+        except Exception as e:
+            # A cache that cannot be read is a miss: the caller parses the PDF
+            print(f"Warning: could not read parse cache: {e}", flush=True)
+        if row is not None:
+            parsed = json.loads(row.parsed)
+            _remember(key, parsed)
+            with _lock:
+                _counters["db_hits"] += 1
+            return dict(parsed)
+    with _lock:
+        _counters["misses"] += 1
+    return None
+
+
+def put(key: str, parsed: dict) -> None:
+    """Cache a successful parse (memory, and the DB table when enabled)."""
+    if not parsed:
+        return
+    _remember(key, dict(parsed))
+    if PARSE_CACHE_DB:
+        from .database import SessionLocal
+        from .models import ParsedPdf
+
+        try:
+            _ensure_table()
+            db = SessionLocal()
+            try:
+                db.merge(ParsedPdf(content_hash=key, parsed=json.dumps(parsed)))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        except Exception as e:
+            print(f"Warning: could not store parsed PDF in cache: {e}", flush=True)
+
+
+def stats() -> dict:
+    with _lock:
+        lookups = sum(_counters.values())
+        return {
+            "entries": len(_lru),
+            "max_entries": PARSE_CACHE_MAX_ENTRIES,
+            **_counters,
+            "hit_rate": round((_counters["hits"] + _counters["db_hits"]) / lookups, 4) if lookups else 0.0,
+            "db_enabled": PARSE_CACHE_DB,
+        }
@@ -0,0 +1,159 @@
+"""
+PDF parsing off the event loop.
+
+pdfminer is pure Python and CPU-bound, so parsing in the request handler (or a thread) stalls every
+other request on the worker, /health included. parse_pdf runs parse_resume_pdf in a bounded
+ProcessPoolExecutor with a per-document timeout, and stops waiting if the client disconnects.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from . import parse_cache, pdf_extractors
+from .resume_parser import parse_resume_pdf
+
+PDF_PARSE_WORKERS = max(1, int(os.getenv("PDF_PARSE_WORKERS", "2")))
+PDF_PARSE_TIMEOUT_SECONDS = float(os.getenv("PDF_PARSE_TIMEOUT_SECONDS", "60"))
+_DISCONNECT_POLL_SECONDS = 0.25
+
+
+class ParseTimeout(Exception):
+    """Parsing one document took longer than the timeout; its worker was killed."""
+
+
+class ParseCancelled(Exception):
+    """The client disconnected before parsing finished."""
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = weakref.WeakKeyDictionary()
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Process pool for PDF parsing (spawned lazily; spawn avoids forking the app's threads)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=PDF_PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor) -> None:
+    """Kill the workers of a pool (e.g. one stuck on a pathological PDF); the next call starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    # ProcessPoolExecutor cannot cancel a running task, so terminate its processes directly.
+    for proc in list((getattr(broken, "_processes", None) or {}).values()):
+        try:
+            proc.terminate()
+        except Exception:
+            pass
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _parse_in_worker(source):
+    """Runs in a pool process: the parse plus that process's extractor timings, for the parent's /stats."""
+    pdf_extractors.drain_timings()
+    try:
+        parsed = parse_resume_pdf(source)
+    except Exception as e:
+        # Exceptions pickle their __dict__, so the timings travel back with the error
+        e.extractor_timings = pdf_extractors.drain_timings()
+        raise
+    return parsed, pdf_extractors.drain_timings()
+
+
+def _warm_worker() -> int:
+    pdf_extractors.preload()
+    return os.getpid()
+
+
+async def warm_parse_pool() -> int:
+    """Spawn the parse workers and import the PDF backends in them; returns how many workers answered."""
+    loop = asyncio.get_running_loop()
+    pool = get_parse_pool()
+    pids = await asyncio.gather(*(loop.run_in_executor(pool, _warm_worker) for _ in range(PDF_PARSE_WORKERS)))
+    return len(set(pids))
+
+
+def _discard_result(future) -> None:
+    """Mark an abandoned future's exception as retrieved so asyncio doesn't log it."""
+    if not future.cancelled():
+        future.exception()
+
+
+def _get_slots() -> asyncio.Semaphore:
+    # At most PDF_PARSE_WORKERS documents are handed to the pool at once; the rest wait here,
+    # where a disconnect can drop them without ever reaching a worker.
+    loop = asyncio.get_running_loop()
+    slots = _slots.get(loop)
+    if slots is None:
+        slots = _slots[loop] = asyncio.Semaphore(PDF_PARSE_WORKERS)
+    return slots
+
+
+async def parse_pdf(source, request=None, timeout: float = None):
+    """
+    parse_resume_pdf(source) in the process pool. Raises ParseTimeout after timeout seconds
+    (default PDF_PARSE_TIMEOUT_SECONDS) and ParseCancelled if request's client disconnects.
+    """
+    timeout = PDF_PARSE_TIMEOUT_SECONDS if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    async with _get_slots():
+        if request is not None and await request.is_disconnected():
+            raise ParseCancelled()
+        for attempt in range(2):
+            pool = get_parse_pool()
+            try:
+                future = loop.run_in_executor(pool, _parse_in_worker, source)
+                deadline = time.monotonic() + timeout
+                while True:
+                    wait = min(_DISCONNECT_POLL_SECONDS, max(0.0, deadline - time.monotonic()))
+                    done, _ = await asyncio.wait({future}, timeout=wait)
+                    if done:
+                        try:
+                            parsed, timings = future.result()
+                        except Exception as e:
+                            pdf_extractors.record_timings(getattr(e, "extractor_timings", ()))
+                            raise
+                        pdf_extractors.record_timings(timings)
+                        return parsed
+                    if request is not None and await request.is_disconnected():
+                        # The running task cannot be interrupted without killing shared workers;
+                        # it is bounded by the timeout, so just stop waiting for it.
+                        future.cancel()
+                        future.add_done_callback(_discard_result)
+                        raise ParseCancelled()
+                    if time.monotonic() >= deadline:
+                        future.add_done_callback(_discard_result)
+                        _reset_pool(pool)
+                        raise ParseTimeout()
+            except BrokenProcessPool:
+                # Another request's timeout recycled the pool under us; retry once on a fresh one.
+                _reset_pool(pool)
+                if attempt:
+                    raise
+
+
+async def parse_pdf_cached(contents: bytes, request=None, timeout: float = None):
+    """parse_pdf for raw upload bytes, served from the content-hash parse cache when possible."""
+    loop = asyncio.get_running_loop()
+    key = parse_cache.pdf_hash(contents)
+    # The cache may hit the DB, so look it up off the event loop
+    parsed = await loop.run_in_executor(None, parse_cache.get, key)
+    if parsed is not None:
+        return parsed
+    parsed = await parse_pdf(contents, request, timeout)
+    if parsed:
+        await loop.run_in_executor(None, parse_cache.put, key, parsed)
+    return parsed
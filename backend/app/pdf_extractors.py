@@ -0,0 +1,265 @@
+"""
+Pluggable PDF text extraction.
+
+Three backends over the PDF libraries already in requirements.txt:
+  pdfium     - pypdfium2 (PDFium, C++): fastest, the default
+  pdfminer   - pdfminer.six (pure Python): slowest, most tolerant; the fallback
+  pdfplumber - pdfplumber (layout-aware, built on pdfminer)
+
+iter_pdf_pages yields text page by page using PDF_EXTRACTOR (default pdfium), stops early once a
+document exceeds PDF_MAX_PAGES or PDF_MAX_CHARS, and falls back to pdfminer when the text is empty
+or looks garbled (unmapped glyphs, replacement characters, control bytes). Every attempt is timed;
+the timings are kept per backend for /stats.
+"""
+import io
+import os
+import re
+import threading
+import time
+from contextlib import closing
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_EXTRACTOR = os.getenv("PDF_EXTRACTOR", "pdfium").lower()
+FALLBACK_EXTRACTOR = "pdfminer"
+# Resumes are a few pages; stop extracting anything far bigger than that
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "500000"))
+# Text extracted before the garbled check decides whether to fall back
+_GARBLE_SAMPLE_CHARS = 2000
+
+# Below this share of "ordinary" characters the text is treated as garbled
+_MIN_CLEAN_RATIO = 0.85
+_CID_RE = re.compile(r"\(cid:\d+\)")
+_CLEAN_CHAR_RE = re.compile(r"[\w\s.,;:!?'\"()\[\]{}<>/\\|@#$%&*+=~^`_\-–—•·’‘“”…]", re.UNICODE)
+
+
+def _as_pdf_stream(source):
+    """Path or binary file-like object as-is; bytes/bytearray/memoryview wrapped in BytesIO (no copy to disk)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return source
+
+
+class PdfTooLarge(ValueError):
+    """The PDF has more pages than PDF_MAX_PAGES or more text than PDF_MAX_CHARS; extraction stopped early."""
+
+
+def _check_page_count(count: int, max_pages) -> None:
+    if max_pages is not None and count > max_pages:
+        raise PdfTooLarge(f"Resume has more than {max_pages} pages.")
+
+
+def _pages_pdfium(source, max_pages=None) -> Iterator[str]:
+    import pypdfium2 as pdfium
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = bytes(source)
+    pdf = pdfium.PdfDocument(source)
+    try:
+        # The page count is in the document's page tree, so oversized PDFs are rejected before any text work
+        _check_page_count(len(pdf), max_pages)
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n")
+            finally:
+                textpage.close()
+                page.close()
+            yield text
+    finally:
+        pdf.close()
+
+
+def _pages_pdfminer(source, max_pages=None) -> Iterator[str]:
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+
+    # pdfminer lays pages out lazily, so stop after the first page past the cap
+    maxpages = max_pages + 1 if max_pages is not None else 0
+    for n, page in enumerate(extract_pages(_as_pdf_stream(source), maxpages=maxpages), start=1):
+        _check_page_count(n, max_pages)
+        yield "".join(el.get_text() for el in page if isinstance(el, LTTextContainer))
+
+
+def _pages_pdfplumber(source, max_pages=None) -> Iterator[str]:
+    import pdfplumber
+
+    with pdfplumber.open(_as_pdf_stream(source)) as pdf:
+        _check_page_count(len(pdf.pages), max_pages)
+        for page in pdf.pages:
+            yield page.extract_text() or ""
+            page.close()
+
+
+EXTRACTORS: Dict[str, Callable[..., Iterator[str]]] = {
+    "pdfium": _pages_pdfium,
+    "pdfminer": _pages_pdfminer,
+    "pdfplumber": _pages_pdfplumber,
+}
+
+# Imported inside the page generators, so the app starts without them
+_BACKEND_MODULES = {
+    "pdfium": ("pypdfium2",),
+    "pdfminer": ("pdfminer.high_level", "pdfminer.layout"),
+    "pdfplumber": ("pdfplumber",),
+}
+
+
+def preload(backend: Optional[str] = None) -> None:
+    """Import the backend (default PDF_EXTRACTOR) and the fallback now instead of on the first PDF."""
+    import importlib
+
+    for name in {(backend or DEFAULT_EXTRACTOR).lower(), FALLBACK_EXTRACTOR}:
+        for module in _BACKEND_MODULES.get(name, ()):
+            importlib.import_module(module)
+
+
+def looks_garbled(text: str) -> bool:
+    """Heuristic for failed extraction: empty, (cid:N) glyph codes, or mostly unusual characters."""
+    if not text or not text.strip():
+        return True
+    sample = text[:20_000]
+    if "�" in sample or len(_CID_RE.findall(sample)) > 5:
+        return True
+    non_space = [c for c in sample if not c.isspace()]
+    if not non_space:
+        return True
+    clean = sum(1 for c in non_space if _CLEAN_CHAR_RE.match(c))
+    return clean / len(non_space) < _MIN_CLEAN_RATIO
+
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, dict] = {}
+_pending: List[Tuple[str, float, bool]] = []
+
+
+def _add_stat(backend: str, seconds: float, ok: bool) -> None:
+    # caller holds _stats_lock
+    s = _stats.setdefault(backend, {"calls": 0, "failures": 0, "seconds": 0.0})
+    s["calls"] += 1
+    s["seconds"] += seconds
+    if not ok:
+        s["failures"] += 1
+
+
+def _record(backend: str, seconds: float, ok: bool) -> None:
+    with _stats_lock:
+        _pending.append((backend, seconds, ok))
+        _add_stat(backend, seconds, ok)
+
+
+def drain_timings() -> List[Tuple[str, float, bool]]:
+    """Timings recorded since the last drain; parse workers ship these back to the app process."""
+    with _stats_lock:
+        out = list(_pending)
+        _pending.clear()
+    return out
+
+
+def record_timings(timings: List[Tuple[str, float, bool]]) -> None:
+    """Merge timings reported by a parse worker process."""
+    with _stats_lock:
+        for backend, seconds, ok in timings:
+            _add_stat(backend, seconds, ok)
+
+
+def stats() -> dict:
+    with _stats_lock:
+        return {
+            backend: {
+                **s,
+                "seconds": round(s["seconds"], 3),
+                "avg_ms": round(1000 * s["seconds"] / s["calls"], 2) if s["calls"] else 0.0,
+            }
+            for backend, s in _stats.items()
+        }
+
+
+def _timed_pages(backend: str, pages: Iterator[str]) -> Iterator[str]:
+    """Yield from a backend's page iterator, timing only the time spent inside it."""
+    elapsed, ok = 0.0, False
+    try:
+        while True:
+            t0 = time.perf_counter()
+            try:
+                page = next(pages)
+            except StopIteration:
+                ok = True
+                return
+            finally:
+                elapsed += time.perf_counter() - t0
+            yield page
+    finally:
+        pages.close()
+        _record(backend, elapsed, ok)
+
+
+def _open_pages(backend: str, source, max_pages) -> Iterator[str]:
+    if backend not in EXTRACTORS:
+        raise ValueError(f"Unknown PDF extractor: {backend} (expected one of {sorted(EXTRACTORS)})")
+    return _timed_pages(backend, EXTRACTORS[backend](source, max_pages))
+
+
+def iter_pdf_pages(
+    source, backend: str = None, max_pages: Optional[int] = PDF_MAX_PAGES, max_chars: Optional[int] = PDF_MAX_CHARS
+) -> Iterator[str]:
+    """
+    Text of a PDF page by page. Raises PdfTooLarge as soon as the document is known to exceed
+    max_pages or the text so far exceeds max_chars, so oversized uploads stop early. The first
+    pages are checked before anything is yielded; if backend (default PDF_EXTRACTOR) fails or they
+    look empty/garbled, extraction restarts with pdfminer.
+    """
+    backend = (backend or DEFAULT_EXTRACTOR).lower()
+    start = source.tell() if hasattr(source, "seek") else None
+    total = 0
+
+    def budget(text: str) -> str:
+        nonlocal total
+        total += len(text)
+        if max_chars is not None and total > max_chars:
+            raise PdfTooLarge(f"Resume text exceeds {max_chars:,} characters.")
+        return text
+
+    pages = _open_pages(backend, source, max_pages)
+    head = []
+    try:
+        for page in pages:
+            head.append(budget(page))
+            if sum(map(len, head)) >= _GARBLE_SAMPLE_CHARS:
+                break
+    except PdfTooLarge:
+        pages.close()
+        raise
+    except Exception as e:
+        pages.close()
+        if backend == FALLBACK_EXTRACTOR:
+            raise
+        print(f"PDF extractor {backend} failed ({e}); falling back to {FALLBACK_EXTRACTOR}", flush=True)
+        head = None
+
+    if backend != FALLBACK_EXTRACTOR and (head is None or looks_garbled("".join(head))):
+        pages.close()
+        if start is not None:
+            source.seek(start)
+        total = 0
+        fallback = _open_pages(FALLBACK_EXTRACTOR, source, max_pages)
+        with closing(fallback):
+            for page in fallback:
+                yield budget(page)
+        return
+
+    with closing(pages):
+        yield from head
+        for page in pages:
+            yield budget(page)
+
+
+def extract_with(backend: str, source, max_pages: Optional[int] = None) -> str:
+    """Whole text from one named backend (timed), without fallback or character budget."""
+    return "\n".join(_open_pages(backend, source, max_pages))
+
+
+def extract_pdf_text(source, backend: str = None, **limits) -> str:
+    """Whole text of a PDF; see iter_pdf_pages for the backend fallback and the max_pages/max_chars limits."""
+    return "\n".join(iter_pdf_pages(source, backend, **limits))
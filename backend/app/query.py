@@ -1,63 +1,145 @@
+import threading
+from contextlib import contextmanager
+from itertools import count
+
 import psycopg2
+import psycopg2.pool
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
+# One pool per process, shared by all threads: a query borrows a connection instead of opening one
+# (TCP + auth + backend startup) per call. QUERY_POOL_MAX_CONN bounds the connections this module holds;
+# callers beyond that wait for a free one (psycopg2's pool raises PoolError instead).
+QUERY_POOL_MIN_CONN = int(os.getenv("QUERY_POOL_MIN_CONN", "1"))
+QUERY_POOL_MAX_CONN = int(os.getenv("QUERY_POOL_MAX_CONN", "5"))
 
-def _get_conn():
-    return psycopg2.connect(
-        dbname=os.getenv("DB_NAME"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        host=os.getenv("DB_HOST"),
-        port=os.getenv("DB_PORT")
-    )
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(QUERY_POOL_MAX_CONN)
+_cursor_ids = count()
 
 
-def query_resume(name):
-    """Return one resume row (tuple) for the given name. Raises IndexError if not found."""
-    conn = _get_conn()
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = psycopg2.pool.ThreadedConnectionPool(
+                    QUERY_POOL_MIN_CONN,
+                    QUERY_POOL_MAX_CONN,
+                    dbname=os.getenv("DB_NAME"),
+                    user=os.getenv("DB_USER"),
+                    password=os.getenv("DB_PASSWORD"),
+                    host=os.getenv("DB_HOST"),
+                    port=os.getenv("DB_PORT")
+                )
+    return _pool
+
+
+@contextmanager
+def _connection():
+    """
+    Borrow a pooled connection, waiting while all QUERY_POOL_MAX_CONN are in use; its read transaction
+    is ended before it goes back to the pool.
+    """
+    _slots.acquire()
     try:
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM resume_info WHERE name = %s;", (name,))
-        rows = cur.fetchall()
-        if not rows:
-            raise IndexError("No resume found for name: {}".format(name))
-        return max(rows, key=lambda r: r[0])
+        pool = _get_pool()
+        conn = pool.getconn()
+        try:
+            yield conn
+        finally:
+            broken = bool(conn.closed)
+            if not broken:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            # A connection the server dropped is discarded rather than handed to the next caller
+            pool.putconn(conn, close=broken)
     finally:
-        conn.close()
+        _slots.release()
+
+
+def close_pool():
+    """
+    Close every pooled connection (e.g. at the end of an offline job). The next query opens a new pool.
+    Call it once no query is running: a connection still borrowed is closed under its caller.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+def _fetch_one(sql, params):
+    with _connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            return cur.fetchone()
+
+
+def query_resume(name):
+    """Return one resume row (tuple) for the given name (most recent by id). Raises IndexError if not found."""
+    row = _fetch_one("SELECT * FROM resume_info WHERE name = %s ORDER BY id DESC LIMIT 1;", (name,))
+    if row is None:
+        raise IndexError("No resume found for name: {}".format(name))
+    return row
 
 
 def query_job_description(name):
     """
     Return one job row (tuple) for the given name (most recent by id).
-    Schema: (id, resume_id, name, job_description, score). Raises IndexError if not found.
+    Schema: (id, resume_id, name, job_description, score, ...). Raises IndexError if not found.
     """
-    conn = _get_conn()
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT * FROM job_info WHERE name = %s;", (name,))
-        rows = cur.fetchall()
-        if not rows:
-            raise IndexError("No job description found for name: {}".format(name))
-        return max(rows, key=lambda r: r[0])
-    finally:
-        conn.close()
+    row = _fetch_one("SELECT * FROM job_info WHERE name = %s ORDER BY id DESC LIMIT 1;", (name,))
+    if row is None:
+        raise IndexError("No job description found for name: {}".format(name))
+    return row
 
 
 def query_jobs_by_resume_id(resume_id: int):
-    """Return list of job rows (tuples) for this resume, ordered by id. Schema: (id, resume_id, name, job_description, score)."""
-    conn = _get_conn()
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT * FROM job_info WHERE resume_id = %s ORDER BY id;",
-            (resume_id,),
-        )
-        return cur.fetchall()
-    finally:
-        conn.close()
+    """Return list of job rows (tuples) for this resume, ordered by id. Schema: (id, resume_id, name, job_description, score, ...)."""
+    with _connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT * FROM job_info WHERE resume_id = %s ORDER BY id;",
+                (resume_id,),
+            )
+            return cur.fetchall()
+
+
+def _stream_rows(table, batch_size, where="", params=None):
+    """
+    Yield the rows of table in lists of up to batch_size, ordered by id.
+    Uses a named (server-side) cursor: PostgreSQL keeps the result set and sends batch_size rows per
+    round trip, so a full-table pass holds one batch in memory instead of the whole table.
+    The pooled connection stays checked out until the generator is exhausted or closed.
+    """
+    sql = "SELECT * FROM {} {} ORDER BY id;".format(table, where)
+    with _connection() as conn:
+        with conn.cursor(name="stream_{}_{}".format(table, next(_cursor_ids))) as cur:
+            cur.execute(sql, params)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+
+
+def stream_resumes(batch_size=500):
+    """Yield all resume rows in batches (lists of tuples), ordered by id. See _stream_rows."""
+    return _stream_rows("resume_info", batch_size)
+
+
+def stream_jobs(batch_size=500, resume_id=None):
+    """Yield job rows in batches (lists of tuples), ordered by id; only this resume's jobs if resume_id is set."""
+    if resume_id is None:
+        return _stream_rows("job_info", batch_size)
+    return _stream_rows("job_info", batch_size, "WHERE resume_id = %s", (resume_id,))
 
 
 def resume_row_to_text(row):
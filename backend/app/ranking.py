@@ -0,0 +1,541 @@
+"""
+One-to-many matching: rank every stored resume against a job description, and every stored
+(deduplicated) job description against a resume.
+
+A ResumePool keeps, per resume, its profile vector (see scoring_logic.resume_profile_vector) in a
+vector index, a row of a keyword presence matrix and its structure score. Ranking embeds the JD
+once, retrieves candidates from the index by semantic score (all resumes for the exact flat index,
+the best RERANK_CANDIDATES for IVF) and scores them with a column sum over the keyword matrix,
+using the same W_* weights as score_resume.
+
+A JobPool does the reverse: one row per distinct JD content hash with its embedding and keyword
+row, so ranking all JDs for a resume is one matrix-vector product plus a keyword column sum.
+"""
+import os
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from .database import SessionLocal
+from .keyword_list import tech_keywords
+from .models import Resume, Job
+from .vector_index import load_index
+from .keyword_idf import get_idf_table
+from .scoring_logic import (
+    W_KEYWORD,
+    W_SEMANTIC,
+    W_STRUCTURE,
+    _encode_texts,
+    _extract_keyword_counts,
+    _extract_keywords,
+    _section_similarities,
+    _structure_score,
+    content_hash,
+    keyword_counts,
+    keyword_set,
+    keyword_weights,
+    term_weight,
+    resume_profile_vector,
+    resume_section_embeddings,
+    resume_to_string,
+    stored_job_embedding,
+)
+
+# Rebuild the pools from the DB in the background after this many seconds (picks up other workers' writes)
+POOL_TTL_SECONDS = float(os.getenv("RANK_POOL_TTL_SECONDS", "300"))
+LOAD_BATCH_SIZE = 500
+# Approximate backends: semantic candidates re-ranked with the full formula (at least top_k * factor)
+RERANK_CANDIDATES = int(os.getenv("RANK_RERANK_CANDIDATES", "500"))
+RERANK_FACTOR = 10
+VECTOR_INDEX_PATH = os.getenv("VECTOR_INDEX_PATH") or None
+JD_PREVIEW_CHARS = 300
+
+_KEYWORD_VOCAB = sorted({k.lower() for k in tech_keywords})
+_KEYWORD_INDEX = {k: i for i, k in enumerate(_KEYWORD_VOCAB)}
+
+
+def _keyword_row(text: str) -> np.ndarray:
+    row = np.zeros(len(_KEYWORD_VOCAB), dtype=np.uint8)
+    for kw in _extract_keywords(text):
+        idx = _KEYWORD_INDEX.get(kw)
+        if idx is not None:
+            row[idx] = 1
+    return row
+
+
+def _keyword_tf_row(text: str) -> np.ndarray:
+    """term_weight of each keyword's frequency in text (0 where absent)."""
+    row = np.zeros(len(_KEYWORD_VOCAB), dtype=np.float32)
+    for kw, n in _extract_keyword_counts(text).items():
+        idx = _KEYWORD_INDEX.get(kw)
+        if idx is not None:
+            row[idx] = term_weight(n)
+    return row
+
+
+_idf_vector_table = None
+_idf_vector_version = None
+_idf_vector = None
+
+
+def _idf_vector_for(table) -> np.ndarray:
+    """IDF of every vocabulary keyword, recomputed only when the IDF table changes."""
+    global _idf_vector_table, _idf_vector_version, _idf_vector
+    # Hold the table itself, not id(table): a reloaded table can reuse a freed one's address and version
+    if table is not _idf_vector_table or table.version != _idf_vector_version:
+        _idf_vector = np.array([table.idf(kw) for kw in _KEYWORD_VOCAB], dtype=np.float32)
+        _idf_vector_table, _idf_vector_version = table, table.version
+    return _idf_vector
+
+
+class ResumePool:
+    """Vector index of resume profiles plus dense keyword/structure arrays indexed by row."""
+
+    def __init__(self, index=None):
+        self.index = index if index is not None else load_index(VECTOR_INDEX_PATH)
+        self.ids: List[int] = []
+        self.names: List[Optional[str]] = []
+        self._row_of = {}
+        self._size = 0
+        self.keywords = np.zeros((0, len(_KEYWORD_VOCAB)), dtype=np.uint8)
+        self.structure = np.zeros(0, dtype=np.float32)
+        self.loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def _ensure_capacity(self) -> None:
+        """Grow the backing arrays geometrically so incremental inserts stay amortized O(1)."""
+        cap = self.structure.shape[0]
+        if self._size < cap:
+            return
+        new_cap = max(64, cap * 2)
+        keywords = np.zeros((new_cap, len(_KEYWORD_VOCAB)), dtype=np.uint8)
+        keywords[:cap] = self.keywords
+        structure = np.zeros(new_cap, dtype=np.float32)
+        structure[:cap] = self.structure
+        self.keywords, self.structure = keywords, structure
+
+    def _set_row(self, resume, kw_row: np.ndarray, structure: float) -> None:
+        with self._lock:
+            row = self._row_of.get(resume.id)
+            if row is None:
+                self._ensure_capacity()
+                row = self._size
+                self._size += 1
+                self._row_of[resume.id] = row
+                self.ids.append(resume.id)
+                self.names.append(resume.name)
+            else:
+                self.names[row] = resume.name
+            self.keywords[row] = kw_row
+            self.structure[row] = structure
+
+    def _features(self, resume, section_embs: Optional[dict]):
+        if section_embs is None:
+            section_embs = resume_section_embeddings(resume)
+        profile = resume_profile_vector(section_embs)
+        return profile, _keyword_row(resume_to_string(resume)), _structure_score(resume)
+
+    def _profile_or_zero(self, profile: Optional[np.ndarray]) -> Optional[np.ndarray]:
+        # Resumes without embedded sections keep a zero vector (semantic 0, as in score_resume)
+        if profile is not None:
+            return profile
+        return np.zeros(self.index.dim, dtype=np.float32) if self.index.dim else None
+
+    def upsert(self, resume, section_embs: Optional[dict] = None) -> None:
+        """Add or replace one resume (ORM row or equivalent object with .id)."""
+        profile, kw_row, structure = self._features(resume, section_embs)
+        profile = self._profile_or_zero(profile)
+        # Row first: every id the index can return must already have keyword/structure data
+        self._set_row(resume, kw_row, structure)
+        if profile is not None:
+            self.index.add(resume.id, profile)
+
+    def load_all(self) -> None:
+        """Fill the pool from resume_info in id order; index updates are applied per chunk."""
+        seen = set()
+        db = SessionLocal()
+        try:
+            last_id = 0
+            while True:
+                rows = (
+                    db.query(Resume)
+                    .filter(Resume.id > last_id)
+                    .order_by(Resume.id)
+                    .limit(LOAD_BATCH_SIZE)
+                    .all()
+                )
+                if not rows:
+                    break
+                ids, vectors = [], []
+                for r in rows:
+                    profile, kw_row, structure = self._features(r, None)
+                    profile = self._profile_or_zero(profile)
+                    if profile is not None:
+                        ids.append(r.id)
+                        vectors.append(profile)
+                    self._set_row(r, kw_row, structure)
+                    seen.add(r.id)
+                self.index.add_many(ids, vectors)
+                last_id = rows[-1].id
+        finally:
+            db.close()
+        # Drop vectors for resumes deleted since the index was saved
+        for stale in set(self.index.ids().tolist()) - seen:
+            self.index.remove(stale)
+        self.loaded_at = time.time()
+        self.save()
+
+    def save(self) -> None:
+        if VECTOR_INDEX_PATH:
+            self.index.save(VECTOR_INDEX_PATH)
+
+
+class _PoolHolder:
+    """
+    A process-wide pool: built in the caller on first use. Once it is older than POOL_TTL_SECONDS a
+    fresh one is built from the DB in a background thread while the current one keeps serving, then
+    swapped in. Saves made while a pool is being built are queued and replayed onto it before it is
+    used, so rankers never wait on a reload and no save is lost to one.
+    """
+
+    def __init__(self, build, label: str):
+        self._build = build
+        self._label = label
+        self.pool = None
+        self._lock = threading.Lock()
+        self._first_load_lock = threading.Lock()
+        self._building = False
+        self._pending = []
+
+    def _timed_build(self):
+        t0 = time.perf_counter()
+        pool = self._build()
+        print(f"{self._label} loaded: {len(pool)} in {time.perf_counter() - t0:.2f}s", flush=True)
+        return pool
+
+    def _start_build(self) -> None:
+        """Call with self._lock held."""
+        self._building = True
+        self._pending = []
+
+    def _finish_build(self, pool) -> None:
+        with self._lock:
+            if pool is not None:
+                # Saves committed while the build read the DB may be missing from it
+                for update in self._pending:
+                    update(pool)
+                self.pool = pool
+            self._pending = []
+            self._building = False
+
+    def get(self):
+        pool = self.pool
+        if pool is None:
+            with self._first_load_lock:
+                if self.pool is None:
+                    with self._lock:
+                        self._start_build()
+                    try:
+                        self._finish_build(self._timed_build())
+                    except Exception:
+                        self._finish_build(None)
+                        raise
+                return self.pool
+        with self._lock:
+            if not self._building and time.time() - pool.loaded_at > POOL_TTL_SECONDS:
+                self._start_build()
+                threading.Thread(target=self._rebuild, name=f"{self._label} reload", daemon=True).start()
+        return pool
+
+    def _rebuild(self) -> None:
+        try:
+            pool = self._timed_build()
+        except Exception as e:
+            print(f"Warning: {self._label} reload failed, keeping the current one: {e}", flush=True)
+            self.pool.loaded_at = time.time()  # retry after another TTL
+            pool = None
+        self._finish_build(pool)
+
+    def apply(self, update) -> None:
+        """Run update(pool) on the loaded pool (if any), and queue it for a pool being built."""
+        with self._lock:
+            pool = self.pool
+            if self._building:
+                self._pending.append(update)
+        if pool is not None:
+            update(pool)
+
+
+def _load_resume_pool() -> ResumePool:
+    pool = ResumePool()
+    pool.load_all()
+    return pool
+
+
+_resume_pools = _PoolHolder(_load_resume_pool, "Resume pool")
+
+
+def get_resume_pool() -> ResumePool:
+    """Process-wide pool, loaded from the DB on first use and reloaded in the background after POOL_TTL_SECONDS."""
+    return _resume_pools.get()
+
+
+def on_resume_saved(resume, section_embs: Optional[dict] = None) -> None:
+    """Keep an already-loaded pool in sync after a resume is inserted or updated."""
+    _resume_pools.apply(lambda pool: pool.upsert(resume, section_embs))
+
+
+def save_resume_index() -> None:
+    """Persist the loaded pool's vector index to VECTOR_INDEX_PATH (no-op if unset or not loaded)."""
+    if _resume_pools.pool is not None:
+        _resume_pools.pool.save()
+
+
+class JobPool:
+    """One row per distinct job description (by content hash): embedding, keyword TF row, latest job id."""
+
+    def __init__(self):
+        self.hashes: List[str] = []
+        self.job_ids: List[int] = []
+        self.duplicates: List[int] = []
+        self.previews: List[str] = []
+        self._row_of = {}
+        self._size = 0
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+        self.keyword_tf = np.zeros((0, len(_KEYWORD_VOCAB)), dtype=np.float32)
+        self.loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def _ensure_capacity(self, dim: int) -> None:
+        if self.embeddings.shape[1] == 0 and dim:
+            self.embeddings = np.zeros((self.embeddings.shape[0], dim), dtype=np.float32)
+        cap = self.embeddings.shape[0]
+        if self._size < cap:
+            return
+        new_cap = max(64, cap * 2)
+        embeddings = np.zeros((new_cap, self.embeddings.shape[1]), dtype=np.float32)
+        embeddings[:cap] = self.embeddings
+        keyword_tf = np.zeros((new_cap, len(_KEYWORD_VOCAB)), dtype=np.float32)
+        keyword_tf[:cap] = self.keyword_tf
+        self.embeddings, self.keyword_tf = embeddings, keyword_tf
+
+    def add(self, job, jd_emb: Optional[np.ndarray] = None) -> None:
+        """Add a job; a JD already in the pool only bumps its duplicate count and latest job id."""
+        text = job.job_description or ""
+        if not text.strip():
+            return
+        h = getattr(job, "jd_hash", None) or content_hash(text)
+        with self._lock:
+            row = self._row_of.get(h)
+            if row is not None:
+                self.duplicates[row] += 1
+                self.job_ids[row] = max(self.job_ids[row], job.id)
+                return
+        if jd_emb is None:
+            jd_emb = stored_job_embedding(job)
+        if jd_emb is None:
+            jd_emb = _encode_texts([text])[0]
+        tf_row = _keyword_tf_row(text)
+        with self._lock:
+            if h in self._row_of:
+                return
+            self._ensure_capacity(jd_emb.shape[0])
+            row = self._size
+            self._size += 1
+            self._row_of[h] = row
+            self.hashes.append(h)
+            self.job_ids.append(job.id)
+            self.duplicates.append(1)
+            self.previews.append(text[:JD_PREVIEW_CHARS])
+            self.embeddings[row] = jd_emb
+            self.keyword_tf[row] = tf_row
+
+    def load_all(self) -> None:
+        """Fill the pool from job_info in id order (JDs missing stored embeddings are batch-encoded)."""
+        db = SessionLocal()
+        try:
+            last_id = 0
+            while True:
+                rows = (
+                    db.query(Job)
+                    .filter(Job.id > last_id)
+                    .order_by(Job.id)
+                    .limit(LOAD_BATCH_SIZE)
+                    .all()
+                )
+                if not rows:
+                    break
+                unembedded = [
+                    j.job_description for j in rows
+                    if j.job_description and j.job_description.strip() and stored_job_embedding(j) is None
+                ]
+                if unembedded:
+                    _encode_texts(unembedded)
+                for j in rows:
+                    self.add(j)
+                last_id = rows[-1].id
+        finally:
+            db.close()
+        self.loaded_at = time.time()
+
+
+def _load_job_pool() -> JobPool:
+    pool = JobPool()
+    pool.load_all()
+    return pool
+
+
+_job_pools = _PoolHolder(_load_job_pool, "Job pool")
+
+
+def get_job_pool() -> JobPool:
+    """Process-wide JD pool, loaded from the DB on first use and reloaded in the background after POOL_TTL_SECONDS."""
+    return _job_pools.get()
+
+
+def on_job_saved(job) -> None:
+    """Keep an already-loaded JD pool in sync after a job is inserted."""
+    _job_pools.apply(lambda pool: pool.add(job))
+
+
+def rank_jobs_for_resume(resume, top_k: int = 10) -> dict:
+    """
+    Score every distinct stored job description against resume with the score_resume formula and
+    return the top_k (best first) with breakdown and missing keywords.
+    """
+    t0 = time.perf_counter()
+    pool = get_job_pool()
+    m = len(pool)
+    if m == 0 or top_k <= 0:
+        return {"total": m, "results": []}
+
+    profile = resume_profile_vector(resume_section_embeddings(resume))
+    resume_kw = keyword_set(resume_to_string(resume))
+    resume_cols = np.array(sorted(_KEYWORD_INDEX[k] for k in resume_kw if k in _KEYWORD_INDEX), dtype=np.intp)
+    structure = _structure_score(resume)
+    idf = _idf_vector_for(get_idf_table())
+
+    with pool._lock:
+        m = len(pool)
+        if profile is not None and pool.embeddings.shape[1]:
+            semantic = pool.embeddings[:m] @ profile
+        else:
+            semantic = np.zeros(m, dtype=np.float32)
+        # Weighted coverage as in KeywordAnalysis: sum(tf * idf) over matched / over all JD keywords
+        hits = pool.keyword_tf[:m, resume_cols] @ idf[resume_cols]
+        totals = pool.keyword_tf[:m] @ idf
+        keyword = np.divide(hits, totals, out=np.zeros(m, dtype=np.float32), where=totals > 0)
+        final = W_SEMANTIC * semantic + W_KEYWORD * keyword + W_STRUCTURE * structure
+        k = min(top_k, m)
+        top = np.argpartition(-final, k - 1)[:k]
+        top = top[np.argsort(-final[top], kind="stable")]
+        results = []
+        for i in top:
+            jd_kw = {_KEYWORD_VOCAB[c] for c in np.flatnonzero(pool.keyword_tf[i])}
+            results.append(
+                {
+                    "job_id": pool.job_ids[i],
+                    "duplicates": pool.duplicates[i],
+                    "job_description": pool.previews[i],
+                    "score": round(float(final[i]), 4),
+                    "breakdown": {
+                        "semantic": round(float(semantic[i]), 4),
+                        "keyword": round(float(keyword[i]), 4),
+                        "structure": round(structure, 4),
+                    },
+                    "missing_keywords": sorted(jd_kw - resume_kw),
+                }
+            )
+    print(f"Ranked {m} job descriptions in {(time.perf_counter() - t0) * 1000:.1f}ms", flush=True)
+    return {"total": m, "results": results}
+
+
+def rank_resumes(job_description: str, top_k: int = 10) -> dict:
+    """
+    Score every stored resume against job_description with the score_resume formula and return the
+    top_k, each with the same breakdown/section_scores/missing_keywords fields as score_resume.
+    """
+    t0 = time.perf_counter()
+    pool = get_resume_pool()
+    n = len(pool)
+    if n == 0 or top_k <= 0:
+        return {"total": n, "results": []}
+
+    jd_emb = _encode_texts([job_description])[0]
+    weights = keyword_weights(keyword_counts(job_description))
+    jd_kw = set(weights)
+    jd_terms = sorted(k for k in jd_kw if k in _KEYWORD_INDEX)
+    jd_cols = np.array([_KEYWORD_INDEX[k] for k in jd_terms], dtype=np.intp)
+    jd_weights = np.array([weights[k] for k in jd_terms], dtype=np.float32)
+    total_weight = float(sum(weights.values()))
+
+    if pool.index.kind == "flat":
+        n_candidates = n
+    else:
+        n_candidates = min(n, max(RERANK_CANDIDATES, top_k * RERANK_FACTOR))
+    cand_ids, semantic = pool.index.search(jd_emb, n_candidates)
+    with pool._lock:
+        row_of = pool._row_of
+        rows = np.fromiter((row_of[i] for i in cand_ids.tolist()), dtype=np.intp, count=len(cand_ids))
+        if total_weight > 0:
+            keyword = (pool.keywords[rows[:, None], jd_cols] @ jd_weights) / total_weight
+        else:
+            keyword = np.zeros(len(rows), dtype=np.float32)
+        structure = pool.structure[rows]
+
+    final = W_SEMANTIC * semantic + W_KEYWORD * keyword + W_STRUCTURE * structure
+    k = min(top_k, len(rows))
+    if k == 0:
+        return {"total": n, "results": []}
+    top = np.argpartition(-final, k - 1)[:k]
+    top = top[np.argsort(-final[top], kind="stable")]
+    ids = cand_ids.tolist()
+
+    results = _describe(
+        jd_emb,
+        jd_kw,
+        [(ids[i], float(final[i]), float(semantic[i]), float(keyword[i]), float(structure[i])) for i in top],
+    )
+    print(f"Ranked {n} resumes in {(time.perf_counter() - t0) * 1000:.1f}ms", flush=True)
+    return {"total": n, "results": results}
+
+
+def _describe(jd_emb: np.ndarray, jd_kw: set, scored: list) -> list:
+    """Attach per-section scores and missing keywords for the top-k rows (one DB query)."""
+    if not scored:
+        return []
+    db = SessionLocal()
+    try:
+        rows = db.query(Resume).filter(Resume.id.in_([s[0] for s in scored])).all()
+    finally:
+        db.close()
+    by_id = {r.id: r for r in rows}
+    results = []
+    for resume_id, final, semantic, keyword, structure in scored:
+        resume = by_id.get(resume_id)
+        if resume is None:
+            continue
+        missing = sorted(jd_kw - keyword_set(resume_to_string(resume)))
+        results.append(
+            {
+                "resume_id": resume_id,
+                "name": resume.name,
+                "score": round(final, 4),
+                "breakdown": {
+                    "semantic": round(semantic, 4),
+                    "keyword": round(keyword, 4),
+                    "structure": round(structure, 4),
+                },
+                "section_scores": _section_similarities(jd_emb, resume_section_embeddings(resume)),
+                "missing_keywords": missing,
+            }
+        )
+    return results
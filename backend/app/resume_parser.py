@@ -1,37 +1,160 @@
-from pdfminer.high_level import extract_text
 import re
+from typing import Dict, List, Optional, Tuple
 
+from .pdf_extractors import iter_pdf_pages
 
-def parse_resume_pdf(file_path: str) -> dict:
-    raw = extract_text(file_path)
-    if not raw or not str(raw).strip():
-        return None
-    reader = str(raw).lower()
-
-    deliminators = ["education", "experience", "projects", "skills", "objective", "certifications"]
-    re_pattern = re.compile(r"(" + "|".join(re.escape(d) for d in deliminators) + r")", re.IGNORECASE)
-    result = re_pattern.split(reader)
-    sections = {}
-    key = None
-    for part in result:
-        if not part.strip():
-            continue
-        if part.lower() in deliminators:
-            key = part.lower()
-            sections[key] = ""
-        elif key:
-            sections[key] = part.strip()
-
-    lines = reader.splitlines()
-    name = (lines[0].strip() if lines else "Unknown") or "Unknown"
-
-    resume_dict = {
-        "name": name,
-        "education": sections.get("education") or None,
-        "experience": sections.get("experience") or None,
-        "projects": sections.get("projects") or None,
-        "skills": sections.get("skills") or None,
-        "objective": sections.get("objective") or None,
-        "certifications": sections.get("certifications") or None,
-    }
-    return resume_dict
+SECTIONS = ["education", "experience", "projects", "skills", "objective", "certifications"]
+
+# Heading phrases per section (matched case-insensitively, whitespace-insensitively)
+HEADING_SYNONYMS = {
+    "education": [
+        "education", "education and training", "education & training", "educational background",
+        "academic background", "academics", "academic history",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience",
+        "work history", "employment history", "employment", "career history", "professional background",
+    ],
+    "projects": [
+        "projects", "personal projects", "academic projects", "selected projects", "key projects",
+        "technical projects", "project experience", "side projects",
+    ],
+    "skills": [
+        "skills", "technical skills", "key skills", "core skills", "skill set", "skillset",
+        "skills and abilities", "skills & abilities", "core competencies", "competencies",
+        "technologies", "tools and technologies", "tools & technologies", "technical proficiencies",
+    ],
+    "objective": [
+        "objective", "career objective", "professional objective", "summary", "professional summary",
+        "career summary", "summary of qualifications", "profile", "professional profile", "about me",
+    ],
+    "certifications": [
+        "certifications", "certification", "certificates", "licenses and certifications",
+        "licenses & certifications", "certifications and licenses", "courses and certifications",
+    ],
+}
+
+
+def _phrase_pattern(phrase: str) -> str:
+    return r"\s+".join(re.escape(word) for word in phrase.split())
+
+
+# A heading is a line that starts (after an optional bullet or #) with a heading phrase followed by
+# a colon or the end of the line. One named group per section, so m.lastgroup is the section.
+_HEADING_LINE_RE = re.compile(
+    r"^[ \t]*(?:[#*•\-–][ \t]*)?(?:"
+    + "|".join(
+        f"(?P<{section}>" + "|".join(_phrase_pattern(p) for p in sorted(phrases, key=len, reverse=True)) + ")"
+        for section, phrases in HEADING_SYNONYMS.items()
+    )
+    + r")[ \t]*(?::|$)",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Used only when no heading sits on its own line (text extracted without line breaks)
+_HEADING_INLINE_RE = re.compile("|".join(f"(?P<{s}>{re.escape(s)})" for s in SECTIONS), re.IGNORECASE)
+
+Span = Tuple[int, int]
+
+
+class Segmentation:
+    """Result of segmenting a resume: the text plus character offsets of the name line and each section."""
+
+    def __init__(self, text: str, name: Optional[Span], sections: Dict[str, List[Span]]):
+        self.text = text
+        self.name = name
+        self.sections = sections
+
+    def section_text(self, section: str) -> Optional[str]:
+        """Every occurrence of the section, in document order, joined by newlines (None if absent/empty)."""
+        parts = [self.text[start:end].strip() for start, end in self.sections.get(section, ())]
+        return "\n".join(p for p in parts if p) or None
+
+    def to_resume_dict(self) -> dict:
+        """The parsed resume dict (name + sections), lowercased as stored in resume_info."""
+        name = self.text[self.name[0]:self.name[1]].strip().lower() if self.name else ""
+        resume_dict = {"name": name or "Unknown"}
+        for section in SECTIONS:
+            text = self.section_text(section)
+            resume_dict[section] = text.lower() if text else None
+        return resume_dict
+
+
+class SectionSegmenter:
+    """
+    Single-pass section segmentation: feed() extracted text (e.g. a page at a time), then finish().
+    Each complete line is scanned once with the compiled heading pattern; sections are recorded as
+    character offsets and repeated headings (e.g. two Experience blocks) are all kept, in order.
+    """
+
+    def __init__(self):
+        self._chunks: List[str] = []
+        self._pending = ""
+        self._offset = 0
+        self._headings: List[Tuple[str, int, int]] = []
+        self._name: Optional[Span] = None
+
+    def feed(self, text: str) -> None:
+        if not text:
+            return
+        chunk = self._pending + text if self._pending else text
+        # Only scan up to the last newline; a partial line waits for the next chunk
+        cut = chunk.rfind("\n") + 1
+        if cut:
+            self._scan(chunk, cut)
+            self._chunks.append(chunk[:cut])
+            self._offset += cut
+        self._pending = chunk[cut:]
+
+    def _scan(self, chunk: str, end: int) -> None:
+        if self._name is None and self._offset == 0:
+            newline = chunk.find("\n", 0, end)
+            self._name = (0, newline if newline >= 0 else end)
+        base = self._offset
+        for m in _HEADING_LINE_RE.finditer(chunk, 0, end):
+            self._headings.append((m.lastgroup, base + m.start(), base + m.end()))
+
+    def finish(self) -> Optional[Segmentation]:
+        """Segment everything fed so far; None if there is no text."""
+        if self._pending:
+            self._scan(self._pending, len(self._pending))
+            self._chunks.append(self._pending)
+            self._offset += len(self._pending)
+            self._pending = ""
+        text = "".join(self._chunks)
+        if not text.strip():
+            return None
+        headings = self._headings or [
+            (m.lastgroup, m.start(), m.end()) for m in _HEADING_INLINE_RE.finditer(text)
+        ]
+        sections: Dict[str, List[Span]] = {}
+        for i, (section, _, content_start) in enumerate(headings):
+            end = headings[i + 1][1] if i + 1 < len(headings) else len(text)
+            sections.setdefault(section, []).append((content_start, end))
+        return Segmentation(text, self._name, sections)
+
+
+def segment_resume_text(text: str) -> Optional[Segmentation]:
+    segmenter = SectionSegmenter()
+    segmenter.feed(text)
+    return segmenter.finish()
+
+
+def parse_resume_pdf(source, extractor: str = None) -> dict:
+    """
+    Parse a resume PDF into its sections. source: a file path, the raw PDF bytes (bytes, bytearray,
+    memoryview) or a binary file-like object such as BytesIO. extractor overrides PDF_EXTRACTOR.
+    Pages are segmented as they are extracted; raises PdfTooLarge (a ValueError) past the page or
+    character limits without extracting the rest.
+    """
+    segmenter = SectionSegmenter()
+    for page in iter_pdf_pages(source, extractor):
+        segmenter.feed(page)
+        segmenter.feed("\n")
+    segmentation = segmenter.finish()
+    return segmentation.to_resume_dict() if segmentation else None
+
+
+def parse_resume_text(raw: str) -> dict:
+    """Split extracted resume text into the name and section dict (None if there is no text)."""
+    segmentation = segment_resume_text(raw or "")
+    return segmentation.to_resume_dict() if segmentation else None
@@ -0,0 +1,200 @@
+"""
+Cache of score_resume results for /score_resume.
+
+Viewing a score again should not re-run embeddings, keyword scans and recommendations when neither the
+resume nor the JD changed. Results are keyed by the resume's content hash, the JD's content hash, the
+embedding model id, a fingerprint of the scoring weights and the IDF of the JD's keywords (rounded to
+IDF_KEY_DECIMALS, so a new job nudging N does not drop every entry), and kept in a bounded in-memory
+LRU in front of the score_result_cache table (shared across workers and restarts; a miss in memory is
+one primary-key lookup). Changing a resume's text changes its key; the resume upserts in
+insert_resume_data / async_data also delete its stored results in the same transaction.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+SCORE_CACHE_MAX_ENTRIES = int(os.getenv("SCORE_CACHE_MAX_ENTRIES", "1024"))
+SCORE_CACHE_DB = os.getenv("SCORE_CACHE_DB", "1").lower() in ("1", "true", "yes")
+# Bump when score_resume's output changes for the same inputs (new fields, formula changes)
+SCORE_FORMAT_VERSION = 1
+# IDF precision in the key. A cached score is then within about 0.0005 of a fresh one; idf moves by
+# about 1 / N per new job description, so entries survive many new jobs once N is in the thousands.
+IDF_KEY_DECIMALS = 3
+
+_RESUME_FIELDS = ("education", "experience", "projects", "skills", "objective", "certifications")
+
+# key -> (resume_id, insights)
+_lru: "OrderedDict[str, tuple]" = OrderedDict()
+_lock = threading.Lock()
+_table_ready = False
+_counters = {"hits": 0, "db_hits": 0, "misses": 0, "invalidations": 0}
+
+
+def weights_fingerprint() -> str:
+    """Short hash of W_SEMANTIC / W_KEYWORD / W_STRUCTURE / SECTION_WEIGHTS and SCORE_FORMAT_VERSION."""
+    from . import scoring_logic
+
+    weights = {
+        "version": SCORE_FORMAT_VERSION,
+        "semantic": scoring_logic.W_SEMANTIC,
+        "keyword": scoring_logic.W_KEYWORD,
+        "structure": scoring_logic.W_STRUCTURE,
+        "sections": scoring_logic.SECTION_WEIGHTS,
+    }
+    return hashlib.sha256(json.dumps(weights, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def resume_hash(resume) -> str:
+    """Content hash of the resume's text sections (the only resume input score_resume reads)."""
+    from .scoring_logic import content_hash
+
+    return content_hash("\0".join(str(getattr(resume, f, None) or "").strip() for f in _RESUME_FIELDS))
+
+
+def idf_fingerprint(job_description: str) -> str:
+    """The current IDF of each keyword in the JD (the only IDF values score_resume reads), rounded."""
+    from .keyword_idf import get_idf_table
+    from .scoring_logic import keyword_counts
+
+    table = get_idf_table()
+    return ",".join(f"{kw}:{table.idf(kw):.{IDF_KEY_DECIMALS}f}" for kw in sorted(keyword_counts(job_description)))
+
+
+def cache_key(resume, job_description: str, job=None) -> str:
+    """Key for score_resume(job_description, resume): resume, JD, model id, weights and JD keyword IDF."""
+    from .scoring_logic import content_hash, embedding_model_id
+
+    jd_hash = getattr(job, "jd_hash", None) or content_hash(job_description)
+    parts = (
+        resume_hash(resume), jd_hash, embedding_model_id(), weights_fingerprint(), idf_fingerprint(job_description),
+    )
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+def _remember(key: str, resume_id: Optional[int], insights: dict) -> None:
+    with _lock:
+        _lru[key] = (resume_id, insights)
+        _lru.move_to_end(key)
+        while len(_lru) > SCORE_CACHE_MAX_ENTRIES:
+            _lru.popitem(last=False)
+
+
+def ensure_table(bind=None) -> None:
+    """Create score_result_cache if missing (once per process), on bind (a connection) or the app engine."""
+    global _table_ready
+    if not _table_ready:
+        from .database import engine
+        from .models import ScoreResult
+
+        ScoreResult.__table__.create(bind=bind or engine, checkfirst=True)
+        _table_ready = True
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """Cached insights for this key, or None. The dict is shared: do not modify it."""
+    with _lock:
+        entry = _lru.get(key)
+        if entry is not None:
+            _lru.move_to_end(key)
+            _counters["hits"] += 1
+            return entry[1]
+    if SCORE_CACHE_DB:
+        from .database import SessionLocal
+        from .models import ScoreResult
+
+        row = None
+        try:
+            ensure_table()
+            db = SessionLocal()
+            try:
+                row = db.query(ScoreResult).filter(ScoreResult.cache_key == key).first()
+            finally:
+                db.close()
+        except Exception as e:
+            print(f"Warning: could not read score cache: {e}", flush=True)
+        if row is not None:
+            insights = json.loads(row.insights)
+            _remember(key, row.resume_id, insights)
+            with _lock:
+                _counters["db_hits"] += 1
+            return insights
+    with _lock:
+        _counters["misses"] += 1
+    return None
+
+
+def put(key: str, resume_id: Optional[int], insights: Dict[str, Any]) -> None:
+    """Cache a computed result (memory, and the DB table when enabled)."""
+    _remember(key, resume_id, insights)
+    if SCORE_CACHE_DB:
+        from .database import SessionLocal
+        from .models import ScoreResult
+
+        try:
+            ensure_table()
+            db = SessionLocal()
+            try:
+                db.merge(ScoreResult(
+                    cache_key=key, resume_id=resume_id, insights=json.dumps(insights), created_at=time.time(),
+                ))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        except Exception as e:
+            print(f"Warning: could not store score in cache: {e}", flush=True)
+
+
+def cached_score(job_description: str, resume, job=None) -> Dict[str, Any]:
+    """score_resume(job_description, resume, job), served from the cache when resume, JD, model, weights and IDF match."""
+    from .scoring_logic import score_resume
+
+    key = cache_key(resume, job_description, job)
+    insights = get(key)
+    if insights is None:
+        insights = score_resume(job_description, resume, job)
+        put(key, getattr(resume, "id", None), insights)
+    return insights
+
+
+def invalidate_statement(resume_id: int):
+    """DELETE of a resume's stored results, for callers running it on their own (e.g. async) session."""
+    from sqlalchemy import delete
+
+    from .models import ScoreResult
+
+    return delete(ScoreResult).where(ScoreResult.resume_id == resume_id)
+
+
+def forget_resume(resume_id: int) -> None:
+    """Drop a resume's results from this process' LRU."""
+    with _lock:
+        for key in [k for k, entry in _lru.items() if entry[0] == resume_id]:
+            del _lru[key]
+        _counters["invalidations"] += 1
+
+
+def invalidate_resume(db, resume_id: int) -> None:
+    """Delete a resume's cached results inside db's transaction (call when its text changes)."""
+    if SCORE_CACHE_DB:
+        ensure_table()
+        db.execute(invalidate_statement(resume_id))
+    forget_resume(resume_id)
+
+
+def stats() -> dict:
+    with _lock:
+        lookups = _counters["hits"] + _counters["db_hits"] + _counters["misses"]
+        return {
+            "entries": len(_lru),
+            "max_entries": SCORE_CACHE_MAX_ENTRIES,
+            **_counters,
+            "hit_rate": round((_counters["hits"] + _counters["db_hits"]) / lookups, 4) if lookups else 0.0,
+            "db_enabled": SCORE_CACHE_DB,
+        }
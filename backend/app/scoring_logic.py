@@ -1,20 +1,30 @@
-from sentence_transformers import SentenceTransformer, util
-from .keyword_list import tech_keywords, KEYWORD_CATEGORIES
-import ahocorasick
+from .keyword_list import tech_keywords
+from .keyword_automaton import count_keywords, find_keywords, load_keyword_automaton
+from .ml_model.chunking import ChunkedEncoder, chunk_config_id
+from .ml_model.embedding_cache import cached_encode, normalize_text
+from .ml_model.model import backend_tag, load_embedder, selected_backend
+import hashlib
+import math
+import numpy as np
+import os
+import threading
 import time
 import sys
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
 
 # Lazy-load model so backend starts fast; first score request will load it once.
+MODEL_NAME = "all-MiniLM-L6-v2"
 _model = None
 
 def _get_model():
     global _model
     if _model is None:
         t0 = time.perf_counter()
-        print("Loading ML model (first time may download ~90MB and take 1–5+ min)...", flush=True)
+        backend = selected_backend()
+        print(f"Loading ML model ({backend} backend; first time may download ~90MB and take 1–5+ min)...", flush=True)
         sys.stdout.flush()
-        _model = SentenceTransformer("all-MiniLM-L6-v2")
+        _model = load_embedder(MODEL_NAME, backend)
         elapsed = time.perf_counter() - t0
         print(f"Model loaded in {elapsed:.1f}s", flush=True)
     return _model
@@ -40,54 +50,135 @@ Extensive list of all tech keywords related to technical roles.
 TECH_KEYWORDS = tech_keywords
 
 """
-Build automaton for fast keyword search. Keywords are stored lowercase for case-insensitive matching.
+Automaton for fast keyword search (keywords lowercase for case-insensitive matching) and the
+keyword -> category map, loaded prebuilt from the keyword automaton cache on first use (or /warmup).
 """
-A = ahocorasick.Automaton()
-for idx, key in enumerate(tech_keywords):
-    A.add_word(key.lower(), (idx, key.lower()))
-A.make_automaton()
+_automaton = None
+_KEYWORD_CATEGORY_MAP = None
+_automaton_lock = threading.Lock()
+
+
+def _get_automaton():
+    global _automaton, _KEYWORD_CATEGORY_MAP
+    if _automaton is None:
+        with _automaton_lock:
+            if _automaton is None:
+                automaton, _KEYWORD_CATEGORY_MAP = load_keyword_automaton()
+                _automaton = automaton
+    return _automaton
 
 
 def _extract_keywords(text: str) -> set:
-    """Extract tech keywords found in text. Uses lowercase for case-insensitive match."""
+    """Extract tech keywords found in text as whole tokens. Uses lowercase for case-insensitive match."""
     if not (text and text.strip()):
         return set()
-    lower = text.lower()
-    return set(v for _, v in A.iter(lower))
-
-
-def _keyword_to_category() -> dict:
-    """Build mapping keyword (lowercase) -> category name for grouping missing keywords."""
-    m = {}
-    for cat_name, kws in KEYWORD_CATEGORIES:
-        for k in kws:
-            m[k.lower()] = cat_name
-    return m
+    return find_keywords(_get_automaton(), text.lower())
 
 
-_KEYWORD_CATEGORY_MAP = None
+def _extract_keyword_counts(text: str) -> Dict[str, int]:
+    """Occurrences of each tech keyword (aliases counted as their canonical keyword) in text."""
+    if not (text and text.strip()):
+        return {}
+    return count_keywords(_get_automaton(), text.lower())
 
 
 def _get_keyword_category_map():
-    global _KEYWORD_CATEGORY_MAP
-    if _KEYWORD_CATEGORY_MAP is None:
-        _KEYWORD_CATEGORY_MAP = _keyword_to_category()
+    _get_automaton()
     return _KEYWORD_CATEGORY_MAP
 
 
+# Keyword counts by text hash, so a JD (or resume) seen again is not rescanned
+KEYWORD_CACHE_MAX_ENTRIES = int(os.getenv("KEYWORD_CACHE_MAX_ENTRIES", "1024"))
+_keyword_cache: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+_keyword_cache_lock = threading.Lock()
+_keyword_cache_counters = {"hits": 0, "misses": 0}
+
+
+def keyword_counts(text: str) -> Dict[str, int]:
+    """_extract_keyword_counts(text), cached by the text's SHA-256. Do not modify the returned dict."""
+    if not (text and text.strip()):
+        return {}
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    with _keyword_cache_lock:
+        counts = _keyword_cache.get(key)
+        if counts is not None:
+            _keyword_cache.move_to_end(key)
+            _keyword_cache_counters["hits"] += 1
+            return counts
+        _keyword_cache_counters["misses"] += 1
+    counts = _extract_keyword_counts(text)
+    with _keyword_cache_lock:
+        _keyword_cache[key] = counts
+        while len(_keyword_cache) > KEYWORD_CACHE_MAX_ENTRIES:
+            _keyword_cache.popitem(last=False)
+    return counts
+
+
+def keyword_set(text: str) -> frozenset:
+    """The keywords in text (cached, see keyword_counts)."""
+    return frozenset(keyword_counts(text))
+
+
+def keyword_cache_stats() -> dict:
+    with _keyword_cache_lock:
+        lookups = _keyword_cache_counters["hits"] + _keyword_cache_counters["misses"]
+        return {
+            "entries": len(_keyword_cache),
+            "max_entries": KEYWORD_CACHE_MAX_ENTRIES,
+            **_keyword_cache_counters,
+            "hit_rate": round(_keyword_cache_counters["hits"] / lookups, 4) if lookups else 0.0,
+        }
+
+
+def term_weight(count: int) -> float:
+    """Sublinear term frequency: a keyword repeated in the JD matters more, with diminishing returns."""
+    return 1.0 + math.log(count) if count > 0 else 0.0
+
+
+def keyword_weights(jd_counts: Dict[str, int], idf_table=None) -> Dict[str, float]:
+    """Weight of each JD keyword: term_weight(frequency in the JD) * IDF over stored job descriptions."""
+    if idf_table is None:
+        from .keyword_idf import get_idf_table
+
+        idf_table = get_idf_table()
+    return {kw: term_weight(n) * idf_table.idf(kw) for kw, n in jd_counts.items()}
+
+
+class KeywordAnalysis:
+    """
+    Keyword comparison of one JD and one resume, each scanned once (or served from the keyword cache):
+    jd_counts, jd_keywords, resume_keywords, matched, missing (sorted), weights, coverage and
+    missing_by_category.
+    """
+
+    def __init__(self, job_description: str, resume_text: str, idf_table=None):
+        self.jd_counts = keyword_counts(job_description)
+        self.jd_keywords = frozenset(self.jd_counts)
+        self.resume_keywords = keyword_set(resume_text)
+        self.matched = self.jd_keywords & self.resume_keywords
+        self.missing = sorted(self.jd_keywords - self.resume_keywords)
+        self.weights = keyword_weights(self.jd_counts, idf_table)
+        self.missing_by_category = _missing_keywords_by_category(self)
+
+    @property
+    def coverage(self) -> float:
+        """Weighted share of the JD's keywords present in the resume (0.0 if the JD has none)."""
+        total = sum(self.weights.values())
+        if not total:
+            return 0.0
+        return sum(self.weights[kw] for kw in self.matched) / total
+
+
 def _get_missing_keywords(job_description: str, resume_text: str) -> list:
     """JD keywords that do not appear in the resume. Returns sorted list of lowercase keywords."""
-    jd_kw = _extract_keywords(job_description)
-    resume_kw = _extract_keywords(resume_text)
-    missing = sorted(jd_kw - resume_kw)
-    return missing
+    return KeywordAnalysis(job_description, resume_text).missing
 
 
-def _missing_keywords_by_category(missing_keywords: list) -> dict:
-    """Group missing keywords by category. Returns dict category -> list of keywords."""
+def _missing_keywords_by_category(analysis: KeywordAnalysis) -> dict:
+    """Group the analysis' missing keywords by category. Returns dict category -> list of keywords."""
     cat_map = _get_keyword_category_map()
     by_cat = {}
-    for kw in missing_keywords:
+    for kw in analysis.missing:
         cat = cat_map.get(kw, "Other")
         by_cat.setdefault(cat, []).append(kw)
     return by_cat
@@ -95,14 +186,10 @@ def _missing_keywords_by_category(missing_keywords: list) -> dict:
 
 def _keyword_coverage(job_description: str, resume: str) -> float:
     """
-    Fraction of job-description keywords that appear in the resume.
+    Weighted fraction of job-description keywords that appear in the resume (see KeywordAnalysis).
     Measures how well the resume covers what the job asks for.
     """
-    jd_kw = _extract_keywords(job_description)
-    resume_kw = _extract_keywords(resume)
-    if not jd_kw:
-        return 0.0
-    return len(resume_kw & jd_kw) / len(jd_kw)
+    return KeywordAnalysis(job_description, resume).coverage
 
 
 def _structure_score(resume) -> float:
@@ -137,38 +224,145 @@ def resume_to_sections(resume) -> dict:
     return sections
 
 
-def _section_similarities(model, job_description: str, sections: dict) -> dict:
+_encoder = None
+
+
+def _get_encoder() -> ChunkedEncoder:
+    global _encoder
+    if _encoder is None:
+        _encoder = ChunkedEncoder(_get_model())
+    return _encoder
+
+
+def warm_up() -> None:
+    """Load what the first score would otherwise load: the model, the keyword automaton and the IDF table."""
+    from .keyword_idf import get_idf_table
+
+    _get_encoder()
+    _get_automaton()
+    get_idf_table()
+
+
+def _model_encode(texts: List[str]) -> np.ndarray:
+    """
+    Encode all texts in one batched model call. Returns a float32 matrix with one L2-normalized
+    row per text, so cosine similarity between rows is a plain dot product. Texts longer than the
+    model window are embedded as overlapping chunks and pooled (see ml_model/chunking.py).
+    """
+    return _get_encoder().encode(texts)
+
+
+def _encode_texts(texts: List[str]) -> np.ndarray:
+    """
+    Embeddings for texts, served from the embedding cache where possible. Only cache misses
+    reach the model (in one batch), so re-scoring known texts never loads or runs it.
+    """
+    return cached_encode(texts, embedding_model_id(), _model_encode)
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of the whitespace-normalized text; identical job descriptions share one hash."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def embedding_model_id() -> str:
+    """Version tag stored next to persisted embeddings; stored vectors are reused only on a match."""
+    tag = backend_tag()
+    return f"{MODEL_NAME}+{chunk_config_id()}" + (f"+{tag}" if tag else "")
+
+
+def resume_embedding_fields(resume) -> dict:
+    """Column values (section_embeddings, embedded_sections, embedding_model) for a resume."""
+    sections = resume_to_sections(resume)
+    names = list(sections)
+    blob = None
+    if names:
+        blob = _encode_texts([sections[name] for name in names]).astype(np.float32).tobytes()
+    return {
+        "section_embeddings": blob,
+        "embedded_sections": ",".join(names) or None,
+        "embedding_model": embedding_model_id(),
+    }
+
+
+def job_embedding_fields(job_description: str) -> dict:
+    """Column values (jd_embedding, embedding_model, jd_hash) for a job description."""
+    blob = None
+    if job_description and str(job_description).strip():
+        blob = _encode_texts([str(job_description)])[0].astype(np.float32).tobytes()
+    return {
+        "jd_embedding": blob,
+        "embedding_model": embedding_model_id(),
+        "jd_hash": content_hash(str(job_description or "")),
+    }
+
+
+def stored_section_embeddings(resume, sections: dict) -> Optional[dict]:
+    """
+    Section embeddings persisted on the resume row, or None if missing, from another model version,
+    or not matching the resume's current sections.
+    """
+    blob = getattr(resume, "section_embeddings", None)
+    if not blob or getattr(resume, "embedding_model", None) != embedding_model_id():
+        return None
+    names = (getattr(resume, "embedded_sections", None) or "").split(",")
+    if names != list(sections):
+        return None
+    matrix = np.frombuffer(blob, dtype=np.float32).reshape(len(names), -1)
+    return dict(zip(names, matrix))
+
+
+def stored_job_embedding(job) -> Optional[np.ndarray]:
+    """JD embedding persisted on the job row, or None if missing or from another model version."""
+    blob = getattr(job, "jd_embedding", None)
+    if not blob or getattr(job, "embedding_model", None) != embedding_model_id():
+        return None
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def _embed_request(job_description: str, sections: dict, jd_emb=None, section_embs=None):
+    """
+    Embed the JD and every non-empty resume section with a single encode call, skipping whatever
+    was already supplied (e.g. vectors stored in the DB). Returns (jd_emb, {section_name: section_emb}).
+    """
+    names = [name for name, text in sections.items() if text and str(text).strip()]
+    texts = []
+    if jd_emb is None:
+        texts.append(job_description)
+    if section_embs is None:
+        texts.extend(str(sections[name]).strip() for name in names)
+    if texts:
+        matrix = _encode_texts(texts)
+        if jd_emb is None:
+            jd_emb, matrix = matrix[0], matrix[1:]
+        if section_embs is None:
+            section_embs = dict(zip(names, matrix))
+    return jd_emb, section_embs
+
+
+def _section_similarities(jd_emb: np.ndarray, section_embs: dict) -> dict:
     """
     Per-section cosine similarity to the job description.
     Returns dict section_name -> float in [0, 1] (cos_sim can be in [-1,1]; we clamp to 0-1 for display).
     """
-    jd_emb = model.encode(job_description)
     out = {}
-    for name, text in sections.items():
-        if not (text and str(text).strip()):
-            continue
-        sec_emb = model.encode(str(text).strip())
-        sim = util.cos_sim(jd_emb, sec_emb).item()
+    for name, sec_emb in section_embs.items():
+        sim = float(np.dot(jd_emb, sec_emb))
         out[name] = round(max(0.0, min(1.0, sim)), 4)
     return out
 
 
-def _section_weighted_semantic(model, job_description: str, sections: dict) -> float:
+def _section_weighted_semantic(jd_emb: np.ndarray, section_embs: dict) -> float:
     """
-    Embed the JD once; embed each resume section; compute weighted average of cosine similarities.
+    Weighted average of cosine similarities between the JD and each embedded resume section.
     Sections not present get weight redistributed proportionally among present ones.
     """
-    jd_emb = model.encode(job_description)
     total = 0.0
     weight_used = 0.0
     for name, weight in SECTION_WEIGHTS.items():
-        if name not in sections or not sections[name]:
+        if name not in section_embs:
             continue
-        text = sections[name]
-        if not text.strip():
-            continue
-        sec_emb = model.encode(text)
-        sim = util.cos_sim(jd_emb, sec_emb).item()
+        sim = float(np.dot(jd_emb, section_embs[name]))
         total += weight * sim
         weight_used += weight
     if weight_used <= 0:
@@ -177,21 +371,53 @@ def _section_weighted_semantic(model, job_description: str, sections: dict) -> f
     return total / weight_used
 
 
-def _full_doc_semantic(model, job_description: str, resume_text: str) -> float:
-    """Single embedding for JD and full resume; return cosine similarity."""
-    jd_emb = model.encode(job_description)
-    resume_emb = model.encode(resume_text)
-    return util.cos_sim(jd_emb, resume_emb).item()
+def resume_profile_vector(section_embs: dict) -> Optional[np.ndarray]:
+    """
+    SECTION_WEIGHTS-weighted mean of the (normalized) section embeddings. Because cosine similarity
+    is linear in the section vector, dot(jd_emb, profile) == _section_weighted_semantic(jd_emb, ...),
+    which lets one-to-many ranking score every resume with a single matrix-vector product.
+    Returns None when no weighted section is present.
+    """
+    total = None
+    weight_used = 0.0
+    for name, weight in SECTION_WEIGHTS.items():
+        if name not in section_embs:
+            continue
+        vec = weight * np.asarray(section_embs[name], dtype=np.float32)
+        total = vec if total is None else total + vec
+        weight_used += weight
+    if total is None or weight_used <= 0:
+        return None
+    return (total / weight_used).astype(np.float32)
+
+
+def resume_section_embeddings(resume) -> dict:
+    """Section embeddings for a resume row: the stored ones if current, otherwise encoded (cached)."""
+    sections = resume_to_sections(resume)
+    stored = stored_section_embeddings(resume, sections)
+    if stored is not None:
+        return stored
+    names = list(sections)
+    if not names:
+        return {}
+    return dict(zip(names, _encode_texts([sections[name] for name in names])))
+
+
+def _full_doc_semantic(job_description: str, resume_text: str) -> float:
+    """Single embedding for JD and full resume (one batched call); return cosine similarity."""
+    jd_emb, resume_emb = _encode_texts([job_description, resume_text])
+    return float(np.dot(jd_emb, resume_emb))
 
 
 def _generate_recommendations(
     breakdown: dict,
-    missing_keywords: list,
+    analysis: KeywordAnalysis,
     section_scores: dict,
     has_certifications: bool,
 ) -> list:
     """Rule-based actionable recommendations."""
     recs = []
+    missing_keywords = analysis.missing
     if missing_keywords:
         kw_list = ", ".join(missing_keywords[:10])
         if len(missing_keywords) > 10:
@@ -209,16 +435,17 @@ def _generate_recommendations(
     return recs
 
 
-def score_resume(job_description: str, resume) -> Dict[str, Any]:
+def score_resume(job_description: str, resume, job=None) -> Dict[str, Any]:
     """
     Score how well a resume matches a job description and return structured insights.
 
     resume: Either a string (full resume text) or an ORM-like object with .skills, .experience,
             .education, .projects, .objective, .certifications.
+    job: Optional Job row for job_description; its stored embedding is used when the model matches
+         (likewise the resume's stored section embeddings), so re-scoring skips the encoder.
     Returns a dict: score, breakdown, missing_keywords, missing_keywords_by_category,
                     section_scores, recommendations.
     """
-    model = _get_model()
     t0 = time.perf_counter()
 
     # Full resume text for keyword matching (and fallback semantic)
@@ -231,14 +458,23 @@ def score_resume(job_description: str, resume) -> Dict[str, Any]:
     if hasattr(resume, "skills") or hasattr(resume, "experience"):
         sections = resume_to_sections(resume)
 
-    # 1) Semantic score: section-weighted if we have sections, else full-doc
+    # 1) Semantic score: section-weighted if we have sections, else full-doc.
+    # The JD and all sections are embedded in one batch and reused for the section scores below.
+    section_embs = {}
     if sections:
-        semantic = _section_weighted_semantic(model, job_description, sections)
+        jd_emb, section_embs = _embed_request(
+            job_description,
+            sections,
+            jd_emb=stored_job_embedding(job) if job is not None else None,
+            section_embs=stored_section_embeddings(resume, sections),
+        )
+        semantic = _section_weighted_semantic(jd_emb, section_embs)
     else:
-        semantic = _full_doc_semantic(model, job_description, resume_text) if resume_text else 0.0
+        semantic = _full_doc_semantic(job_description, resume_text) if resume_text else 0.0
 
-    # 2) Keyword coverage
-    keyword = _keyword_coverage(job_description, resume_text)
+    # 2) Keyword coverage (the JD and resume are each scanned once for all keyword insights)
+    analysis = KeywordAnalysis(job_description, resume_text)
+    keyword = analysis.coverage
 
     # 3) Structure
     if hasattr(resume, "skills") and hasattr(resume, "experience") and hasattr(resume, "education"):
@@ -249,14 +485,10 @@ def score_resume(job_description: str, resume) -> Dict[str, Any]:
     final = (W_SEMANTIC * semantic) + (W_KEYWORD * keyword) + (W_STRUCTURE * structure)
     final = round(final, 4)
 
-    # Insights: missing keywords (flat + by category)
-    missing_keywords = _get_missing_keywords(job_description, resume_text)
-    missing_keywords_by_category = _missing_keywords_by_category(missing_keywords)
-
     # Section-level scores (per-section similarity to JD)
     section_scores = {}
-    if sections:
-        section_scores = _section_similarities(model, job_description, sections)
+    if section_embs:
+        section_scores = _section_similarities(jd_emb, section_embs)
 
     # Actionable recommendations
     has_certifications = bool(
@@ -264,7 +496,7 @@ def score_resume(job_description: str, resume) -> Dict[str, Any]:
     )
     recommendations = _generate_recommendations(
         {"semantic": round(semantic, 4), "keyword": round(keyword, 4), "structure": round(structure, 4)},
-        missing_keywords,
+        analysis,
         section_scores,
         has_certifications,
     )
@@ -282,13 +514,25 @@ def score_resume(job_description: str, resume) -> Dict[str, Any]:
             "keyword": round(keyword, 4),
             "structure": round(structure, 4),
         },
-        "missing_keywords": missing_keywords,
-        "missing_keywords_by_category": missing_keywords_by_category,
+        "missing_keywords": analysis.missing,
+        "missing_keywords_by_category": analysis.missing_by_category,
         "section_scores": section_scores,
         "recommendations": recommendations,
     }
 
 
+def score_resumes(job_description: str, resumes: list) -> List[Dict[str, Any]]:
+    """
+    score_resume for many resumes against one JD. The JD and every section of every resume are
+    embedded in one batched encode call up front, so the per-resume scoring only hits the cache.
+    """
+    texts = [job_description]
+    for resume in resumes:
+        texts.extend(resume_to_sections(resume).values())
+    _encode_texts(texts)
+    return [score_resume(job_description, resume) for resume in resumes]
+
+
 """Converts a resume from SQLAlchemy model to a single string (all sections concatenated)."""
 def resume_to_string(resume):
     parts = []
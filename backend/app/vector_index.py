@@ -0,0 +1,276 @@
+"""
+In-process vector indexes for JD -> resume retrieval (inner product on normalized embeddings).
+
+FlatIndex scores every stored vector (exact). IVFIndex clusters vectors with spherical k-means and
+only scores the vectors in the nprobe clusters closest to the query (approximate, much faster at
+100k+ vectors). Both support incremental add/update/remove by integer id and save/load to a
+single .npz file. Pick one with VECTOR_INDEX_BACKEND=flat|ivf.
+"""
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+DEFAULT_BACKEND = os.getenv("VECTOR_INDEX_BACKEND", "flat").lower()
+DEFAULT_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "16"))
+# IVF falls back to exact search until it holds at least this many vectors
+IVF_MIN_TRAIN = int(os.getenv("VECTOR_INDEX_IVF_MIN_TRAIN", "2048"))
+_KMEANS_ITERATIONS = 10
+_KMEANS_MAX_SAMPLE_PER_LIST = 64
+_ASSIGN_CHUNK = 8192
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest scores, best first."""
+    if k >= scores.shape[0]:
+        return np.argsort(-scores, kind="stable")
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class FlatIndex:
+    """Exact inner-product search over a growable float32 matrix."""
+
+    kind = "flat"
+
+    def __init__(self, dim: int = 0):
+        self.dim = dim
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._live = np.zeros(0, dtype=bool)
+        self._slot_of = {}
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def _grow(self) -> None:
+        cap = self._vectors.shape[0]
+        if self._size < cap:
+            return
+        new_cap = max(64, cap * 2)
+        vectors = np.zeros((new_cap, self.dim), dtype=np.float32)
+        vectors[:cap] = self._vectors
+        ids = np.zeros(new_cap, dtype=np.int64)
+        ids[:cap] = self._ids
+        live = np.zeros(new_cap, dtype=bool)
+        live[:cap] = self._live
+        self._vectors, self._ids, self._live = vectors, ids, live
+        self._on_grow(new_cap)
+
+    def _on_grow(self, new_cap: int) -> None:
+        pass
+
+    def _put(self, item_id: int, vector: np.ndarray) -> int:
+        """Store vector under item_id (caller holds the lock); returns its slot."""
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        if self.dim == 0:
+            self.dim = vector.shape[0]
+            self._vectors = np.zeros((self._vectors.shape[0], self.dim), dtype=np.float32)
+        slot = self._slot_of.get(item_id)
+        if slot is None:
+            self._grow()
+            slot = self._size
+            self._size += 1
+            self._slot_of[item_id] = slot
+            self._ids[slot] = item_id
+        self._vectors[slot] = vector
+        self._live[slot] = True
+        return slot
+
+    def add(self, item_id: int, vector: np.ndarray) -> None:
+        """Insert or replace the vector stored for item_id."""
+        with self._lock:
+            slot = self._put(item_id, vector)
+            self._on_add(np.array([slot]))
+
+    def add_many(self, item_ids, vectors) -> None:
+        """Bulk insert/replace; cheaper than repeated add() for IVF (one assignment pass)."""
+        with self._lock:
+            slots = [self._put(item_id, vec) for item_id, vec in zip(item_ids, vectors)]
+            if slots:
+                self._on_add(np.array(slots))
+
+    def _on_add(self, slots: np.ndarray) -> None:
+        pass
+
+    def remove(self, item_id: int) -> None:
+        with self._lock:
+            slot = self._slot_of.pop(item_id, None)
+            if slot is not None:
+                self._live[slot] = False
+                self._vectors[slot] = 0.0
+
+    def ids(self) -> np.ndarray:
+        with self._lock:
+            return self._ids[: self._size][self._live[: self._size]].copy()
+
+    def _candidates(self, query: np.ndarray, nprobe: Optional[int]) -> Optional[np.ndarray]:
+        """Slots worth scoring for query, or None for every live slot."""
+        return None
+
+    def search(self, query: np.ndarray, k: int, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (ids, scores) of the k best vectors by inner product with query, best first."""
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if not self._slot_of or k <= 0:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+            slots = self._candidates(query, nprobe)
+            if slots is None:
+                # Score the contiguous block in place (no gather copy), then drop removed slots
+                live = self._live[: self._size]
+                scores = self._vectors[: self._size] @ query
+                if len(self._slot_of) < self._size:
+                    slots = np.flatnonzero(live)
+                    scores = scores[slots]
+                else:
+                    slots = np.arange(self._size)
+            else:
+                scores = self._vectors[slots] @ query
+            order = _top_k(scores, k)
+            return self._ids[slots[order]].copy(), scores[order]
+
+    def _extra_state(self) -> dict:
+        return {}
+
+    def save(self, path: str) -> None:
+        """Write the index to path (.npz) atomically."""
+        with self._lock:
+            live = self._live[: self._size]
+            state = {
+                "kind": np.array(self.kind),
+                "ids": self._ids[: self._size][live],
+                "vectors": self._vectors[: self._size][live],
+            }
+            state.update(self._extra_state())
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, **state)
+        os.replace(tmp, path)
+
+    def _load_extra_state(self, data) -> None:
+        pass
+
+    @classmethod
+    def from_file(cls, path: str) -> "FlatIndex":
+        with np.load(path, allow_pickle=False) as data:
+            vectors = data["vectors"]
+            index = cls(dim=vectors.shape[1] if vectors.ndim == 2 else 0)
+            index._load_extra_state(data)
+            index.add_many(data["ids"].tolist(), vectors)
+        return index
+
+
+class IVFIndex(FlatIndex):
+    """
+    Inverted-file index: vectors are assigned to the nearest of nlist k-means centroids, and a
+    search only scores vectors in the nprobe best clusters. New vectors are assigned incrementally;
+    the centroids are retrained once the index has doubled since the last training.
+    """
+
+    kind = "ivf"
+
+    def __init__(self, dim: int = 0, nprobe: int = DEFAULT_NPROBE):
+        super().__init__(dim)
+        self.nprobe = nprobe
+        self.centroids: Optional[np.ndarray] = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._trained_size = 0
+
+    def _on_grow(self, new_cap: int) -> None:
+        assign = np.full(new_cap, -1, dtype=np.int32)
+        assign[: self._assign.shape[0]] = self._assign
+        self._assign = assign
+
+    def _on_add(self, slots: np.ndarray) -> None:
+        if self.centroids is None:
+            if len(self._slot_of) >= IVF_MIN_TRAIN:
+                self.train()
+            return
+        if len(self._slot_of) >= 2 * self._trained_size:
+            self.train()
+            return
+        self._assign_all(slots)
+
+    def _assign_all(self, slots: np.ndarray) -> None:
+        for i in range(0, slots.shape[0], _ASSIGN_CHUNK):
+            chunk = slots[i:i + _ASSIGN_CHUNK]
+            self._assign[chunk] = np.argmax(self._vectors[chunk] @ self.centroids.T, axis=1)
+
+    def train(self, seed: int = 0) -> None:
+        """(Re)build centroids with spherical k-means on a sample of the stored vectors."""
+        with self._lock:
+            t0 = time.perf_counter()
+            slots = np.flatnonzero(self._live[: self._size])
+            n = slots.shape[0]
+            if n == 0:
+                return
+            nlist = int(max(1, min(4096, 2 * np.sqrt(n))))
+            rng = np.random.default_rng(seed)
+            sample_n = min(n, nlist * _KMEANS_MAX_SAMPLE_PER_LIST)
+            sample = self._vectors[rng.choice(slots, size=sample_n, replace=False)]
+            centroids = sample[rng.choice(sample_n, size=nlist, replace=False)].copy()
+            for _ in range(_KMEANS_ITERATIONS):
+                labels = np.empty(sample_n, dtype=np.int64)
+                for i in range(0, sample_n, _ASSIGN_CHUNK):
+                    labels[i:i + _ASSIGN_CHUNK] = np.argmax(sample[i:i + _ASSIGN_CHUNK] @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                counts = np.bincount(labels, minlength=nlist)
+                empty = counts == 0
+                # Re-seed empty clusters with random sample points
+                if empty.any():
+                    sums[empty] = sample[rng.choice(sample_n, size=int(empty.sum()))]
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                centroids = (sums / np.maximum(norms, 1e-12)).astype(np.float32)
+            self.centroids = centroids
+            self._assign[: self._size] = -1
+            self._assign_all(slots)
+            self._trained_size = n
+            print(f"IVF index trained: {n} vectors, {nlist} lists in {time.perf_counter() - t0:.2f}s", flush=True)
+
+    def _candidates(self, query: np.ndarray, nprobe: Optional[int]) -> np.ndarray:
+        if self.centroids is None:
+            return super()._candidates(query, nprobe)
+        nprobe = min(nprobe or self.nprobe, self.centroids.shape[0])
+        probe = _top_k(self.centroids @ query, nprobe)
+        mask = np.isin(self._assign[: self._size], probe)
+        mask &= self._live[: self._size]
+        return np.flatnonzero(mask)
+
+    def _extra_state(self) -> dict:
+        if self.centroids is None:
+            return {}
+        return {"centroids": self.centroids, "trained_size": np.array(self._trained_size)}
+
+    def _load_extra_state(self, data) -> None:
+        if "centroids" in data.files:
+            self.centroids = data["centroids"]
+            self._trained_size = int(data["trained_size"])
+
+
+_BACKENDS = {"flat": FlatIndex, "ivf": IVFIndex}
+
+
+def create_index(kind: Optional[str] = None) -> FlatIndex:
+    kind = (kind or DEFAULT_BACKEND).lower()
+    if kind not in _BACKENDS:
+        raise ValueError(f"Unknown vector index backend: {kind} (expected one of {sorted(_BACKENDS)})")
+    return _BACKENDS[kind]()
+
+
+def load_index(path: Optional[str], kind: Optional[str] = None) -> FlatIndex:
+    """Load the index saved at path if it exists and matches the backend; otherwise an empty one."""
+    kind = (kind or DEFAULT_BACKEND).lower()
+    if path and os.path.exists(path):
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                saved_kind = str(data["kind"])
+            if saved_kind == kind:
+                return _BACKENDS[kind].from_file(path)
+            print(f"Vector index at {path} is {saved_kind}, expected {kind}; rebuilding.", flush=True)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: could not load vector index {path}: {e}", flush=True)
+    return create_index(kind)
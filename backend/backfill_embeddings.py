@@ -0,0 +1,134 @@
+"""
+Add embedding columns to resume_info / job_info and (re-)embed existing rows.
+Run from repo root: python backend/backfill_embeddings.py [--batch-size 64]
+Safe to run multiple times (skips existing columns and rows already embedded with the current model).
+Also adds job_info.jd_hash, which the Job model selects, and sets it on every job it embeds; run
+backend/migrate_lookup_indexes.py afterwards to hash the jobs that were already embedded and build
+the lookup indexes.
+"""
+import argparse
+import os
+import sys
+
+# Load .env from repo root when run as python backend/backfill_embeddings.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import inspect, or_, text
+from sqlalchemy.types import LargeBinary
+
+from backend.app.database import engine, SessionLocal
+from backend.app.models import Resume, Job
+from backend.app.scoring_logic import (
+    _encode_texts,
+    embedding_model_id,
+    job_embedding_fields,
+    resume_embedding_fields,
+    resume_to_sections,
+)
+
+
+def add_columns():
+    blob_type = LargeBinary().compile(dialect=engine.dialect)
+    wanted = {
+        "resume_info": [
+            ("section_embeddings", blob_type),
+            ("embedded_sections", "VARCHAR(100)"),
+            ("embedding_model", "VARCHAR(100)"),
+        ],
+        "job_info": [
+            ("jd_embedding", blob_type),
+            ("embedding_model", "VARCHAR(100)"),
+            ("jd_hash", "VARCHAR(64)"),
+        ],
+    }
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in wanted.items():
+            existing = {c["name"] for c in insp.get_columns(table)}
+            for col, defn in columns:
+                if col in existing:
+                    print(f"Column {table}.{col} already exists; skip.")
+                    continue
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} {defn}"))
+                print(f"Added column {table}.{col}.")
+
+
+def _stale(model):
+    return or_(model.embedding_model.is_(None), model.embedding_model != embedding_model_id())
+
+
+def backfill_resumes(batch_size: int):
+    done = 0
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Resume)
+                .filter(Resume.id > last_id, _stale(Resume))
+                .order_by(Resume.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            # One batched encode for every section in the batch; per-row packing then hits the cache.
+            texts = [t for r in rows for t in resume_to_sections(r).values()]
+            if texts:
+                _encode_texts(texts)
+            for r in rows:
+                for key, value in resume_embedding_fields(r).items():
+                    setattr(r, key, value)
+            db.commit()
+            last_id = rows[-1].id
+            done += len(rows)
+            print(f"Resumes embedded: {done}", flush=True)
+        finally:
+            db.close()
+    return done
+
+
+def backfill_jobs(batch_size: int):
+    done = 0
+    last_id = 0
+    while True:
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Job)
+                .filter(Job.id > last_id, _stale(Job))
+                .order_by(Job.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                break
+            texts = [j.job_description for j in rows if j.job_description and j.job_description.strip()]
+            if texts:
+                _encode_texts(texts)
+            for j in rows:
+                for key, value in job_embedding_fields(j.job_description).items():
+                    setattr(j, key, value)
+            db.commit()
+            last_id = rows[-1].id
+            done += len(rows)
+            print(f"Jobs embedded: {done}", flush=True)
+        finally:
+            db.close()
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+    add_columns()
+    resumes = backfill_resumes(args.batch_size)
+    jobs = backfill_jobs(args.batch_size)
+    print(f"Backfill done ({resumes} resumes, {jobs} jobs, model {embedding_model_id()}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Create keyword_doc_freq and recount it from job_info, each distinct job description once (keyword IDF
+for weighted keyword scoring).
+Run from repo root: python backend/backfill_keyword_idf.py [--batch-size 500]
+Run once after deploying weighted keyword scoring, again after deploying per-description counting
+(earlier versions counted every job row, so repeated postings inflated the counts), and after editing
+keyword_list.py; new jobs keep the table up to date incrementally. Safe to run multiple times.
+"""
+import argparse
+import os
+import sys
+import time
+
+# Load .env from repo root when run as python backend/backfill_keyword_idf.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dotenv import load_dotenv
+load_dotenv()
+
+from backend.app.keyword_idf import rebuild
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    table = rebuild(batch_size=args.batch_size)
+    top = sorted(table.doc_freq.items(), key=lambda kv: -kv[1])[:10]
+    print(
+        f"Counted {table.n_docs} distinct job descriptions, {len(table.doc_freq)} distinct keywords "
+        f"in {time.perf_counter() - t0:.1f}s."
+    )
+    print("Most common: " + ", ".join(f"{kw} ({n})" for kw, n in top))
+
+
+if __name__ == "__main__":
+    main()
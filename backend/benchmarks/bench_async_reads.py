@@ -0,0 +1,121 @@
+"""
+Concurrent /resume/{name}/jobs reads: sync SQLAlchemy helpers called from async code vs async_data (AsyncSession).
+Run from repo root: python backend/benchmarks/bench_async_reads.py [--url postgresql+psycopg2://...] [--requests 400]
+Without --url it uses a fresh SQLite file in a temp dir. Do not point --url at a database you care
+about: tables are created and filled with synthetic rows. No model needed. For each concurrency level,
+runs that many request coroutines at once (resume by name, then its jobs) and reports throughput,
+p95 latency and the worst event-loop stall seen by a 1 ms ticker. A stall is time the loop could not
+serve any other request, e.g. /health.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+
+def fill(engine, n_resumes, jobs_per_resume):
+    from sqlalchemy import insert
+
+    from backend.app.models import Job, Resume
+
+    with engine.begin() as conn:
+        conn.execute(insert(Resume), [{"id": i + 1, "name": f"Candidate {i}", "skills": "python"} for i in range(n_resumes)])
+        conn.execute(insert(Job), [
+            {"resume_id": i % n_resumes + 1, "job_description": f"Job description {i}: python, sql.", "score": 0.5}
+            for i in range(n_resumes * jobs_per_resume)
+        ])
+
+
+async def sync_request(name):
+    """The previous handler body: sync helpers awaited nowhere, so each round trip blocks the loop."""
+    from backend.app.insert_resume_data import get_jobs_by_resume_id, get_resume_by_name
+
+    resume = get_resume_by_name(name)
+    return get_jobs_by_resume_id(resume.id)
+
+
+async def async_request(name):
+    from backend.app.async_data import get_jobs_by_resume_id, get_resume_by_name
+
+    resume = await get_resume_by_name(name)
+    return await get_jobs_by_resume_id(resume.id)
+
+
+async def run(request, names, concurrency):
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal stall
+        while not done.is_set():
+            t = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stall = max(stall, time.perf_counter() - t - 0.001)
+
+    latencies = []
+    queue = list(names)
+
+    async def worker():
+        while queue:
+            name = queue.pop()
+            t = time.perf_counter()
+            await request(name)
+            latencies.append(time.perf_counter() - t)
+
+    tick = asyncio.ensure_future(ticker())
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    done.set()
+    await tick
+    return len(names) / elapsed, np.percentile(latencies, 95) * 1000, stall * 1000
+
+
+async def main_async(args):
+    from backend.app import async_data
+
+    rng = random.Random(0)
+    names = [f"Candidate {rng.randrange(args.resumes)}" for _ in range(args.requests)]
+    await async_request(names[0])  # open the async engine
+    print(f"{args.requests} requests per run")
+    print(f"{'path':<7}{'concurrency':>12}{'req/s':>10}{'p95 ms':>10}{'max loop stall ms':>20}")
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        for label, request in (("sync", sync_request), ("async", async_request)):
+            rps, p95, stall = await run(request, names, concurrency)
+            print(f"{label:<7}{concurrency:>12}{rps:>10.0f}{p95:>10.2f}{stall:>20.2f}")
+    await async_data.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=None, help="SQLAlchemy URL (default: temp SQLite file)")
+    parser.add_argument("--resumes", type=int, default=2000)
+    parser.add_argument("--jobs-per-resume", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", default="1,8,32")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = args.url or f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    # Enough connections for the highest concurrency, for both engines
+    os.environ.setdefault("DB_POOL_SIZE", str(max(int(c) for c in args.concurrency.split(","))))
+    from backend.app.database import engine
+    from backend.app.models import Base
+
+    Base.metadata.create_all(bind=engine)
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}")
+    fill(engine, args.resumes, args.jobs_per_resume)
+    asyncio.run(main_async(args))
+    engine.dispose()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
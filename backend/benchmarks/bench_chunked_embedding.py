@@ -0,0 +1,101 @@
+"""
+Tokens-per-second benchmark: chunked embedding (ml_model/chunking.py) vs plain truncating encode.
+Run from repo root: python backend/benchmarks/bench_chunked_embedding.py [--lengths 128,512,2048,8192] [--texts 32]
+Loads all-MiniLM-L6-v2 (downloads it on first use). Also reports padding waste of the
+length-sorted batch order vs input order on a mixed-length request, and what the per-text window
+cap (EMBED_MAX_CHUNKS, or --max-chunks) saves on long texts and how close the capped vectors stay.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from backend.app.ml_model.chunking import EMBED_MAX_CHUNKS, ChunkedEncoder
+
+_WORDS = (
+    "designed built led scalable python services kubernetes postgres latency reliability team "
+    "migrated pipeline customers analytics react typescript aws docker terraform mentoring on-call"
+).split()
+
+
+def synthetic_text(n_words, rng):
+    return " ".join(rng.choice(_WORDS) for _ in range(n_words))
+
+
+def padding_waste(lengths, batch_size):
+    """Share of padded positions when batches are padded to their longest member."""
+    padded = sum(max(lengths[i:i + batch_size]) * len(lengths[i:i + batch_size]) for i in range(0, len(lengths), batch_size))
+    return 1 - sum(lengths) / padded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lengths", default="128,512,2048,8192", help="Approximate words per text")
+    parser.add_argument("--texts", type=int, default=32, help="Texts per request")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-chunks", type=int, default=EMBED_MAX_CHUNKS, help="Window cap per text (0 = none)")
+    args = parser.parse_args()
+
+    from backend.app.scoring_logic import _get_model
+
+    model = _get_model()
+    rng = random.Random(0)
+    print(f"{'words':>7}{'tokens/text':>13}{'chunks/text':>13}{'trunc ms':>10}{'chunk ms':>10}"
+          f"{'trunc tok/s':>13}{'chunk tok/s':>13}{'cos(trunc,chunk)':>18}")
+    for n_words in (int(x) for x in args.lengths.split(",")):
+        texts = [synthetic_text(n_words, rng) for _ in range(args.texts)]
+        for pooling in ("mean", "max"):
+            encoder = ChunkedEncoder(model, pooling=pooling, max_chunks=args.max_chunks)
+            n_tokens = sum(len(model.tokenizer(t, add_special_tokens=False, verbose=False)["input_ids"]) for t in texts)
+            trunc_s = chunk_s = float("inf")
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                trunc = model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+                trunc_s = min(trunc_s, time.perf_counter() - t0)
+                before = encoder.chunks_encoded
+                t0 = time.perf_counter()
+                chunked = encoder.encode(texts)
+                chunk_s = min(chunk_s, time.perf_counter() - t0)
+                chunks = encoder.chunks_encoded - before
+            trunc = trunc / np.linalg.norm(trunc, axis=1, keepdims=True)
+            cos = float(np.mean(np.sum(trunc * chunked, axis=1)))
+            # Truncation only embeds the first window of each text; count input tokens for both
+            print(
+                f"{n_words:>7}{n_tokens / len(texts):>13.0f}{chunks / len(texts):>13.1f}{trunc_s * 1000:>10.1f}"
+                f"{chunk_s * 1000:>10.1f}{n_tokens / trunc_s:>13.0f}{n_tokens / chunk_s:>13.0f}{cos:>18.3f}  ({pooling})"
+            )
+
+    print(f"\nWindow cap: at most {args.max_chunks or 'unlimited'} windows per text (mean pooling)")
+    print(f"{'words':>7}{'windows':>9}{'capped':>8}{'uncapped ms':>13}{'capped ms':>11}{'cos(capped,uncapped)':>22}")
+    uncapped_encoder = ChunkedEncoder(model, max_chunks=0)
+    capped_encoder = ChunkedEncoder(model, max_chunks=args.max_chunks)
+    for n_words in (int(x) for x in args.lengths.split(",")):
+        texts = [synthetic_text(n_words, rng) for _ in range(args.texts)]
+        windows = sum(len(uncapped_encoder.chunks(t)) for t in texts) / len(texts)
+        capped = sum(len(capped_encoder.chunks(t)) for t in texts) / len(texts)
+        vectors, seconds = {}, {}
+        for label, enc in (("uncapped", uncapped_encoder), ("capped", capped_encoder)):
+            seconds[label] = float("inf")
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                vectors[label] = enc.encode(texts)
+                seconds[label] = min(seconds[label], time.perf_counter() - t0)
+        cos = float(np.mean(np.sum(vectors["uncapped"] * vectors["capped"], axis=1)))
+        print(f"{n_words:>7}{windows:>9.1f}{capped:>8.1f}{seconds['uncapped'] * 1000:>13.1f}"
+              f"{seconds['capped'] * 1000:>11.1f}{cos:>22.4f}")
+
+    encoder = ChunkedEncoder(model)
+    mixed = [synthetic_text(rng.choice([20, 60, 200, 600, 3000]), rng) for _ in range(200)]
+    lengths = [n for t in mixed for _, n in encoder.chunks(t)]
+    print(f"\nPadding waste on a mixed request ({len(lengths)} windows, batch {encoder.batch_size}): "
+          f"input order {padding_waste(lengths, encoder.batch_size):.1%}, "
+          f"length-sorted {padding_waste(sorted(lengths, reverse=True), encoder.batch_size):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Parity check + benchmark of the embedding inference backends (EMBEDDING_BACKEND=torch|onnx|onnx-int8).
+Run from repo root: python backend/benchmarks/bench_embedding_backends.py [--backends torch,onnx,onnx-int8] [--requests 50]
+Run backend/export_onnx_model.py first. Each backend runs in a fresh subprocess so cold start
+(imports + model load) and peak RSS are measured in isolation; encode latency is per scoring-style
+request (a few sections + one JD, chunked). Parity compares every backend to torch: per-text cosine
+of the embeddings and the JD/resume cosine scores the semantic score is built from, with the
+tolerances of backend/tests/test_embedding_backends.py. Exits non-zero if a backend is outside them.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from backend.tests.test_embedding_backends import TOLERANCE
+
+_WORDS = (
+    "designed built led scalable python services kubernetes postgres latency reliability team "
+    "migrated pipeline customers analytics react typescript aws docker terraform mentoring on-call "
+    "senior engineer experience skills education projects machine learning data warehouse"
+).split()
+
+
+def synthetic_texts(n, rng, lengths=(8, 40, 120, 400, 1500)):
+    return [" ".join(rng.choice(_WORDS) for _ in range(rng.choice(lengths))) for _ in range(n)]
+
+
+def worker(args):
+    """Runs in the subprocess: load one backend, time it, write embeddings to args.out."""
+    t0 = time.perf_counter()
+    from backend.app.ml_model.chunking import ChunkedEncoder
+    from backend.app.ml_model.model import load_embedder
+
+    model = load_embedder(args.model, args.worker, model_dir=args.onnx_dir)
+    encoder = ChunkedEncoder(model)
+    encoder.encode(["warm up"])
+    cold_start = time.perf_counter() - t0
+
+    rng = random.Random(0)
+    parity_texts = synthetic_texts(args.parity_texts, rng)
+    parity = encoder.encode(parity_texts)
+
+    latencies = []
+    for _ in range(args.requests):
+        request = synthetic_texts(5, rng)
+        t = time.perf_counter()
+        encoder.encode(request)
+        latencies.append(time.perf_counter() - t)
+    np.save(args.out, parity)
+    print(json.dumps({
+        "cold_start_s": cold_start,
+        # ru_maxrss is in KB on Linux
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000),
+        "torch_imported": "torch" in sys.modules,
+    }))
+
+
+def run_backend(backend, args, out):
+    cmd = [
+        sys.executable, os.path.abspath(__file__), "--worker", backend, "--out", out,
+        "--model", args.model, "--requests", str(args.requests), "--parity-texts", str(args.parity_texts),
+    ]
+    if args.onnx_dir:
+        cmd += ["--onnx-dir", args.onnx_dir]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(f"{backend} failed:\n{proc.stderr[-2000:]}")
+        return None
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def pair_scores(emb):
+    """Cosine of each text against every other one (the rows are unit vectors)."""
+    sims = emb @ emb.T
+    return sims[np.triu_indices(len(emb), k=1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", default="torch,onnx,onnx-int8")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--onnx-dir", default=None, help="Default ONNX_MODEL_DIR")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--parity-texts", type=int, default=64)
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--out", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        worker(args)
+        return
+
+    backends = args.backends.split(",")
+    results, embeddings = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            out = os.path.join(tmp, f"{backend}.npy")
+            results[backend] = run_backend(backend, args, out)
+            if results[backend] is not None:
+                embeddings[backend] = np.load(out)
+
+    print(f"{'backend':<11}{'cold start s':>14}{'max RSS MB':>12}{'p50 ms':>9}{'p95 ms':>9}{'torch loaded':>14}")
+    for backend in backends:
+        r = results[backend]
+        if r is None:
+            print(f"{backend:<11}{'failed':>14}")
+            continue
+        print(f"{backend:<11}{r['cold_start_s']:>14.2f}{r['max_rss_mb']:>12.0f}{r['p50_ms']:>9.1f}"
+              f"{r['p95_ms']:>9.1f}{str(r['torch_imported']):>14}")
+
+    failures = sum(1 for backend in backends if results[backend] is None)
+    if "torch" not in embeddings:
+        print("\nNo torch reference embeddings; parity not checked.")
+        sys.exit(1 if failures else 0)
+    reference = embeddings["torch"]
+    reference_scores = pair_scores(reference)
+    print(f"\nParity vs torch ({len(reference)} texts, {len(reference_scores)} pair scores)")
+    print(f"{'backend':<11}{'min cos':>10}{'mean cos':>10}{'max |dscore|':>14}{'mean |dscore|':>15}  result")
+    for backend, emb in embeddings.items():
+        if backend == "torch":
+            continue
+        cos = np.sum(emb * reference, axis=1)
+        dscore = np.abs(pair_scores(emb) - reference_scores)
+        min_cos, max_dscore = TOLERANCE.get(backend, (0.0, 1.0))
+        ok = cos.min() >= min_cos and dscore.max() <= max_dscore
+        failures += not ok
+        print(f"{backend:<11}{cos.min():>10.5f}{cos.mean():>10.5f}{dscore.max():>14.5f}{dscore.mean():>15.5f}  "
+              f"{'ok' if ok else f'FAIL (need cos >= {min_cos}, |dscore| <= {max_dscore})'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
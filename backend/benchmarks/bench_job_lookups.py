@@ -0,0 +1,144 @@
+"""
+Scaling benchmark for resume/job lookups before and after migrate_lookup_indexes.py (1M job rows by default).
+Run from repo root: python backend/benchmarks/bench_job_lookups.py [--jobs 1000000] [--resumes 100000] [--url ...]
+Without --url it uses a fresh SQLite file in a temp dir. Do not point --url at a database you care
+about: the tables are created there and filled with synthetic rows. No model needed. The tables are
+filled without the lookup indexes, the lookups are timed, the indexes are added with the migration's
+add_indexes, and the lookups are timed again. "all jobs" is the previous /score_resume path: load
+every job of the resume and pick one in Python.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+CHUNK = 50_000
+_LOOKUP_INDEXES = ("ix_resume_info_name", "ix_job_info_resume_id_id", "ix_job_info_name_id", "ix_job_info_jd_hash")
+
+
+def fill(engine, n_resumes, n_jobs, seed=0):
+    """Insert synthetic resumes and jobs (random resume per job, so a resume's jobs are spread over the table)."""
+    from sqlalchemy import insert
+
+    from backend.app.models import Job, Resume
+    from backend.app.scoring_logic import content_hash
+
+    rng = random.Random(seed)
+    jd_texts = [f"Job description {i}: python, sql, kubernetes, aws." for i in range(5000)]
+    jd_hashes = [content_hash(t) for t in jd_texts]
+    t0 = time.perf_counter()
+    with engine.begin() as conn:
+        for start in range(0, n_resumes, CHUNK):
+            conn.execute(insert(Resume), [
+                {"id": i + 1, "name": f"Candidate {i}", "skills": "python, sql", "score": 0.5}
+                for i in range(start, min(start + CHUNK, n_resumes))
+            ])
+        for start in range(0, n_jobs, CHUNK):
+            rows = []
+            for i in range(start, min(start + CHUNK, n_jobs)):
+                jd = rng.randrange(len(jd_texts))
+                rows.append({
+                    "id": i + 1, "resume_id": rng.randint(1, n_resumes), "name": None,
+                    "job_description": jd_texts[jd], "jd_hash": jd_hashes[jd], "score": 0.5,
+                })
+            conn.execute(insert(Job), rows)
+            print(f"  {start + len(rows):,} jobs", end="\r", flush=True)
+    print(f"\nInserted {n_resumes:,} resumes and {n_jobs:,} jobs in {time.perf_counter() - t0:.1f}s")
+
+
+def timed(fn, args_list):
+    times = []
+    for args in args_list:
+        t0 = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - t0)
+    return np.asarray(times) * 1000
+
+
+def run_lookups(samples):
+    from backend.app.insert_resume_data import (
+        get_job_for_resume,
+        get_jobs_by_resume_id,
+        get_latest_job,
+        get_resume_by_name,
+    )
+
+    def all_jobs_latest(resume_id):
+        jobs = get_jobs_by_resume_id(resume_id)
+        return jobs[-1] if jobs else None
+
+    def all_jobs_by_id(resume_id, job_id):
+        return next((j for j in get_jobs_by_resume_id(resume_id) if j.id == job_id), None)
+
+    return {
+        "resume by name": timed(get_resume_by_name, [(name,) for name, _, _ in samples]),
+        "latest job (all jobs)": timed(all_jobs_latest, [(rid,) for _, rid, _ in samples]),
+        "latest job (LIMIT 1)": timed(get_latest_job, [(rid,) for _, rid, _ in samples]),
+        "job by id (all jobs)": timed(all_jobs_by_id, [(rid, jid) for _, rid, jid in samples]),
+        "job by id (targeted)": timed(get_job_for_resume, [(rid, jid) for _, rid, jid in samples]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=None, help="SQLAlchemy URL (default: temp SQLite file)")
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=50, help="Lookups of each kind per phase")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = args.url or f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    from sqlalchemy import text
+
+    from backend.app.database import engine
+    from backend.app.models import Base
+    from backend.migrate_lookup_indexes import add_indexes
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for name in _LOOKUP_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}")
+    fill(engine, args.resumes, args.jobs)
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM ANALYZE resume_info"))
+            conn.execute(text("VACUUM ANALYZE job_info"))
+
+    rng = random.Random(1)
+    with engine.connect() as conn:
+        picked = rng.sample(range(1, args.jobs + 1), args.queries)
+        samples = [
+            (f"Candidate {rid - 1}", rid, jid)
+            for jid, rid in conn.execute(
+                text(f"SELECT id, resume_id FROM job_info WHERE id IN ({','.join(map(str, picked))})")
+            ).all()
+        ]
+
+    before = run_lookups(samples)
+    print()
+    add_indexes()
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+    after = run_lookups(samples)
+
+    print(f"\n{len(samples)} lookups each, {args.jobs:,} jobs / {args.resumes:,} resumes (ms)")
+    print(f"{'lookup':<24}{'p50 before':>12}{'p95 before':>12}{'p50 after':>12}{'p95 after':>12}")
+    for label in before:
+        b, a = before[label], after[label]
+        print(f"{label:<24}{np.percentile(b, 50):>12.2f}{np.percentile(b, 95):>12.2f}"
+              f"{np.percentile(a, 50):>12.3f}{np.percentile(a, 95):>12.3f}")
+    engine.dispose()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
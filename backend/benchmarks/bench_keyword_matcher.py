@@ -0,0 +1,67 @@
+"""
+Throughput benchmark for the token-boundary keyword matcher (set and counts) vs raw Aho-Corasick.
+Run from repo root: python backend/benchmarks/bench_keyword_matcher.py [--kb 500] [--repeat 5]
+No DB or model needed. The correctness cases are in backend/tests/test_keyword_matcher.py.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.keyword_automaton import count_keywords, find_keywords, load_keyword_automaton
+
+_FILLER = (
+    "designed built led scalable services across teams reduced latency improved reliability "
+    "organized recruiting creative customer research program manager directory operations "
+    "python react kubernetes postgresql aws docker c++ c# go rust java typescript next.js"
+).split()
+
+
+def legacy_keywords(automaton, lower):
+    """The previous matcher: every raw substring hit counts."""
+    return set(kw for _, (_, kw) in automaton.iter(lower))
+
+
+def bench(fn, automaton, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(automaton, text)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--kb", type=int, default=500, help="Input size (MAX_PARSED_RESUME_LENGTH is ~500 KB)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    automaton, _ = load_keyword_automaton()
+
+    rng = random.Random(0)
+    words, size = [], 0
+    while size < args.kb * 1000:
+        w = rng.choice(_FILLER)
+        words.append(w)
+        size += len(w) + 1
+    text = " ".join(words).lower()
+    raw_hits = sum(1 for _ in automaton.iter(text))
+
+    legacy_s, legacy_kw = bench(legacy_keywords, automaton, text, args.repeat)
+    new_s, new_kw = bench(find_keywords, automaton, text, args.repeat)
+    count_s, _ = bench(count_keywords, automaton, text, args.repeat)
+    mb = len(text) / 1e6
+    print(f"\n{len(text) / 1000:.0f} KB input, {raw_hits:,} raw automaton hits")
+    print(f"{'matcher':<12}{'ms':>10}{'MB/s':>10}{'keywords':>10}")
+    print(f"{'legacy':<12}{legacy_s * 1000:>10.1f}{mb / legacy_s:>10.1f}{len(legacy_kw):>10}")
+    print(f"{'boundary':<12}{new_s * 1000:>10.1f}{mb / new_s:>10.1f}{len(new_kw):>10}")
+    print(f"{'counts':<12}{count_s * 1000:>10.1f}{mb / count_s:>10.1f}{len(new_kw):>10}")
+    print(f"dropped as non-token matches: {sorted(legacy_kw - new_kw)}")
+
+
+if __name__ == "__main__":
+    main()
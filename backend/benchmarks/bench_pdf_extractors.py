@@ -0,0 +1,72 @@
+"""
+Throughput / agreement benchmark for the PDF extractor backends (pdfium, pdfminer, pdfplumber).
+Run from repo root: python backend/benchmarks/bench_pdf_extractors.py --corpus path/to/pdfs [--repeat 3]
+Reports docs/s per backend, how often each looks garbled, and how often its section split (name + the
+six resume sections) matches pdfminer's, the original extractor.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.pdf_extractors import EXTRACTORS, looks_garbled
+from backend.app.resume_parser import parse_resume_text
+
+
+def _section_keys(parsed):
+    """Which sections were found, plus a whitespace-insensitive fingerprint of each."""
+    if not parsed:
+        return None
+    return {k: " ".join(v.split()) if isinstance(v, str) else v for k, v in parsed.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", required=True, help="Directory of PDFs (searched recursively)")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.corpus, "**", "*.pdf"), recursive=True))
+    if not paths:
+        sys.exit(f"No PDFs under {args.corpus}")
+    docs = [open(p, "rb").read() for p in paths]
+    print(f"{len(docs)} PDFs, {sum(map(len, docs)) / 1e6:.1f} MB\n")
+
+    results = {}
+    for name, extract in EXTRACTORS.items():
+        texts, errors = [], 0
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            texts = []
+            for data in docs:
+                try:
+                    texts.append("\n".join(extract(data)))
+                except Exception:
+                    errors += 1
+                    texts.append("")
+        elapsed = (time.perf_counter() - t0) / args.repeat
+        results[name] = (texts, elapsed, errors // args.repeat)
+
+    reference = [_section_keys(parse_resume_text(t)) for t in results["pdfminer"][0]]
+    print(f"{'backend':<12}{'docs/s':>10}{'ms/doc':>10}{'errors':>8}{'garbled':>9}{'same split':>12}{'same keys':>11}")
+    for name, (texts, elapsed, errors) in results.items():
+        parsed = [_section_keys(parse_resume_text(t)) for t in texts]
+        garbled = sum(looks_garbled(t) for t in texts)
+        same = sum(p == r for p, r in zip(parsed, reference))
+        same_keys = sum(
+            (p is None and r is None)
+            or (p is not None and r is not None and {k for k, v in p.items() if v} == {k for k, v in r.items() if v})
+            for p, r in zip(parsed, reference)
+        )
+        n = len(docs)
+        print(
+            f"{name:<12}{n / elapsed:>10.1f}{1000 * elapsed / n:>10.1f}{errors:>8}{garbled:>9}"
+            f"{same / n:>12.1%}{same_keys / n:>11.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+query.py on PostgreSQL: per-call psycopg2.connect vs the shared pool, and a full-table pass with
+fetchall vs the streaming (named) cursor.
+Run from repo root: python backend/benchmarks/bench_query_pool.py [--resumes 200000] [--lookups 500]
+Reads the connection from DB_NAME / DB_USER / DB_PASSWORD / DB_HOST / DB_PORT (like query.py; the
+tables are filled through database.py, so a DATABASE_URL must name the same database). Do not point
+it at a database you care about: the tables are created there and filled with synthetic rows.
+No model needed. Memory is the Python heap peak (tracemalloc) while walking every resume row.
+Exits non-zero if the pooled lookups do not return the same rows as the previous code, or if more
+threads than QUERY_POOL_MAX_CONN querying at once get an error instead of waiting their turn.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+CHUNK = 50_000
+_SECTION = "Built data pipelines in python and sql; deployed services on aws with docker and kubernetes. " * 4
+
+
+def fill(engine, n_resumes, versions):
+    """Insert n_resumes names, each `versions` times (so "latest by name" has rows to choose from)."""
+    from sqlalchemy import insert, text
+
+    from backend.app.models import Job, Resume
+
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE job_info, resume_info RESTART IDENTITY CASCADE"))
+        for start in range(0, n_resumes * versions, CHUNK):
+            rows = [
+                {"name": f"Candidate {i % n_resumes}", "education": "B.S. Computer Science", "experience": _SECTION,
+                 "projects": _SECTION, "skills": "python, sql, aws, docker", "score": 0.5}
+                for i in range(start, min(start + CHUNK, n_resumes * versions))
+            ]
+            conn.execute(insert(Resume), rows)
+        conn.execute(insert(Job), [
+            {"resume_id": i % n_resumes + 1, "name": f"Candidate {i % n_resumes}",
+             "job_description": f"Job {i}: python, sql", "score": 0.5}
+            for i in range(n_resumes * versions)
+        ])
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE resume_info"))
+        conn.execute(text("VACUUM ANALYZE job_info"))
+
+
+def _connect():
+    import psycopg2
+
+    return psycopg2.connect(
+        dbname=os.getenv("DB_NAME"), user=os.getenv("DB_USER"), password=os.getenv("DB_PASSWORD"),
+        host=os.getenv("DB_HOST"), port=os.getenv("DB_PORT"),
+    )
+
+
+def legacy_query(table, name):
+    """The previous query_resume / query_job_description: new connection, every row for the name, max id in Python."""
+    conn = _connect()
+    try:
+        cur = conn.cursor()
+        cur.execute(f"SELECT * FROM {table} WHERE name = %s;", (name,))
+        rows = cur.fetchall()
+        if not rows:
+            raise IndexError(name)
+        return max(rows, key=lambda r: r[0])
+    finally:
+        conn.close()
+
+
+def timed(fn, names):
+    times, rows = [], []
+    for name in names:
+        t0 = time.perf_counter()
+        rows.append(fn(name))
+        times.append(time.perf_counter() - t0)
+    return np.asarray(times) * 1000, rows
+
+
+def full_pass(batches):
+    """Walk every row; return (rows seen, tracemalloc peak MB, seconds)."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    seen = 0
+    for rows in batches():
+        seen += len(rows)
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return seen, peak, elapsed
+
+
+def fetchall_resumes():
+    conn = _connect()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT * FROM resume_info ORDER BY id;")
+        yield cur.fetchall()
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resumes", type=int, default=200_000, help="Distinct names")
+    parser.add_argument("--versions", type=int, default=3, help="Rows per name")
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    if not os.getenv("DB_NAME") or not os.getenv("DB_HOST"):
+        parser.error("set DB_NAME / DB_USER / DB_PASSWORD / DB_HOST / DB_PORT to a scratch PostgreSQL database")
+    from backend.app import query
+    from backend.app.database import engine
+    from backend.app.models import Base
+
+    Base.metadata.create_all(bind=engine)
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}")
+    t0 = time.perf_counter()
+    fill(engine, args.resumes, args.versions)
+    print(f"Inserted {args.resumes * args.versions:,} resumes and jobs in {time.perf_counter() - t0:.1f}s")
+
+    rng = random.Random(0)
+    names = [f"Candidate {rng.randrange(args.resumes)}" for _ in range(args.lookups)] + ["Nobody"]
+    failures = 0
+    print(f"\n{args.lookups} lookups by name (ms)")
+    print(f"{'lookup':<40}{'p50':>9}{'p95':>9}")
+    query.query_resume(names[0])  # open the pool
+    for table, new in (("resume_info", query.query_resume), ("job_info", query.query_job_description)):
+        for label, fn in (("connect per call", lambda n, t=table: legacy_query(t, n)), ("pool + ORDER BY id DESC", new)):
+            times, rows = timed(fn, names[:-1])
+            print(f"{table + ', ' + label:<40}{np.percentile(times, 50):>9.2f}{np.percentile(times, 95):>9.2f}")
+            if label == "connect per call":
+                expected = rows
+            elif rows != expected:
+                print(f"FAIL: {table} rows differ from the previous query")
+                failures += 1
+        try:
+            new(names[-1])
+            print(f"FAIL: {table} lookup of a missing name did not raise IndexError")
+            failures += 1
+        except IndexError:
+            pass
+
+    print("\nFull pass over resume_info")
+    print(f"{'method':<26}{'rows':>10}{'peak MB':>10}{'seconds':>10}")
+    for label, batches in (
+        ("fetchall", fetchall_resumes),
+        (f"stream (batch {args.batch_size})", lambda: query.stream_resumes(args.batch_size)),
+    ):
+        seen, peak, elapsed = full_pass(batches)
+        print(f"{label:<26}{seen:>10,}{peak:>10.1f}{elapsed:>10.2f}")
+        if seen != args.resumes * args.versions:
+            print(f"FAIL: {label} saw {seen} rows")
+            failures += 1
+
+    # Stop early: the named cursor is closed and the connection goes back to the pool
+    stream = query.stream_jobs(args.batch_size, resume_id=1)
+    first = next(stream)
+    stream.close()
+    if [row[1] for row in first] != [1] * args.versions:
+        print("FAIL: stream_jobs(resume_id=1) returned other resumes' jobs")
+        failures += 1
+    if len(query._get_pool()._used):
+        print("FAIL: a pooled connection was not returned")
+        failures += 1
+
+    # More concurrent callers than pooled connections, each holding one for 20 ms: the extra ones wait
+    # instead of raising PoolError
+    threads = query.QUERY_POOL_MAX_CONN * 4
+    t0 = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(threads) as ex:
+            rows = list(ex.map(lambda i: query._fetch_one("SELECT pg_sleep(0.02), %s;", (i,)), range(threads * 5)))
+        print(f"\n{len(rows)} 20 ms queries from {threads} threads over {query.QUERY_POOL_MAX_CONN} connections: "
+              f"{time.perf_counter() - t0:.2f}s")
+    except Exception as e:
+        print(f"FAIL: concurrent queries raised {e!r}")
+        failures += 1
+
+    query.close_pool()
+    engine.dispose()
+    if failures:
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
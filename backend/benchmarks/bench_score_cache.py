@@ -0,0 +1,166 @@
+"""
+Repeat /score_resume views: score_resume every time vs the score cache (in-memory LRU and DB table).
+Run from repo root: python backend/benchmarks/bench_score_cache.py [--url postgresql+psycopg2://...] [--resumes 100]
+Without --url it uses a fresh SQLite file in a temp dir. Do not point --url at a database you care
+about: the tables are created there and filled with synthetic resumes and jobs. Loads the embedding
+model (uploads store embeddings, so views reuse them like the endpoint does). Each view loads the
+resume and its latest job, then scores; the timings are the scoring step, next to the load. Exits
+non-zero if a cached result differs from a fresh score_resume (also after new job descriptions move
+the keyword IDF), or if changing a resume's text through get_or_create_resume leaves its results cached.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+_SKILLS = ["python, sql, docker", "java, spring, kubernetes", "react, typescript, aws", "go, postgresql, terraform"]
+_JDS = [
+    "Backend engineer: python, postgresql, docker, kubernetes, aws. 3+ years building APIs. " * 30,
+    "Frontend engineer with react, typescript and testing experience; aws a plus. " * 30,
+    "Data engineer: sql, python, airflow, spark, terraform on aws. " * 30,
+]
+
+
+def synthetic_resume(n, revision=0):
+    return {
+        "name": f"Bench Candidate {n}",
+        "education": f"B.S. Computer Science, University {n % 7}",
+        "experience": f"Software engineer, company {n}. Built services in {_SKILLS[n % 4]}. Revision {revision}. " * 40,
+        "projects": f"Project {n}: a web app using {_SKILLS[(n + 1) % 4]}",
+        "skills": _SKILLS[n % 4],
+        "objective": None,
+        "certifications": "AWS Certified Developer" if n % 3 == 0 else None,
+    }
+
+
+def load_view(name):
+    """What /score_resume reads before scoring: the resume by name and its latest job."""
+    from backend.app.insert_resume_data import get_latest_job, get_resume_by_name
+
+    resume = get_resume_by_name(name)
+    return resume, get_latest_job(resume.id)
+
+
+def timed(score, names):
+    """(scoring ms, load ms) per view."""
+    score_times, load_times = [], []
+    with contextlib.redirect_stdout(io.StringIO()):  # score_resume logs every call
+        for name in names:
+            t0 = time.perf_counter()
+            resume, job = load_view(name)
+            t1 = time.perf_counter()
+            score(job.job_description, resume, job)
+            score_times.append(time.perf_counter() - t1)
+            load_times.append(t1 - t0)
+    return np.asarray(score_times) * 1000, np.asarray(load_times) * 1000
+
+
+def score_resume_cold(job_description, resume, job):
+    """score_resume as in a worker that has not scanned these texts yet (keyword cache empty)."""
+    from backend.app import scoring_logic
+
+    scoring_logic._keyword_cache.clear()
+    return scoring_logic.score_resume(job_description, resume, job)
+
+
+def same(a, b):
+    return json.dumps(a, sort_keys=True) == json.dumps(b, sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=None, help="SQLAlchemy URL (default: temp SQLite file)")
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--views", type=int, default=500)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = args.url or f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    from backend.app import score_cache
+    from backend.app.database import SessionLocal, engine
+    from backend.app.insert_resume_data import get_or_create_resume, save_upload
+    from backend.app.models import Base, ScoreResult
+    from backend.app.scoring_logic import score_resume, warm_up
+
+    Base.metadata.create_all(bind=engine)
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}")
+    warm_up()
+    for n in range(args.resumes):
+        save_upload(synthetic_resume(n), _JDS[n % len(_JDS)], 0.0)
+
+    rng = random.Random(0)
+    names = [f"Bench Candidate {rng.randrange(args.resumes)}" for _ in range(args.views)]
+    timed(score_resume, names[:1])  # first-use costs (IDF table) out of the timings
+    results = {
+        "score_resume": timed(score_resume, names),
+        "score_resume, cold": timed(score_resume_cold, names),
+        "cache: first view": timed(score_cache.cached_score, [f"Bench Candidate {n}" for n in range(args.resumes)]),
+        "cache: repeat, LRU": timed(score_cache.cached_score, names),
+    }
+    score_cache._lru.clear()  # as in a fresh worker: every view is one primary-key lookup
+    results["cache: repeat, DB"] = timed(score_cache.cached_score, names)
+
+    print(f"\n{args.views} views over {args.resumes} resumes (ms per view)")
+    print(f"{'path':<22}{'score p50':>11}{'score p95':>11}{'score mean':>12}{'load p50':>10}")
+    for label, (times, load) in results.items():
+        print(f"{label:<22}{np.percentile(times, 50):>11.3f}{np.percentile(times, 95):>11.3f}{times.mean():>12.3f}"
+              f"{np.percentile(load, 50):>10.3f}")
+    print(f"score_cache: {score_cache.stats()}")
+
+    failures = 0
+    for name in sorted(set(names))[:20]:
+        resume, job = load_view(name)
+        if not same(score_cache.cached_score(job.job_description, resume, job), score_resume(job.job_description, resume, job)):
+            print(f"FAIL: cached result for {name} differs from score_resume")
+            failures += 1
+
+    # Changing the resume text must drop its stored results and score the new text
+    resume, job = load_view("Bench Candidate 0")
+    before = score_cache.cached_score(job.job_description, resume, job)
+    get_or_create_resume({**synthetic_resume(0, revision=1), "skills": "cobol, fortran"})
+    db = SessionLocal()
+    try:
+        left = db.query(ScoreResult).filter(ScoreResult.resume_id == resume.id).count()
+    finally:
+        db.close()
+    if left:
+        print(f"FAIL: {left} cached results left for the changed resume")
+        failures += 1
+    resume, job = load_view("Bench Candidate 0")
+    after = score_cache.cached_score(job.job_description, resume, job)
+    if not same(after, score_resume(job.job_description, resume, job)) or same(after, before):
+        print("FAIL: changed resume was served its old result")
+        failures += 1
+
+    # New job descriptions move the IDF of shared keywords; cached scores must follow
+    for i in range(args.resumes):
+        save_upload(synthetic_resume(args.resumes + i), f"Platform role {i}: python, aws, docker, kubernetes.", 0.0)
+    drift = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in sorted(set(names))[:50]:
+            resume, job = load_view(name)
+            cached = score_cache.cached_score(job.job_description, resume, job)["score"]
+            drift.append(abs(cached - score_resume(job.job_description, resume, job)["score"]))
+    print(f"After {args.resumes} new JDs: max |cached - fresh| score {max(drift):.5f}")
+    if max(drift) > 0.001:
+        print("FAIL: cached scores did not follow the IDF table")
+        failures += 1
+
+    engine.dispose()
+    tmp.cleanup()
+    if failures:
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Microbenchmark: single-pass SectionSegmenter vs the previous lowercase + re.split section splitter.
+Run from repo root: python backend/benchmarks/bench_section_segmenter.py [--sizes 10,100,1000,5000] [--repeat 5]
+Sizes are in KB of synthetic resume text; no PDFs, DB or model needed.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.resume_parser import HEADING_SYNONYMS, SectionSegmenter, segment_resume_text
+
+_WORDS = (
+    "designed built led python react kubernetes postgres api latency team shipped reduced improved "
+    "customers pipeline data analysis platform migration services reliability on-call mentoring"
+).split()
+
+
+def legacy_split(raw):
+    """The splitter this replaces: regex rebuilt per call, whole document lowercased, last chunk wins."""
+    reader = str(raw).lower()
+    deliminators = ["education", "experience", "projects", "skills", "objective", "certifications"]
+    re_pattern = re.compile(r"(" + "|".join(re.escape(d) for d in deliminators) + r")", re.IGNORECASE)
+    sections, key = {}, None
+    for part in re_pattern.split(reader):
+        if not part.strip():
+            continue
+        if part.lower() in deliminators:
+            key = part.lower()
+            sections[key] = ""
+        elif key:
+            sections[key] = part.strip()
+    return sections
+
+
+def synthetic_resume(n_bytes, seed=0):
+    """Name line, then headings (with synonyms, repeats) each followed by lines of filler text."""
+    rng = random.Random(seed)
+    headings = [p.title() for phrases in HEADING_SYNONYMS.values() for p in phrases[:3]]
+    lines, size = ["Jane Q. Candidate", "jane@example.com"], 0
+    while size < n_bytes:
+        lines.append(rng.choice(headings) + (":" if rng.random() < 0.3 else ""))
+        for _ in range(rng.randint(3, 12)):
+            line = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 16)))
+            lines.append(line)
+            size += len(line) + 1
+    return "\n".join(lines)
+
+
+def bench(fn, arg, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def streamed(text, page_chars=3000):
+    segmenter = SectionSegmenter()
+    for i in range(0, len(text), page_chars):
+        segmenter.feed(text[i:i + page_chars])
+    return segmenter.finish()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10,100,1000,5000", help="Comma-separated sizes in KB")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'size KB':>8}{'legacy ms':>12}{'segment ms':>12}{'streamed ms':>13}{'to_dict ms':>12}{'MB/s':>8}")
+    for kb in (int(s) for s in args.sizes.split(",")):
+        text = synthetic_resume(kb * 1024)
+        legacy = bench(legacy_split, text, args.repeat)
+        segment = bench(segment_resume_text, text, args.repeat)
+        stream = bench(streamed, text, args.repeat)
+        seg = segment_resume_text(text)
+        to_dict = bench(lambda s: s.to_resume_dict(), seg, args.repeat)
+        print(
+            f"{kb:>8}{legacy * 1000:>12.2f}{segment * 1000:>12.2f}{stream * 1000:>13.2f}"
+            f"{to_dict * 1000:>12.2f}{len(text) / segment / 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Startup budget: import-time report for the app modules + time until uvicorn answers /health.
+Run from repo root: python backend/benchmarks/bench_startup.py [--budget-ms 1000] [--top 15] [--no-serve]
+Each module is imported in a fresh `python -X importtime` process; the report lists the slowest
+imports and fails if a heavy dependency (torch, sentence_transformers, pdfminer, ahocorasick, ...)
+is imported at startup or the import takes longer than the budget (the same checks as
+backend/tests/test_startup_imports.py). Then uvicorn is started on a free port and
+polled until /health returns 200. Exits non-zero if any check fails.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, REPO_ROOT)
+
+from backend.tests.test_startup_imports import HEAVY_MODULES, MODULES
+
+
+def import_times(module):
+    """(name, self_us, cumulative_us, depth) per import of module, parsed from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def check_imports(module, budget_ms, top):
+    rows = import_times(module)
+    total_ms = sum(cum for _, _, cum, depth in rows if depth == 0) / 1000
+    imported = {name for name, _, _, _ in rows}
+    heavy = sorted(h for h in HEAVY_MODULES if h in imported)
+    print(f"\n{module}: {total_ms:.0f} ms, {len(rows)} modules")
+    print(f"  {'cumulative ms':>13}{'self ms':>9}  module")
+    for name, self_us, cum_us, depth in sorted(rows, key=lambda r: -r[2])[:top]:
+        print(f"  {cum_us / 1000:>13.1f}{self_us / 1000:>9.1f}  {'  ' * depth}{name}")
+    ok = True
+    if heavy:
+        print(f"  FAIL: imports {', '.join(heavy)} at startup")
+        ok = False
+    if total_ms > budget_ms:
+        print(f"  FAIL: {total_ms:.0f} ms over the {budget_ms} ms budget")
+        ok = False
+    return ok
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def check_serve(budget_ms, timeout_s=30):
+    """Start uvicorn and poll /health; returns whether it answered within budget_ms."""
+    port = _free_port()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - t0 < timeout_s:
+            if proc.poll() is not None:
+                print("\nuvicorn exited before answering /health")
+                return False
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as resp:
+                    if resp.status == 200:
+                        break
+            except OSError:
+                time.sleep(0.02)
+        else:
+            print(f"\n/health did not answer within {timeout_s}s")
+            return False
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+    finally:
+        proc.terminate()
+        proc.wait()
+    ok = elapsed_ms <= budget_ms
+    print(f"\nuvicorn start -> /health 200: {elapsed_ms:.0f} ms ({'ok' if ok else f'FAIL, budget {budget_ms} ms'})")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=int, default=1000, help="Per-module import budget and /health budget")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list per module")
+    parser.add_argument("--no-serve", action="store_true", help="Skip the uvicorn /health check")
+    args = parser.parse_args()
+
+    ok = all([check_imports(module, args.budget_ms, args.top) for module in MODULES])
+    if not args.no_serve:
+        ok = check_serve(args.budget_ms) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
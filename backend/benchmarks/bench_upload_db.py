@@ -0,0 +1,138 @@
+"""
+DB round trips + latency per /upload: the single-transaction save_upload vs the previous per-step sessions.
+Run from repo root: python backend/benchmarks/bench_upload_db.py [--url postgresql+psycopg2://...] [--uploads 200]
+Without --url it uses a fresh SQLite file in a temp dir. Do not point --url at a database you care
+about: the tables are created there and filled with synthetic resumes and jobs. Loads the embedding
+model; every text is embedded once before timing, so the timings are DB work plus scoring from cache.
+Counts per upload: SQL statements, commits, pool checkouts (each costs a pre-ping round trip).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+_SKILLS = ["python, sql, docker", "java, spring, kubernetes", "react, typescript, aws", "go, postgresql, terraform"]
+_JDS = [
+    "Backend engineer: python, postgresql, docker, kubernetes, aws. 3+ years building APIs.",
+    "Frontend engineer with react, typescript and testing experience; aws a plus.",
+    "Data engineer: sql, python, airflow, spark, terraform on aws.",
+]
+
+
+def synthetic_upload(i, n_names):
+    """Resume data for upload i; names repeat and alternate between two versions, so updates happen too."""
+    n = i % n_names
+    version = (i // n_names) % 2
+    resume = {
+        "name": f"Bench Candidate {n}",
+        "education": f"B.S. Computer Science, University {n % 7}",
+        "experience": f"Software engineer, company {n}. Built services in {_SKILLS[n % 4]}. Revision {version}.",
+        "projects": f"Project {n}: a web app using {_SKILLS[(n + 1) % 4]}",
+        "skills": _SKILLS[n % 4],
+        "objective": None,
+        "certifications": None,
+    }
+    return resume, _JDS[i % len(_JDS)]
+
+
+class RoundTrips:
+    """Statement / commit / checkout counters on an engine."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.statements = self.commits = self.checkouts = 0
+        event.listen(engine, "before_cursor_execute", self._on_statement)
+        event.listen(engine, "commit", self._on_commit)
+        event.listen(engine.pool, "checkout", self._on_checkout)
+
+    def _on_statement(self, *_):
+        self.statements += 1
+
+    def _on_commit(self, *_):
+        self.commits += 1
+
+    def _on_checkout(self, *_):
+        self.checkouts += 1
+
+    def snapshot(self):
+        return self.statements, self.commits, self.checkouts
+
+
+def legacy_upload(resume_data, description):
+    """The previous /upload flow: four sessions, each with its own commit and refresh."""
+    from backend.app.insert_resume_data import get_or_create_resume, insert_job, update_job_score, update_score
+    from backend.app.scoring_logic import score_resume
+
+    resume, _ = get_or_create_resume(resume_data)
+    job = insert_job(resume.id, resume_data["name"], description)
+    insights = score_resume(description, resume, job)
+    update_job_score(job.id, insights["score"])
+    update_score(resume.id, insights["score"])
+    return insights
+
+
+def unit_of_work_upload(resume_data, description):
+    """The current /upload flow: embed + score, then save_upload in one transaction."""
+    from backend.app.insert_resume_data import save_upload, upload_embeddings
+    from backend.app.models import Job, Resume
+    from backend.app.scoring_logic import score_resume
+
+    resume_fields, jd_fields = upload_embeddings(resume_data, description)
+    insights = score_resume(
+        description, Resume(**resume_data, **resume_fields), Job(job_description=description, **jd_fields)
+    )
+    save_upload(resume_data, description, insights["score"], resume_fields, jd_fields)
+    return insights
+
+
+def run(flow, uploads, n_names, counter):
+    times, before = [], counter.snapshot()
+    for i in range(uploads):
+        resume_data, description = synthetic_upload(i, n_names)
+        t0 = time.perf_counter()
+        flow(resume_data, description)
+        times.append(time.perf_counter() - t0)
+    after = counter.snapshot()
+    per_upload = [(a - b) / uploads for a, b in zip(after, before)]
+    return np.asarray(times) * 1000, per_upload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=None, help="SQLAlchemy URL (default: temp SQLite file)")
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--names", type=int, default=50, help="Distinct resume names")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["DATABASE_URL"] = args.url or f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    from backend.app.database import engine
+    from backend.app.models import Base
+    from backend.app.scoring_logic import warm_up
+
+    Base.metadata.create_all(bind=engine)
+    print(f"DB: {engine.url.render_as_string(hide_password=True)}")
+    warm_up()
+    # Embed every distinct text once so both flows score from the embedding cache
+    for i in range(2 * args.names):
+        unit_of_work_upload(*synthetic_upload(i, args.names))
+    counter = RoundTrips(engine)
+
+    print(f"\n{args.uploads} uploads, {args.names} distinct resumes")
+    print(f"{'flow':<16}{'p50 ms':>9}{'p95 ms':>9}{'mean ms':>9}{'statements':>12}{'commits':>9}{'checkouts':>11}")
+    for label, flow in (("per-step", legacy_upload), ("unit of work", unit_of_work_upload)):
+        times, (statements, commits, checkouts) = run(flow, args.uploads, args.names, counter)
+        print(f"{label:<16}{np.percentile(times, 50):>9.2f}{np.percentile(times, 95):>9.2f}{times.mean():>9.2f}"
+              f"{statements:>12.1f}{commits:>9.1f}{checkouts:>11.1f}")
+    engine.dispose()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
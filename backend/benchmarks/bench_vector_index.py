@@ -0,0 +1,87 @@
+"""
+Recall / latency benchmark: IVF vector index vs the exact flat index.
+Run from repo root: python backend/benchmarks/bench_vector_index.py [--n 100000] [--queries 200]
+Uses synthetic clustered unit vectors shaped like all-MiniLM-L6-v2 embeddings (dim 384); no DB or model needed.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+
+from backend.app.vector_index import FlatIndex, IVFIndex
+
+
+def _unit(x):
+    return (x / np.linalg.norm(x, axis=-1, keepdims=True)).astype(np.float32)
+
+
+def synthetic(n, dim, n_queries, seed=0):
+    """Vectors drawn around a few hundred topic centers, like resumes clustering by role."""
+    rng = np.random.default_rng(seed)
+    centers = _unit(rng.standard_normal((max(16, n // 500), dim)))
+    labels = rng.integers(0, centers.shape[0], size=n)
+    data = _unit(centers[labels] + 0.8 * rng.standard_normal((n, dim)) / np.sqrt(dim))
+    q_labels = rng.integers(0, centers.shape[0], size=n_queries)
+    queries = _unit(centers[q_labels] + 0.8 * rng.standard_normal((n_queries, dim)) / np.sqrt(dim))
+    return data, queries
+
+
+def timed_search(index, queries, k, **kwargs):
+    results, times = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        ids, _ = index.search(q, k, **kwargs)
+        times.append(time.perf_counter() - t0)
+        results.append(ids)
+    return results, np.array(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    data, queries = synthetic(args.n, args.dim, args.queries)
+    ids = np.arange(1, args.n + 1)
+
+    flat = FlatIndex()
+    t0 = time.perf_counter()
+    flat.add_many(ids, data)
+    print(f"flat build: {time.perf_counter() - t0:.2f}s")
+
+    ivf = IVFIndex()
+    t0 = time.perf_counter()
+    ivf.add_many(ids, data)
+    if ivf.centroids is None:
+        ivf.train()
+    print(f"ivf build (incl. k-means): {time.perf_counter() - t0:.2f}s, lists={ivf.centroids.shape[0]}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.npz")
+        t0 = time.perf_counter()
+        ivf.save(path)
+        saved = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        IVFIndex.from_file(path)
+        print(f"ivf save: {saved:.2f}s, load: {time.perf_counter() - t0:.2f}s")
+
+    exact, flat_ms = timed_search(flat, queries, args.k)
+    print(f"\n{'backend':<16}{'recall@' + str(args.k):>10}{'p50 ms':>10}{'p95 ms':>10}")
+    print(f"{'flat':<16}{1.0:>10.3f}{np.percentile(flat_ms, 50):>10.2f}{np.percentile(flat_ms, 95):>10.2f}")
+    for nprobe in (1, 4, 8, 16, 32, 64):
+        approx, ms = timed_search(ivf, queries, args.k, nprobe=nprobe)
+        recall = np.mean([len(set(a.tolist()) & set(e.tolist())) / len(e) for a, e in zip(approx, exact)])
+        label = f"ivf nprobe={nprobe}"
+        print(f"{label:<16}{recall:>10.3f}{np.percentile(ms, 50):>10.2f}{np.percentile(ms, 95):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
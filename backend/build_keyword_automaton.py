@@ -0,0 +1,44 @@
+"""
+Build the pickled keyword automaton cache (see backend/app/keyword_automaton.py).
+Run from repo root: python backend/build_keyword_automaton.py [--force] [--path FILE]
+Run it as a deploy/build step after editing keyword_list.py; the app also rebuilds a stale cache
+on startup, so this only moves that cost out of the first import.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dotenv import load_dotenv
+load_dotenv()
+
+from backend.app import keyword_automaton
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the cache is current")
+    parser.add_argument("--path", default=keyword_automaton.KEYWORD_AUTOMATON_PATH)
+    args = parser.parse_args()
+
+    source_hash = keyword_automaton.keyword_list_hash()
+    if not args.force and keyword_automaton._load_cached(args.path, source_hash) is not None:
+        print(f"{args.path} is current ({source_hash[:12]}).")
+        return
+
+    t0 = time.perf_counter()
+    automaton, categories = keyword_automaton.build()
+    built = time.perf_counter() - t0
+    keyword_automaton.save(args.path, automaton, categories, source_hash)
+    t0 = time.perf_counter()
+    keyword_automaton.load_keyword_automaton(args.path)
+    loaded = time.perf_counter() - t0
+    print(
+        f"Wrote {args.path}: {len(automaton)} keywords, {len(categories)} categorised "
+        f"(build {built * 1000:.1f} ms, load {loaded * 1000:.1f} ms)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Export the sentence embedder to ONNX (fp32 + dynamically quantized int8) for EMBEDDING_BACKEND=onnx / onnx-int8.
+Run from repo root: python backend/export_onnx_model.py [--model all-MiniLM-L6-v2] [--out backend/app/ml_model/onnx]
+Needs the torch stack (sentence-transformers, onnx, onnxruntime); the server running the ONNX
+backends does not. Re-run after changing the model. Check parity with
+backend/benchmarks/bench_embedding_backends.py.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Load .env from repo root when run as python backend/export_onnx_model.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dotenv import load_dotenv
+load_dotenv()
+
+from backend.app.ml_model.model import META_FILE, ONNX_FILES, ONNX_MODEL_DIR, TOKENIZER_FILE
+
+OPSET = 17
+
+
+def _mean_pooled(model) -> bool:
+    config = model[1].get_config_dict() if len(model) > 1 else {}
+    if "pooling_mode" in config:
+        return config["pooling_mode"] == "mean"
+    # sentence-transformers < 6: one boolean per mode
+    modes = [k for k, v in config.items() if k.startswith("pooling_mode_") and v is True]
+    return modes == ["pooling_mode_mean_tokens"]
+
+
+def export(model_name: str, out_dir: str) -> None:
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device="cpu")
+    model.eval()
+    if not _mean_pooled(model):
+        raise ValueError(f"{model_name} does not use mean pooling; the ONNX backend implements mean pooling only")
+
+    class _LastHiddenState(torch.nn.Module):
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.auto_model(
+                input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids
+            ).last_hidden_state
+
+    os.makedirs(out_dir, exist_ok=True)
+    sample = model.tokenizer(["an example sentence", "a second, longer example sentence"], padding=True, return_tensors="pt")
+    inputs = (sample["input_ids"], sample["attention_mask"], sample.get("token_type_ids", torch.zeros_like(sample["input_ids"])))
+    names = ["input_ids", "attention_mask", "token_type_ids"]
+    fp32_path = os.path.join(out_dir, ONNX_FILES["onnx"])
+    with torch.no_grad():
+        torch.onnx.export(
+            _LastHiddenState(model[0].auto_model),
+            inputs,
+            fp32_path,
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes={**{n: {0: "batch", 1: "sequence"} for n in names}, "last_hidden_state": {0: "batch", 1: "sequence"}},
+            opset_version=OPSET,
+            do_constant_folding=True,
+            dynamo=False,
+        )
+
+    model.tokenizer.save_pretrained(out_dir)
+    if not os.path.isfile(os.path.join(out_dir, TOKENIZER_FILE)):
+        raise RuntimeError(f"{model_name} has no fast tokenizer ({TOKENIZER_FILE}); the ONNX backend needs one")
+    meta = {
+        "model_name": model_name,
+        "max_seq_length": model.max_seq_length,
+        "dimension": model.get_sentence_embedding_dimension(),
+        "pad_token": model.tokenizer.pad_token,
+        "opset": OPSET,
+    }
+    with open(os.path.join(out_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+def quantize(out_dir: str) -> None:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(
+        os.path.join(out_dir, ONNX_FILES["onnx"]),
+        os.path.join(out_dir, ONNX_FILES["onnx-int8"]),
+        weight_type=QuantType.QInt8,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2", help="SentenceTransformer name or local path")
+    parser.add_argument("--out", default=ONNX_MODEL_DIR, help="Output directory (ONNX_MODEL_DIR)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    export(args.model, args.out)
+    t1 = time.perf_counter()
+    quantize(args.out)
+    t2 = time.perf_counter()
+    for backend, name in ONNX_FILES.items():
+        size = os.path.getsize(os.path.join(args.out, name)) / 1e6
+        print(f"{backend:<10} {os.path.join(args.out, name)} ({size:.1f} MB)")
+    print(f"Exported in {t1 - t0:.1f}s, quantized in {t2 - t1:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
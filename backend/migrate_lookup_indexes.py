@@ -0,0 +1,95 @@
+"""
+Add job_info.jd_hash (content hash of job_description), fill it for existing jobs, and add the lookup
+indexes: resume_info(name), job_info(resume_id, id), job_info(name, id) and job_info(jd_hash).
+Run from repo root: python backend/migrate_lookup_indexes.py [--batch-size 1000]
+Required once on existing databases (PostgreSQL or local.db) before deploying the code that reads
+jd_hash; new SQLite databases get it from create_all. Safe to run multiple times (skips existing
+columns, hashed rows and existing indexes). On PostgreSQL the indexes are built CONCURRENTLY, so
+the app keeps serving uploads while they build.
+"""
+import argparse
+import os
+import sys
+import time
+
+# Load .env from repo root when run as python backend/migrate_lookup_indexes.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import inspect, text
+
+from backend.app.database import engine
+from backend.app.scoring_logic import content_hash
+
+# (index name, table, columns); the names match the ones models.py declares for create_all
+INDEXES = [
+    ("ix_resume_info_name", "resume_info", "name"),
+    ("ix_job_info_resume_id_id", "job_info", "resume_id, id"),
+    ("ix_job_info_name_id", "job_info", "name, id"),
+    ("ix_job_info_jd_hash", "job_info", "jd_hash"),
+]
+
+
+def add_column():
+    existing = {c["name"] for c in inspect(engine).get_columns("job_info")}
+    if "jd_hash" in existing:
+        print("Column job_info.jd_hash already exists; skip.")
+        return
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE job_info ADD COLUMN jd_hash VARCHAR(64)"))
+    print("Added column job_info.jd_hash.")
+
+
+def backfill_hashes(batch_size: int):
+    done = 0
+    last_id = 0
+    t0 = time.perf_counter()
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT id, job_description FROM job_info WHERE jd_hash IS NULL AND id > :last_id "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": batch_size},
+            ).all()
+            if not rows:
+                break
+            conn.execute(
+                text("UPDATE job_info SET jd_hash = :h WHERE id = :id"),
+                [{"id": job_id, "h": content_hash(jd or "")} for job_id, jd in rows],
+            )
+        done += len(rows)
+        last_id = rows[-1][0]
+        print(f"  hashed {done} jobs", flush=True)
+    print(f"Filled jd_hash for {done} jobs in {time.perf_counter() - t0:.1f}s.")
+
+
+def add_indexes():
+    insp = inspect(engine)
+    concurrently = "CONCURRENTLY " if engine.dialect.name == "postgresql" else ""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, table, columns in INDEXES:
+            if name in {ix["name"] for ix in insp.get_indexes(table)}:
+                print(f"Index {name} already exists; skip.")
+                continue
+            t0 = time.perf_counter()
+            conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {table} ({columns})"))
+            print(f"Created index {name} on {table} ({columns}) in {time.perf_counter() - t0:.1f}s.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    add_column()
+    backfill_hashes(args.batch_size)
+    add_indexes()
+    print("Migration done.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import hashlib
+import os
+import re
+import sys
+import tempfile
+
+import numpy as np
+import pytest
+
+# Run from anywhere: `python -m pytest backend/tests` imports the app as backend.app, like the benchmarks
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# Tests never touch a real database or on-disk caches: database.py binds the app to a throwaway SQLite file
+_TMP = tempfile.mkdtemp(prefix="resume-scanner-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP, 'test.db')}"
+os.environ.pop("EMBEDDING_CACHE_PATH", None)
+os.environ.pop("VECTOR_INDEX_PATH", None)
+
+
+class StubEmbedder:
+    """
+    Stands in for the sentence embedder (no model download): hashed bag of words, so texts sharing
+    words get similar vectors. Exposes encode() and the tokenizer call ChunkedEncoder uses.
+    """
+
+    dimension = 64
+    _token_re = re.compile(r"\w+|[^\w\s]")
+
+    def tokenizer(self, text, return_offsets_mapping=False, **_):
+        offsets = [m.span() for m in self._token_re.finditer(text)]
+        out = {"input_ids": list(range(len(offsets)))}
+        if return_offsets_mapping:
+            out["offset_mapping"] = offsets
+        return out
+
+    def encode(self, texts, **_):
+        out = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            out[i, 0] = 0.1
+            for word in text.lower().split():
+                out[i, int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % self.dimension] += 1
+        return out
+
+
+@pytest.fixture
+def stub_model(monkeypatch):
+    """scoring_logic embeds with StubEmbedder for this test."""
+    from backend.app import scoring_logic
+    from backend.app.ml_model.embedding_cache import get_embedding_cache
+
+    monkeypatch.setattr(scoring_logic, "_model", StubEmbedder())
+    monkeypatch.setattr(scoring_logic, "_encoder", None)
+    get_embedding_cache().clear()
+    yield
+    get_embedding_cache().clear()
+
+
+@pytest.fixture
+def app_db():
+    """Empty app tables and no process-wide state left from other tests (score cache, IDF, ranking pools)."""
+    from backend.app import keyword_idf, ranking, score_cache
+    from backend.app.database import engine
+    from backend.app.models import Base
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    score_cache._lru.clear()
+    keyword_idf._idf_table = None
+    ranking._resume_pools.pool = None
+    ranking._job_pools.pool = None
+    yield engine
+    engine.dispose()
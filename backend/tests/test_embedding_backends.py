@@ -0,0 +1,66 @@
+"""
+Accuracy parity of the ONNX embedding backends with torch: per-text cosine of the embeddings and the
+pairwise cosine scores the semantic score is built from. Needs sentence-transformers and the export
+written by backend/export_onnx_model.py (ONNX_MODEL_DIR); skipped without them. Speed and memory are
+reported by backend/benchmarks/bench_embedding_backends.py.
+"""
+import os
+import random
+
+import numpy as np
+import pytest
+
+from backend.app.ml_model.model import ONNX_FILES, ONNX_MODEL_DIR
+
+# backend: (min per-text cosine vs torch, max |score - torch score|)
+TOLERANCE = {
+    "onnx": (0.9999, 1e-3),
+    "onnx-int8": (0.98, 0.03),
+}
+
+_WORDS = (
+    "designed built led scalable python services kubernetes postgres latency reliability team "
+    "migrated pipeline customers analytics react typescript aws docker terraform mentoring on-call "
+    "senior engineer experience skills education projects machine learning data warehouse"
+).split()
+
+
+def _texts(n=32, lengths=(8, 40, 120, 400, 1500)):
+    rng = random.Random(0)
+    return [" ".join(rng.choice(_WORDS) for _ in range(rng.choice(lengths))) for _ in range(n)]
+
+
+def _embed(backend):
+    from backend.app.ml_model.chunking import ChunkedEncoder
+    from backend.app.ml_model.model import load_embedder
+    from backend.app.scoring_logic import MODEL_NAME
+
+    return ChunkedEncoder(load_embedder(MODEL_NAME, backend)).encode(_texts())
+
+
+def _pair_scores(emb):
+    """Cosine of each text against every other one (the rows are unit vectors)."""
+    return (emb @ emb.T)[np.triu_indices(len(emb), k=1)]
+
+
+@pytest.fixture(scope="module")
+def reference():
+    pytest.importorskip("sentence_transformers")
+    return _embed("torch")
+
+
+def _exported(backend):
+    """Parametrize entry, skipped (before the torch reference loads) when the backend's export is missing."""
+    missing = not os.path.isfile(os.path.join(ONNX_MODEL_DIR, ONNX_FILES[backend]))
+    reason = f"no {ONNX_FILES[backend]} in {ONNX_MODEL_DIR}; run backend/export_onnx_model.py"
+    return pytest.param(backend, marks=pytest.mark.skipif(missing, reason=reason))
+
+
+@pytest.mark.parametrize("backend", [_exported(backend) for backend in sorted(TOLERANCE)])
+def test_backend_matches_torch(reference, backend):
+    pytest.importorskip("onnxruntime")
+    emb = _embed(backend)
+    min_cos, max_dscore = TOLERANCE[backend]
+    cos = np.sum(emb * reference, axis=1)
+    assert cos.min() >= min_cos
+    assert np.abs(_pair_scores(emb) - _pair_scores(reference)).max() <= max_dscore
@@ -0,0 +1,43 @@
+"""
+Token-boundary keyword matching (keyword_automaton.find_keywords / count_keywords). No DB or model needed;
+the throughput benchmark is backend/benchmarks/bench_keyword_matcher.py.
+"""
+import pytest
+
+from backend.app.keyword_automaton import count_keywords, find_keywords, load_keyword_automaton
+
+# (text, keywords that must be found, keywords that must not be found)
+CASES = [
+    ("Experienced in C++ and C# on .NET Core", {"c++", "c#", ".net core"}, {"c", "net"}),
+    ("Built the frontend with Next.js and Three.js.", {"next.js", "three.js"}, set()),
+    ("Languages: C, R, Go.", {"c", "r", "go"}, set()),
+    ("Creative problem solver; organized recruiting events", set(), {"c", "r", "go", "ar", "mr", "ci"}),
+    ("Objective-C and Swift for iOS", {"objective-c", "swift"}, {"c"}),
+    ("python-based tooling, (docker), [kubernetes]", {"python", "docker", "kubernetes"}, set()),
+    ("Used mongoose, cargo and algorithms", set(), {"go", "mongodb"}),
+    ("Wrote k-means and scikit-learn pipelines", {"k-means", "scikit-learn"}, set()),
+    ("CI/CD with Jenkins", {"ci", "cd", "jenkins"}, set()),
+    ("notepad++, socket.io, cri-o", {"notepad++", "socket.io", "cri-o"}, set()),
+    ("AR/VR prototypes", {"ar", "vr"}, set()),
+    ("Python", {"python"}, set()),
+    ("reactive programming", set(), {"react"}),
+    ("Deployed on K8s with Postgres and golang services", {"kubernetes", "postgresql", "go"}, {"k8s", "postgres"}),
+    ("Node.js, ReactJS and GCP", {"react", "google cloud platform"}, {"javascript", "gcp"}),
+]
+
+
+@pytest.fixture(scope="module")
+def automaton():
+    return load_keyword_automaton()[0]
+
+
+@pytest.mark.parametrize("text, must, must_not", CASES, ids=[text for text, _, _ in CASES])
+def test_find_keywords(automaton, text, must, must_not):
+    found = find_keywords(automaton, text.lower())
+    assert must <= found, f"missing {sorted(must - found)}"
+    assert not must_not & found, f"unexpected {sorted(must_not & found)}"
+
+
+@pytest.mark.parametrize("text, must, must_not", CASES, ids=[text for text, _, _ in CASES])
+def test_count_keywords_matches_find_keywords(automaton, text, must, must_not):
+    assert set(count_keywords(automaton, text.lower())) == find_keywords(automaton, text.lower())
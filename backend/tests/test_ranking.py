@@ -0,0 +1,69 @@
+"""
+ranking.rank_resumes scores every stored resume with the score_resume formula: each ranked row's
+semantic score, keyword coverage and final score must match score_resume(jd, resume).
+"""
+import pytest
+
+from backend.app.insert_resume_data import get_or_create_resume, insert_job_description
+from backend.app.models import Resume
+from backend.app.ranking import rank_resumes
+from backend.app.scoring_logic import score_resume
+
+TOLERANCE = 1e-3
+
+# Repeated and common keywords, so keyword coverage is weighted (term frequency and IDF), not a plain share
+JD = (
+    "Backend engineer: python, postgresql, docker and kubernetes on aws. Python services, python tooling. "
+    "Builds REST APIs; terraform a plus."
+)
+OTHER_JDS = ["Data analyst: python and sql.", "Platform engineer: python, aws and docker."]
+RESUMES = [
+    {"name": "Python Backend", "education": "B.S. Computer Science", "skills": "python, postgresql, docker",
+     "experience": "Built REST APIs in python on aws; ran postgresql in production.", "projects": "A kubernetes operator"},
+    {"name": "Frontend", "education": "B.A. Design", "skills": "react, typescript, css",
+     "experience": "Built web apps in react and typescript.", "projects": None},
+    {"name": "Data Engineer", "education": "M.S. Statistics", "skills": "python, sql, spark, terraform",
+     "experience": "Airflow and spark pipelines on aws. " * 30, "projects": "dbt models", "certifications": "AWS Certified"},
+    {"name": "Skills Only", "education": None, "skills": "go, kubernetes, docker", "experience": None, "projects": None},
+]
+
+
+def _assert_matches_score_resume(results):
+    from backend.app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        for row in results:
+            expected = score_resume(JD, db.get(Resume, row["resume_id"]))
+            for part in ("semantic", "keyword", "structure"):
+                assert row["breakdown"][part] == pytest.approx(expected["breakdown"][part], abs=TOLERANCE), part
+            assert row["score"] == pytest.approx(expected["score"], abs=TOLERANCE)
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def jobs(app_db, stub_model):
+    for i, jd in enumerate([JD] + OTHER_JDS):
+        insert_job_description(f"Posting {i}", jd)
+
+
+def test_rank_resumes_matches_score_resume(jobs):
+    for data in RESUMES:
+        get_or_create_resume(data)
+    ranked = rank_resumes(JD, top_k=len(RESUMES))
+    assert ranked["total"] == len(RESUMES)
+    assert sorted(r["name"] for r in ranked["results"]) == sorted(d["name"] for d in RESUMES)
+    assert [r["score"] for r in ranked["results"]] == sorted((r["score"] for r in ranked["results"]), reverse=True)
+    _assert_matches_score_resume(ranked["results"])
+
+
+def test_saved_and_updated_resumes_rank_like_score_resume(jobs):
+    for data in RESUMES[:2]:
+        get_or_create_resume(data)
+    rank_resumes(JD)  # loads the pool; the saves below reach it through on_resume_saved
+    get_or_create_resume(RESUMES[2])
+    get_or_create_resume({**RESUMES[1], "skills": "python, kubernetes, terraform"})
+    ranked = rank_resumes(JD, top_k=10)
+    assert ranked["total"] == 3
+    _assert_matches_score_resume(ranked["results"])
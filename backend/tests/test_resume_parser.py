@@ -0,0 +1,71 @@
+"""
+Section segmentation of extracted resume text (resume_parser.parse_resume_text / SectionSegmenter).
+No PDF needed; extractor speed is in backend/benchmarks/bench_section_segmenter.py.
+"""
+import pytest
+
+from backend.app.resume_parser import SectionSegmenter, parse_resume_text
+
+# (extracted text, expected fields of the parsed dict; fields not listed must be None)
+CASES = [
+    (
+        "Jane Doe\nEducation\nB.S. Computer Science\nExperience\nEngineer at Acme\nSkills\nPython, SQL\n",
+        {"name": "jane doe", "education": "b.s. computer science", "experience": "engineer at acme",
+         "skills": "python, sql"},
+    ),
+    # Headings only count at the start of a line: "experience" / "skills" inside a sentence do not split
+    (
+        "Jane Doe\nSummary\nFive years of experience building data skills programs.\nSkills: Python\n",
+        {"name": "jane doe", "objective": "five years of experience building data skills programs.",
+         "skills": "python"},
+    ),
+    # Synonyms, case, bullets and "#" markers, colons
+    (
+        "John Roe\nPROFESSIONAL EXPERIENCE\nBackend developer\n• Technical Skills:\nGo, Rust\n"
+        "# Academic Background\nM.S. Physics\nLicenses & Certifications\nAWS SA\nSide Projects\nA ray tracer\n",
+        {"name": "john roe", "experience": "backend developer", "skills": "go, rust",
+         "education": "m.s. physics", "certifications": "aws sa", "projects": "a ray tracer"},
+    ),
+    # Repeated sections are joined in document order
+    (
+        "Ann Lee\nExperience\nJob A\nEducation\nBSc\nWork History\nJob B\n",
+        {"name": "ann lee", "experience": "job a\njob b", "education": "bsc"},
+    ),
+    # Multi-word headings tolerate extra whitespace
+    (
+        "Ann Lee\nWork   Experience\nJob A\nCore\tCompetencies\nLeadership\n",
+        {"name": "ann lee", "experience": "job a", "skills": "leadership"},
+    ),
+    # Without line breaks (no heading on its own line) the inline fallback splits on the section names
+    (
+        "Sam Poe Education BSc Math Experience Analyst at Foo Skills Excel",
+        {"name": "sam poe education bsc math experience analyst at foo skills excel",
+         "education": "bsc math", "experience": "analyst at foo", "skills": "excel"},
+    ),
+    # No headings at all: only the name
+    ("Just A Name\nsome text without sections\n", {"name": "just a name"}),
+]
+
+IDS = [f"{i}-{text.splitlines()[0][:20]}" for i, (text, _) in enumerate(CASES)]
+FIELDS = ("name", "education", "experience", "projects", "skills", "objective", "certifications")
+
+
+@pytest.mark.parametrize("text, expected", CASES, ids=IDS)
+def test_parse_resume_text(text, expected):
+    parsed = parse_resume_text(text)
+    assert {f: parsed[f] for f in FIELDS} == {f: expected.get(f) for f in FIELDS}
+
+
+@pytest.mark.parametrize("text, expected", CASES, ids=IDS)
+def test_fed_in_pieces_matches_one_feed(text, expected):
+    """Pages arrive in chunks that can split a line; the result must not depend on where."""
+    for size in (1, 7, 16):
+        segmenter = SectionSegmenter()
+        for i in range(0, len(text), size):
+            segmenter.feed(text[i:i + size])
+        assert segmenter.finish().to_resume_dict() == parse_resume_text(text)
+
+
+def test_empty_text():
+    assert parse_resume_text("") is None
+    assert parse_resume_text("  \n\n") is None
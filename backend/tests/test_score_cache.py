@@ -0,0 +1,67 @@
+"""
+score_cache: a repeat view is served from the cache; changing the resume text or the IDF of a JD
+keyword makes the next view score again.
+"""
+import pytest
+
+from backend.app import score_cache
+from backend.app.insert_resume_data import get_latest_job, get_or_create_resume, get_resume_by_name, save_upload
+from backend.app.models import ScoreResult
+from backend.app.scoring_logic import score_resume
+
+JD = "Backend engineer: python, postgresql, docker and kubernetes on aws. Builds REST APIs."
+RESUME = {
+    "name": "Test Candidate",
+    "education": "B.S. Computer Science",
+    "experience": "Built REST APIs in python on aws; ran postgresql and docker in production.",
+    "projects": "A kubernetes operator",
+    "skills": "python, sql, docker",
+    "objective": None,
+    "certifications": None,
+}
+
+
+@pytest.fixture
+def saved(app_db, stub_model):
+    save_upload(RESUME, JD, 0.0)
+
+
+def view():
+    """What /score_resume does: the resume by name, its latest job, the cached score."""
+    resume = get_resume_by_name(RESUME["name"])
+    job = get_latest_job(resume.id)
+    before = score_cache.stats()
+    insights = score_cache.cached_score(job.job_description, resume, job)
+    after = score_cache.stats()
+    hit = after["hits"] + after["db_hits"] > before["hits"] + before["db_hits"]
+    return insights, hit, resume, job
+
+
+def test_repeat_view_is_a_hit(saved):
+    first, hit, resume, job = view()
+    assert not hit
+    second, hit, _, _ = view()
+    assert hit
+    assert second == first == score_resume(job.job_description, resume, job)
+
+
+def test_changed_resume_text_is_a_miss(saved, app_db):
+    before, _, resume, _ = view()
+    get_or_create_resume({**RESUME, "skills": "cobol, fortran"})
+    with app_db.connect() as conn:
+        assert conn.execute(ScoreResult.__table__.select().where(ScoreResult.resume_id == resume.id)).first() is None
+    after, hit, resume, job = view()
+    assert not hit
+    assert after == score_resume(job.job_description, resume, job)
+    assert after != before
+
+
+def test_idf_change_of_a_jd_keyword_is_a_miss(saved):
+    view()
+    assert view()[1]
+    # Other postings mentioning python make it more common, so its IDF in this JD drops
+    for i in range(3):
+        save_upload({**RESUME, "name": f"Other Candidate {i}"}, f"Data role {i}: python and spark.", 0.0)
+    insights, hit, resume, job = view()
+    assert not hit
+    assert insights == score_resume(job.job_description, resume, job)
@@ -0,0 +1,49 @@
+"""
+Startup budget: importing the app must not load the heavy dependencies (they load on first use or
+/warmup) and must stay under IMPORT_BUDGET_MS. Each module is imported in a fresh interpreter.
+backend/benchmarks/bench_startup.py reports the slowest imports and the time until /health answers.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+IMPORT_BUDGET_MS = int(os.getenv("IMPORT_BUDGET_MS", "1000"))
+
+# Loaded on first use or by /warmup, never by importing these modules
+HEAVY_MODULES = (
+    "torch", "sentence_transformers", "transformers", "onnxruntime", "tokenizers",
+    "pdfminer", "pdfplumber", "pypdfium2", "ahocorasick",
+)
+MODULES = ("backend.app.main", "backend.app.scoring_logic")
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+print(json.dumps({{"ms": (time.perf_counter() - t0) * 1000, "modules": sorted(sys.modules)}}))
+"""
+
+
+def _import_fresh(module):
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)], cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, f"import {module} failed:\n{proc.stderr[-2000:]}"
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_skips_heavy_modules(module):
+    imported = set(_import_fresh(module)["modules"])
+    assert not [h for h in HEAVY_MODULES if h in imported]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_within_budget(module):
+    # Best of three, so one slow disk read does not fail the run
+    ms = min(_import_fresh(module)["ms"] for _ in range(3))
+    assert ms <= IMPORT_BUDGET_MS, f"import {module} took {ms:.0f} ms (budget {IMPORT_BUDGET_MS} ms)"
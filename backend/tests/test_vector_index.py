@@ -0,0 +1,92 @@
+"""
+IVFIndex against the exact FlatIndex on small synthetic unit vectors: recall@10, a save/load
+round-trip and in-place updates. Latency at scale is in backend/benchmarks/bench_vector_index.py.
+"""
+import numpy as np
+import pytest
+
+from backend.app import vector_index
+from backend.app.vector_index import FlatIndex, IVFIndex
+
+DIM = 32
+N = 3000
+K = 10
+MIN_RECALL = 0.9
+
+
+def _unit(x):
+    return (x / np.linalg.norm(x, axis=-1, keepdims=True)).astype(np.float32)
+
+
+@pytest.fixture(scope="module")
+def data():
+    """Random unit vectors around random topic centers (like resumes clustering by role), plus queries."""
+    rng = np.random.default_rng(0)
+    centers = _unit(rng.standard_normal((40, DIM)))
+    vectors = _unit(centers[rng.integers(0, 40, N)] + 0.5 * rng.standard_normal((N, DIM)) / np.sqrt(DIM))
+    queries = _unit(centers[rng.integers(0, 40, 50)] + 0.5 * rng.standard_normal((50, DIM)) / np.sqrt(DIM))
+    return vectors, queries
+
+
+@pytest.fixture
+def indexes(data, monkeypatch):
+    monkeypatch.setattr(vector_index, "IVF_MIN_TRAIN", 500)
+    vectors, _ = data
+    flat, ivf = FlatIndex(), IVFIndex()
+    flat.add_many(range(N), vectors)
+    ivf.add_many(range(N), vectors)
+    assert ivf.centroids is not None
+    return flat, ivf
+
+
+def recall(flat, ivf, queries):
+    hits = 0
+    for q in queries:
+        exact = set(flat.search(q, K)[0].tolist())
+        hits += len(exact & set(ivf.search(q, K)[0].tolist()))
+    return hits / (K * len(queries))
+
+
+def test_ivf_recall(indexes, data):
+    flat, ivf = indexes
+    assert recall(flat, ivf, data[1]) >= MIN_RECALL
+
+
+def test_ivf_trains_incrementally(data, monkeypatch):
+    monkeypatch.setattr(vector_index, "IVF_MIN_TRAIN", 500)
+    vectors, queries = data
+    flat, ivf = FlatIndex(), IVFIndex()
+    for i, v in enumerate(vectors):
+        flat.add(i, v)
+        ivf.add(i, v)
+    assert ivf.centroids is not None
+    assert recall(flat, ivf, queries) >= MIN_RECALL
+
+
+def test_save_load_round_trip(indexes, data, tmp_path):
+    _, ivf = indexes
+    path = str(tmp_path / "index.npz")
+    ivf.save(path)
+    loaded = vector_index.load_index(path, "ivf")
+    assert isinstance(loaded, IVFIndex)
+    assert len(loaded) == len(ivf)
+    np.testing.assert_allclose(loaded.centroids, ivf.centroids)
+    for q in data[1][:10]:
+        ids, scores = ivf.search(q, K)
+        loaded_ids, loaded_scores = loaded.search(q, K)
+        assert loaded_ids.tolist() == ids.tolist()
+        np.testing.assert_allclose(loaded_scores, scores, rtol=1e-6)
+
+
+def test_add_updates_in_place(indexes, data):
+    flat, ivf = indexes
+    vectors, queries = data
+    target = queries[0]
+    for index in (flat, ivf):
+        index.add(7, target)
+        index.remove(8)
+        assert len(index) == N - 1
+        ids, scores = index.search(target, K)
+        assert ids[0] == 7 and scores[0] == pytest.approx(1.0, abs=1e-5)
+        assert 8 not in ids.tolist()
+        assert index.ids().tolist().count(7) == 1